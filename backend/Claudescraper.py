@@ -1,69 +1,136 @@
 import os
 import json
+import asyncio
 import time
 import random
 import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 from openai import OpenAI
 from IPython.display import display, Markdown
+from driver_pool import DriverPool, create_driver
+from crawl_scheduler import CrawlScheduler, CrawlTask
+from sinks import Checkpoint, write_stream
+from html_reducer import reduce_html
+from llm_cache import LLMCache
+from extractors import ExtractorRegistry
+from chunked_extraction import chunk_cards, map_reduce_extract
+from job_store import JobStore, job_fingerprint
+from dedup import NearDuplicateClusterer
+from job_index import JobIndex
+from metrics import Tracer, NULL_TRACER
+from incremental import PageBudget, RevisitPolicy, query_key
+from http_fetch import HttpFetcher, FetchStats
+from page_ready import PageReadiness, card_selector
+from resume_ai import MatchIndex
+from outreach import OutreachGenerator
+from streaming_extraction import ExtractionStats, max_tokens_for, parse_jobs, request_jobs, stream_jobs
+
+# Extraction model settings; bump PROMPT_VERSION whenever the prompt changes so
+# cached extraction results from the old prompt are not reused
+MODEL = "gpt-4o-mini"
+TEMPERATURE = 0.2
+PROMPT_VERSION = 1
+
+# Character budget for the single-request (truncating) extraction path
+MAX_CONTENT_LENGTH = 15000  # Adjust based on model token limits
+
+# Supported job boards: display name and the domain used for rate limiting
+SOURCES = {
+    "indeed": {"name": "Indeed", "domain": "www.indeed.com"},
+    "linkedin": {"name": "LinkedIn", "domain": "www.linkedin.com"},
+    "glassdoor": {"name": "Glassdoor", "domain": "www.glassdoor.com"},
+}
 
 class WebsiteCrawler:
-    def __init__(self, url, timeout=30, chrome_path=None):
-        """Initialize a website crawler with Selenium"""
+    def __init__(self, url, timeout=30, chrome_path=None, driver_pool=None, tracer=None, domain=None,
+                 source=None, wait_mode="events", readiness=None, headless=False, block_resources=True):
+        """Initialize a website crawler with Selenium
+
+        When a DriverPool is given the crawler leases a warm session for the crawl
+        instead of starting (and quitting) its own Chrome process. Driver startup,
+        page loads and waits are timed on tracer, labelled with domain.
+        
+        With wait_mode="events" the crawl returns as soon as the source's job cards
+        (or a quiet DOM and network) are there and scrolls only while content keeps
+        loading; wait_mode="sleep" keeps the old fixed random pauses for comparison.
+        Per-page timings end up in self.timings.
+        """
+        if wait_mode not in ("events", "sleep"):
+            raise ValueError(f"Unknown wait mode: {wait_mode}")
         self.url = url
+        self.tracer = tracer or NULL_TRACER
+        self.domain = domain or "unknown"
+        self.source = source
+        self.wait_mode = wait_mode
+        self.readiness = readiness or PageReadiness(timeout=min(timeout, 15))
+        self.headless = headless
+        self.block_resources = block_resources
         self.timeout = timeout
         self.chrome_path = chrome_path
+        self.driver_pool = driver_pool
         self.page_source = None
+        self.reduction = None
+        self.timings = None
         self.driver = None
-        self.setup_driver()
+        if self.driver_pool is None:
+            self.setup_driver()
         
     def setup_driver(self):
         """Set up the Chrome WebDriver with anti-detection measures"""
-        options = Options()
-        
-        # Anti-detection measures
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        options.add_argument('--disable-extensions')
-        options.add_experimental_option('excludeSwitches', ['enable-automation'])
-        options.add_experimental_option('useAutomationExtension', False)
-        
-        # Additional options
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        
         # Use custom Chrome path if provided
-        if self.chrome_path:
-            service = Service(executable_path=self.chrome_path)
-            self.driver = webdriver.Chrome(service=service, options=options)
+        with self.tracer.span("driver_start", domain=self.domain):
+            driver_path = self.chrome_path or ChromeDriverManager().install()
+            self.driver = create_driver(driver_path, self.headless, block_resources=self.block_resources)
+    
+    def _load_page(self, driver):
+        """Load the URL in the given driver and return its page source"""
+        driver.set_page_load_timeout(self.timeout)
+        start = time.perf_counter()
+        with self.tracer.span("page_load", domain=self.domain):
+            driver.get(self.url)
+        loaded = time.perf_counter()
+        
+        if self.wait_mode == "sleep":
+            with self.tracer.span("scripted_wait", domain=self.domain):
+                # Wait for the page to load
+                time.sleep(random.uniform(2, 5))
+                
+                # Add some human-like scrolling
+                driver.execute_script("window.scrollBy(0, 300);")
+                time.sleep(random.uniform(1, 3))
+                driver.execute_script("window.scrollBy(0, 500);")
+                time.sleep(random.uniform(1, 3))
+            ready, scrolls = "slept", 2
         else:
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=options)
-            
-        # Modify navigator properties to avoid detection
-        self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            selector = card_selector(self.source) if self.source else None
+            with self.tracer.span("page_ready", domain=self.domain):
+                ready = self.readiness.wait_ready(driver, selector)
+            with self.tracer.span("lazy_scroll", domain=self.domain):
+                scrolls = self.readiness.scroll_lazy(driver, selector)
+        
+        done = time.perf_counter()
+        self.timings = {"mode": self.wait_mode, "load": loaded - start, "wait": done - loaded,
+                        "total": done - start, "ready": ready, "scrolls": scrolls}
+        return driver.page_source
     
     def crawl(self):
         """Navigate to the URL and get the page source"""
+        if self.driver_pool is not None:
+            try:
+                requested = time.perf_counter()
+                with self.driver_pool.lease() as pooled:
+                    self.tracer.observe("driver_lease", time.perf_counter() - requested, domain=self.domain)
+                    self.page_source = self._load_page(pooled.driver)
+                return self.page_source
+            except Exception as e:
+                print(f"Error crawling {self.url}: {e}")
+                return None
+        
         try:
-            self.driver.get(self.url)
-            
-            # Wait for the page to load
-            time.sleep(random.uniform(2, 5))
-            
-            # Add some human-like scrolling
-            self.driver.execute_script("window.scrollBy(0, 300);")
-            time.sleep(random.uniform(1, 3))
-            self.driver.execute_script("window.scrollBy(0, 500);")
-            time.sleep(random.uniform(1, 3))
-            
-            # Get the page source
-            self.page_source = self.driver.page_source
+            self.page_source = self._load_page(self.driver)
             return self.page_source
             
         except Exception as e:
@@ -79,18 +146,9 @@ class WebsiteCrawler:
             self.crawl()
         return self.page_source
 
-def messages_for(web_crawler):
-    """Create messages for the OpenAI API based on the crawled web page"""
-    page_source = web_crawler.get_page_source()
-    
-    if not page_source:
-        return [{"role": "user", "content": "The page couldn't be crawled. Please provide guidance on troubleshooting web scraping issues."}]
-    
-    # Create system message with instructions for the model
-    system_message = {
-        "role": "system", 
-        "content": """You are a specialized job listing extractor. Your task is to analyze the HTML content 
-        of job listing pages and extract structured information about each job posting.
+# Instructions for the model, shared by whole-page and chunked extraction
+SYSTEM_PROMPT = """You are a specialized job listing extractor. Your task is to analyze the HTML content 
+        (or a reduced text version of it) of job listing pages and extract structured information about each job posting.
         
         For each job posting, extract the following fields if available:
         1. Job Title
@@ -125,296 +183,791 @@ def messages_for(web_crawler):
         If the page does not contain job listings or you can't identify any, respond with:
         {"jobs": [], "error": "No job listings found or unable to parse the page."}
         """
-    }
+
+def task_key(task):
+    """Stable identifier of a result page, used for checkpoints"""
+    return f"{task.source}:{task.page}:{task.url}"
+
+def parse_jobs_response(job_results):
+    """Parse the model's JSON reply, keeping every complete and valid job
+
+    Prose, code fences and a cut-off tail are tolerated; returns None when the reply
+    holds no JSON, was cut off before its first job, or has more text after an
+    object without jobs.
+    """
+    jobs, ok = parse_jobs(job_results)
+    if not ok:
+        print(f"Failed to parse OpenAI response as JSON: {job_results[:100]}...")
+        return None
+    return {"jobs": jobs}
+
+def system_message():
+    """Create the system message with instructions for the model"""
+    return {"role": "system", "content": SYSTEM_PROMPT}
+
+def reduce_page(web_crawler):
+    """Reduce the crawled page to compact job-card content, reusing an earlier reduction"""
+    if web_crawler.reduction is None:
+        page_source = web_crawler.get_page_source()
+        tracer = getattr(web_crawler, "tracer", NULL_TRACER)
+        # Strip scripts, styles and markup down to one compact entry per job card
+        with tracer.span("reduce_html", domain=getattr(web_crawler, "domain", "unknown")):
+            web_crawler.reduction = reduce_html(page_source, base_url=web_crawler.url)
+        print(web_crawler.reduction.summary())
+    return web_crawler.reduction
+
+def messages_for(web_crawler):
+    """Create messages for the OpenAI API based on the crawled web page"""
+    page_source = web_crawler.get_page_source()
+    
+    if not page_source:
+        return [{"role": "user", "content": "The page couldn't be crawled. Please provide guidance on troubleshooting web scraping issues."}]
+    
+    reduced = reduce_page(web_crawler)
     
-    # Create user message with the HTML content
+    # Create user message with the reduced content
     # Limit content length to avoid token limits
-    max_length = 15000  # Adjust based on model token limits
-    truncated_html = page_source[:max_length]
+    truncated_content = reduced.text[:MAX_CONTENT_LENGTH]
     
     user_message = {
         "role": "user",
-        "content": f"Extract job listings from this HTML content:\n\n{truncated_html}\n\nIf the HTML is truncated, focus on extracting what you can see."
+        "content": f"Extract job listings from this job page content (one line per job card when cards were detected):\n\n{truncated_content}\n\nIf the content is truncated, focus on extracting what you can see."
     }
     
-    return [system_message, user_message]
+    return [system_message(), user_message]
+
+def chunked_messages_for(web_crawler, token_budget=3000):
+    """Create one message list per chunk of the page, split on job-card boundaries
+    
+    Unlike messages_for nothing is truncated: every card ends up in some chunk.
+    """
+    if not web_crawler.get_page_source():
+        return []
+    
+    reduced = reduce_page(web_crawler)
+    if reduced.cards:
+        entries = [f"[Card {i+1}] {card}" for i, card in enumerate(reduced.cards)]
+    else:
+        entries = [line for line in reduced.text.split("\n") if line]
+    
+    chunks = chunk_cards(entries, token_budget)
+    return [
+        [system_message(), {
+            "role": "user",
+            "content": f"Extract job listings from this part of a job page (chunk {i+1} of {len(chunks)}, one line per job card when cards were detected):\n\n{chunk}"
+        }]
+        for i, chunk in enumerate(chunks)
+    ]
 
 class JobScraper:
-    def __init__(self, api_key=None):
-        """Initialize the GPT-powered job scraper with OpenAI API key"""
+    def __init__(self, api_key=None, base_url=None, pool_size=3, max_pages_per_driver=20, headless=True, chrome_path=None,
+                 rate_per_domain=0.15, extract_workers=3, cache_path="llm_cache.sqlite",
+                 cache_ttl=7 * 24 * 3600, cache_max_entries=5000, bypass_cache=False,
+                 chunk_token_budget=3000, chunk_concurrency=4, store_path="jobs.sqlite", trace=False,
+                 http_first=True, wait_mode="events", block_resources=True, match_index_path="match_index",
+                 stream_extraction=False):
+        """Initialize the GPT-powered job scraper with OpenAI API key
+
+        pool_size and max_pages_per_driver control the shared Chrome driver pool:
+        how many warm sessions are kept and after how many pages each is recycled.
+        rate_per_domain is the allowed page fetches per second for each site.
+        Extraction results are cached in cache_path; set bypass_cache to always call the API.
+        Pages are extracted in chunks of about chunk_token_budget tokens, chunk_concurrency at a time.
+        Jobs persist across runs in the SQLite store at store_path.
+        With http_first pages are fetched with a plain HTTP client and only rendered in
+        Chrome when the response has no job cards. wait_mode picks how the browser waits
+        for a page ("events" or the old fixed "sleep"); block_resources skips images,
+        fonts and media. With trace=True each stage is timed and token usage is counted; see metrics_text
+        and save_run_summary. The resume match index is persisted in match_index_path.
+        With stream_extraction LLM replies are streamed and parsed as they arrive. It is off by
+        default: jobs are still handed on per page, after chunk deduplication and storage, so
+        streaming does not make them arrive sooner and reading the stream costs client time.
+        """
         # Use provided API key or get from environment
         self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("OpenAI API key is required. Provide it when initializing JobScraper or set OPENAI_API_KEY environment variable.")
         
-        self.client = OpenAI(api_key=self.api_key)
-        self.jobs_data = []
+        # base_url lets the client talk to a compatible endpoint, e.g. the local benchmark server
+        self.base_url = base_url
+        self.client = OpenAI(api_key=self.api_key, base_url=base_url)
+        
+        # Stage timings and token/cost accounting; a disabled tracer costs next to nothing
+        self.tracer = Tracer(enabled=trace)
+        
+        # Scraped jobs are upserted into a disk-backed store, deduplicated by fingerprint
+        self.store = JobStore(store_path)
+        self._dedup = None
+        self._job_index = None
+        self.match_index_path = match_index_path
+        self._match_index = None
+        
+        # Driver pool settings; the pool itself is started on first use
+        self.pool_size = pool_size
+        self.max_pages_per_driver = max_pages_per_driver
+        self.headless = headless
+        self.chrome_path = chrome_path
+        self.wait_mode = wait_mode
+        self.block_resources = block_resources
+        self.page_timings = []
+        self._driver_pool = None
+        
+        # Plain HTTP fetch path tried before the browser, and which path served each page
+        self.http_first = http_first
+        self._http_fetcher = None
+        self.fetch_stats = FetchStats()
+        
+        # Crawl scheduler settings
+        self.rate_per_domain = rate_per_domain
+        self.extract_workers = extract_workers
+        self._scheduler = None
+        
+        # Cache of LLM extraction results keyed on model, prompt and page content
+        self.llm_cache = LLMCache(cache_path, ttl=cache_ttl, max_entries=cache_max_entries, bypass=bypass_cache)
+        
+        # Deterministic per-source card parsers tried before the LLM
+        self.extractors = ExtractorRegistry()
+        
+        # Chunked LLM extraction settings and per-page recovery metrics
+        self.chunk_token_budget = chunk_token_budget
+        self.chunk_concurrency = chunk_concurrency
+        self.chunk_metrics = []
+        
+        # JSON-mode extraction settings and per-request parse outcomes
+        self.stream_extraction = stream_extraction
+        self.extraction_stats = ExtractionStats()
+        
+        # Learns per-search refresh intervals for incremental crawls
+        self.revisit_policy = RevisitPolicy()
+    
+    @property
+    def jobs_data(self):
+        """Iterator over every stored job from all runs and searches, in first-seen order"""
+        return self.store.iter_jobs()
+    
+    @property
+    def dedup(self):
+        """Near-duplicate clusters over the stored jobs, restored from the store on first use
+
+        Only postings without saved clustering state (e.g. stored by an older version)
+        are hashed and compared; the result is saved back to the store.
+        """
+        if self._dedup is None:
+            dedup = NearDuplicateClusterer()
+            saved = self.store.dedup_state(dedup.scheme)
+            unsaved = []
+            for job in self.store.iter_jobs():
+                state = saved.pop(job["fingerprint"], None)
+                if state is None:
+                    unsaved.append(job)
+                else:
+                    dedup.restore(job["fingerprint"], job, *state)
+            for band, band_key, fingerprint in self.store.iter_dedup_bands():
+                if fingerprint in dedup.jobs:
+                    dedup.restore_band(fingerprint, band, band_key)
+            for job in unsaved:
+                dedup.add(job["fingerprint"], job)
+            self._dedup = dedup
+            self._save_dedup()
+        return self._dedup
+    
+    def _save_dedup(self):
+        rows, bands = self._dedup.pending()
+        if rows:
+            self.store.save_dedup(self._dedup.scheme, rows, bands)
+    
+    @property
+    def job_index(self):
+        """Filter index over the stored jobs, built on first use"""
+        if self._job_index is None:
+            self._job_index = JobIndex()
+            for job in self.store.iter_jobs():
+                self._job_index.add(job, key=job["fingerprint"])
+        return self._job_index
+    
+    @property
+    def match_index(self):
+        """Resume match index, opened from match_index_path and caught up with the store"""
+        if self._match_index is None:
+            if self.match_index_path and os.path.exists(os.path.join(self.match_index_path, "meta.json")):
+                index = MatchIndex.load(self.match_index_path)
+            else:
+                index = MatchIndex()
+            jobs, keys = [], []
+            for job in self.store.iter_jobs():
+                if job["fingerprint"] not in index:
+                    jobs.append(job)
+                    keys.append(job["fingerprint"])
+            index.add_many(jobs, keys)
+            self._match_index = index
+        return self._match_index
+    
+    def match_resumes(self, resumes, k=50):
+        """Rank stored jobs against one or more resume texts
+        
+        Returns one list per resume of the k best jobs, each with a match_score.
+        """
+        if isinstance(resumes, str):
+            resumes = [resumes]
+        matches = []
+        for ranked in self.match_index.top_k(resumes, k=k):
+            jobs = []
+            for fingerprint, score in ranked:
+                job = self.store.get(fingerprint)
+                if job is not None:
+                    job["match_score"] = round(score, 4)
+                    jobs.append(job)
+            matches.append(jobs)
+        return matches
+    
+    def save_match_index(self):
+        """Persist the match index so the next run maps it from disk instead of rebuilding"""
+        if self._match_index is not None and self.match_index_path:
+            self._match_index.save(self.match_index_path)
     
-    def scrape_jobs(self, job_title, location, sources=None):
-        """Scrape job listings for the given job title and location"""
+    def queue_applications(self, queue, jobs=None):
+        """Add jobs (by default every stored job) with an application link to an ApplicationQueue"""
+        added = queue.enqueue_many(self.store.iter_jobs() if jobs is None else jobs)
+        print(f"Queued {added} new applications")
+        return added
+    
+    def generate_outreach(self, pairs, template="email", sender="", output_path="outreach.jsonl",
+                          checkpoint_path="outreach.checkpoint.json", concurrency=8):
+        """Write personalized outreach messages for (job, contact) pairs; see OutreachGenerator
+        
+        Re-running the same call after an interruption resumes from the checkpoint.
+        """
+        generator = OutreachGenerator(api_key=self.api_key, base_url=self.base_url, concurrency=concurrency,
+                                      tracer=self.tracer)
+        try:
+            messages = generator.generate(pairs, template, sender, output_path, checkpoint_path)
+            print(generator.report())
+            return messages
+        finally:
+            generator.close()
+    
+    def canonical_jobs(self):
+        """One record per posting, with near-duplicates from other sources merged in"""
+        return self.dedup.canonical_jobs()
+    
+    @property
+    def driver_pool(self):
+        """Shared pool of warm Chrome sessions, created lazily"""
+        if self._driver_pool is None:
+            self._driver_pool = DriverPool(
+                size=self.pool_size,
+                max_pages_per_driver=self.max_pages_per_driver,
+                chrome_path=self.chrome_path,
+                headless=self.headless,
+                block_resources=self.block_resources
+            )
+        return self._driver_pool
+    
+    @property
+    def http_fetcher(self):
+        """Shared keep-alive HTTP client, created lazily"""
+        if self._http_fetcher is None:
+            self._http_fetcher = HttpFetcher()
+        return self._http_fetcher
+    
+    def close(self):
+        """Shut down the Chrome sessions held by the driver pool and close the cache"""
+        if self._driver_pool is not None:
+            self._driver_pool.close()
+            self._driver_pool = None
+        if self._http_fetcher is not None:
+            self._http_fetcher.close()
+            self._http_fetcher = None
+        self.llm_cache.close()
+        self.store.close()
+    
+    def scrape_jobs(self, job_title, location, sources=None, pages=2, stream=False):
+        """Scrape job listings for the given job title and location
+        
+        Pages from different sources are fetched concurrently; each domain is
+        rate limited on its own, so the run takes about as long as the slowest source.
+        Returns the stored record of each job found by this search; jobs_data iterates
+        over everything in the store. With stream=True an iterator is returned that
+        yields jobs as each page is extracted.
+        """
+        if stream:
+            return self.iter_jobs(job_title, location, sources=sources, pages=pages)
+        
+        fingerprints = self._run_tasks(self._tasks_for(job_title, location, sources, pages))
+        self._print_run_stats()
+        return self.store.get_many(fingerprints)
+    
+    def iter_jobs(self, job_title, location, sources=None, pages=2):
+        """Yield jobs as soon as each page has been extracted and stored"""
+        for task, jobs in self._iter_pages(self._tasks_for(job_title, location, sources, pages)):
+            yield from jobs
+        self._print_run_stats()
+    
+    async def aiter_jobs(self, job_title, location, sources=None, pages=2):
+        """Async iterator over iter_jobs; the crawl runs on a worker thread"""
+        loop = asyncio.get_running_loop()
+        jobs = self.iter_jobs(job_title, location, sources=sources, pages=pages)
+        done = object()
+        try:
+            while True:
+                job = await loop.run_in_executor(None, next, jobs, done)
+                if job is done:
+                    return
+                yield job
+        finally:
+            jobs.close()
+    
+    def scrape_to(self, job_title, location, sinks, sources=None, pages=2, checkpoint_path=None):
+        """Stream a search into sinks (e.g. JSONLSink, ParquetSink) with bounded memory
+        
+        Pages already recorded in the checkpoint file are skipped, so re-running the
+        same call after a crash resumes where the last durable flush left off.
+        """
+        checkpoint = Checkpoint(checkpoint_path) if checkpoint_path else None
+        tasks = self._tasks_for(job_title, location, sources, pages)
+        if checkpoint:
+            remaining = [task for task in tasks if not checkpoint.is_done(task_key(task))]
+            if len(remaining) < len(tasks):
+                print(f"Resuming from checkpoint: skipping {len(tasks) - len(remaining)} completed pages")
+            tasks = remaining
+        
+        pages_out = ((task_key(task), jobs) for task, jobs in self._iter_pages(tasks))
+        total = write_stream(pages_out, sinks, checkpoint)
+        print(f"Streamed {total} jobs to {len(sinks)} sinks")
+        self._print_run_stats()
+        return total
+    
+    def refresh_jobs(self, job_title, location, sources=None, pages=2, max_pages=10, known_threshold=0.8, force=False):
+        """Incrementally refresh a search, crawling only as deep as there are new postings
+        
+        Each source is paginated one page at a time and stops once a page is mostly
+        postings already in the store; a page of only new postings extends the crawl
+        past `pages`, up to max_pages. Sources refreshed more recently than their learned
+        revisit interval are skipped unless force is set. Returns per-source stats.
+        """
+        if sources is None:
+            sources = ["indeed", "linkedin", "glassdoor"]
+        
+        now = time.time()
+        budgets = {}
+        for source in sources:
+            source = source.lower()
+            if source not in SOURCES:
+                print(f"Unsupported source: {source}")
+                continue
+            state = self.store.crawl_state(query_key(source, job_title, location))
+            if not force and not self.revisit_policy.is_due(state, now):
+                due_in = state["last_crawled"] + state["interval"] - now
+                print(f"Skipping {SOURCES[source]['name']}: next refresh due in {due_in / 3600:.1f} hours")
+                continue
+            budgets[source] = PageBudget(pages, max_pages, known_threshold)
+        
+        # Sources advance in waves of one page each, so different domains still crawl concurrently
+        while True:
+            wave = [self._page_task(source, job_title, location, budget.next_page)
+                    for source, budget in budgets.items() if budget.active]
+            if not wave:
+                break
+            for task, jobs in self.scheduler.iter_results(wave):
+                new = self._store_page(task, jobs)
+                budgets[task.source].observe(len(new), len({job_fingerprint(job) for job in jobs}))
+            for task in wave:
+                budget = budgets[task.source]
+                if budget.stopped is None and budget.next_page == task.page:
+                    budget.stopped = "fetch failed"
+        
+        stats = {}
+        for source, budget in budgets.items():
+            key = query_key(source, job_title, location)
+            previous = self.store.crawl_state(key)
+            # A failed fetch or a first page with no jobs (blocked, or extraction failed)
+            # says nothing about the posting rate; retry soon instead of learning from it
+            failed = budget.stopped == "fetch failed" or budget.seen_jobs == 0
+            if failed:
+                state = self.revisit_policy.retry(previous)
+            else:
+                state = self.revisit_policy.update(previous, budget.new_jobs)
+            if state is not None:
+                self.store.set_crawl_state(key, state)
+            next_refresh = state["last_crawled"] + state["interval"] if state else time.time()
+            stats[source] = {
+                "pages": budget.next_page,
+                "new": budget.new_jobs,
+                "seen": budget.seen_jobs,
+                "stopped": budget.stopped,
+                "next_refresh": next_refresh,
+            }
+            print(f"{SOURCES[source]['name']}: {budget.new_jobs} new of {budget.seen_jobs} jobs over "
+                  f"{budget.next_page} pages (stopped: {budget.stopped}); "
+                  f"{'retrying' if failed else 'next refresh'} in {(next_refresh - time.time()) / 3600:.1f} hours")
+        self._print_run_stats()
+        return stats
+    
+    def _tasks_for(self, job_title, location, sources=None, pages=2):
+        """Build the crawl tasks for every requested source"""
         if sources is None:
             sources = ["indeed", "linkedin", "glassdoor"]
         
+        tasks = []
         for source in sources:
-            if source.lower() == "indeed":
-                self._scrape_indeed(job_title, location)
-            elif source.lower() == "linkedin":
-                self._scrape_linkedin(job_title, location)
-            elif source.lower() == "glassdoor":
-                self._scrape_glassdoor(job_title, location)
+            if source.lower() in SOURCES:
+                tasks.extend(self._build_tasks(source.lower(), job_title, location, pages))
             else:
                 print(f"Unsupported source: {source}")
+        return tasks
+    
+    def metrics_text(self):
+        """Stage timings and token usage in the Prometheus text format (requires trace=True)"""
+        return self.tracer.to_prometheus()
+    
+    def save_run_summary(self, filename="run_summary.json"):
+        """Write stage timings, token usage and estimated cost to a JSON file"""
+        if not self.tracer.enabled:
+            print("Tracing is off; create the scraper with trace=True to record a run summary.")
+            return
+        self.tracer.save_summary(filename)
+        print(f"Saved run summary to {filename}")
+    
+    def _print_run_stats(self):
+        stats = self.llm_cache.stats()
+        print(f"LLM cache: {stats['hits']} hits, {stats['misses']} misses ({stats['entries']} entries stored)")
+        if self.extraction_stats.requests:
+            print(self.extraction_stats.summary())
+        for domain in self.fetch_stats.domains:
+            print(self.fetch_stats.summary(domain))
+        timings = [t for t in self.page_timings if t]
+        if timings:
+            load = sum(t["load"] for t in timings) / len(timings)
+            wait = sum(t["wait"] for t in timings) / len(timings)
+            print(f"Browser page time ({self.wait_mode} waits): {load:.2f}s load + {wait:.2f}s waiting "
+                  f"per page over {len(timings)} pages")
+        if self.tracer.enabled:
+            print(f"Estimated LLM cost this run: ${self.tracer.summary()['total_cost_usd']:.4f}")
+        for source, source_stats in self.extractors.stats.items():
+            print(f"Selector fallback rate for {SOURCES[source]['name']}: "
+                  f"{self.extractors.fallback_rate(source):.0%} of {source_stats['pages']} pages")
+    
+    @property
+    def scheduler(self):
+        """Crawl scheduler joining the fetch and extraction stages"""
+        if self._scheduler is None:
+            self._scheduler = CrawlScheduler(
+                fetch=self._fetch_page,
+                extract=self._extract_page,
+                rate_per_domain=self.rate_per_domain,
+                extract_workers=self.extract_workers,
+                tracer=self.tracer
+            )
+        return self._scheduler
+    
+    def _run_tasks(self, tasks):
+        """Run crawl tasks through the scheduler and store the extracted jobs
+
+        Returns the fingerprints of the jobs found, in the order they were first found.
+        """
+        fingerprints = {}
+        for task, jobs in self._iter_pages(tasks):
+            for job in jobs:
+                fingerprints.setdefault(job_fingerprint(job))
+        return list(fingerprints)
+    
+    def _iter_pages(self, tasks):
+        """Run crawl tasks and yield (task, jobs) for each page once its jobs are stored"""
+        for task, jobs in self.scheduler.iter_results(tasks):
+            self._store_page(task, jobs)
+            yield task, jobs
+    
+    def _store_page(self, task, jobs):
+        """Upsert a page's jobs, update the dedup and filter indexes, and return the new fingerprints"""
+        with self.tracer.span("persist", source=task.source):
+            new = self.store.upsert_many(jobs)
+        for fingerprint in new:
+            if self._dedup is None and self._job_index is None and self._match_index is None:
+                break
+            job = self.store.get(fingerprint)
+            if self._dedup is not None:
+                self._dedup.add(fingerprint, job)
+            if self._job_index is not None:
+                self._job_index.add(job, key=fingerprint)
+            if self._match_index is not None:
+                self._match_index.add(job, key=fingerprint)
+        if self._dedup is not None:
+            self._save_dedup()
+        if jobs:
+            print(f"Stored {len(new)} new of {len(jobs)} jobs from {SOURCES[task.source]['name']} (page {task.page+1})")
+        return new
+    
+    def _build_tasks(self, source, job_title, location, pages=2):
+        """Build the crawl tasks for the first `pages` result pages of a source"""
+        return [self._page_task(source, job_title, location, page) for page in range(pages)]
+    
+    def _page_task(self, source, job_title, location, page):
+        """Build the crawl task for one result page of a source"""
+        build_url = getattr(self, f"_{source}_url")
+        return CrawlTask(source, SOURCES[source]["domain"], page, build_url(job_title, location, page))
+    
+    def _indeed_url(self, job_title, location, page):
+        """Build the Indeed search URL for a result page"""
+        formatted_title = job_title.replace(" ", "+")
+        formatted_location = location.replace(" ", "+")
+        start = page * 10  # Indeed uses increments of 10 for pagination
+        return f"https://www.indeed.com/jobs?q={formatted_title}&l={formatted_location}&start={start}"
+    
+    def _linkedin_url(self, job_title, location, page):
+        """Build the LinkedIn search URL for a result page"""
+        formatted_title = job_title.replace(" ", "%20")
+        formatted_location = location.replace(" ", "%20")
+        start = page * 25  # LinkedIn uses increments of 25 for pagination
+        return f"https://www.linkedin.com/jobs/search/?keywords={formatted_title}&location={formatted_location}&start={start}"
+    
+    def _glassdoor_url(self, job_title, location, page):
+        """Build the Glassdoor search URL for a result page"""
+        formatted_title = job_title.replace(" ", "-")
+        formatted_location = location.replace(" ", "-").replace(",", "")
+        # Glassdoor URLs are a bit different
+        return f"https://www.glassdoor.com/Job/{formatted_location}-{formatted_title}-jobs-SRCH_IL.0,{len(formatted_location)}_IN{len(formatted_location)}_KO{len(formatted_location)+1},{len(formatted_location)+1+len(formatted_title)}_IP{page+1}.htm"
+    
+    def _fetch_page(self, task):
+        """Fetch one result page over plain HTTP, rendering it in a pooled browser only if needed"""
+        if self.http_first:
+            start = time.perf_counter()
+            with self.tracer.span("http_fetch", domain=task.domain):
+                page = self.http_fetcher.fetch(task.url, tracer=self.tracer, domain=task.domain, source=task.source)
+            if page is not None:
+                self.fetch_stats.record(task.domain, "http", time.perf_counter() - start)
+                return page
+            print(f"No job cards in the HTTP response for {task.url}, rendering in the browser")
+        
+        start = time.perf_counter()
+        web = WebsiteCrawler(task.url, 30, driver_pool=self.driver_pool, tracer=self.tracer, domain=task.domain,
+                             source=task.source, wait_mode=self.wait_mode)
+        if not web.crawl():
+            return None
+        self.fetch_stats.record(task.domain, "browser", time.perf_counter() - start)
+        self.page_timings.append(web.timings)
+        return web
+    
+    def _extract_page(self, task, web):
+        """Extract the jobs on a crawled page with the OpenAI API"""
+        source_name = SOURCES[task.source]["name"]
+        
+        # Fast path: parse the cards with the source's selector sets
+        with self.tracer.span("selector_extract", source=task.source):
+            jobs, version = self.extractors.extract(task.source, web.get_page_source(), base_url=task.url)
+        if jobs:
+            for job in jobs:
+                job["source"] = source_name
+            print(f"Found {len(jobs)} jobs on {source_name} (page {task.page+1}) with selectors {version}")
+            return jobs
+        
+        # Selectors failed the quality check, fall back to the LLM over every chunk of the page
+        chunks = chunked_messages_for(web, self.chunk_token_budget)
+        job_data, failed = map_reduce_extract(
+            chunks,
+            lambda messages: self._complete_jobs(messages, task),
+            concurrency=self.chunk_concurrency
+        )
+        self._record_chunk_metrics(task, web, job_data["jobs"], len(chunks), failed)
+        
+        if job_data["jobs"]:
+            # Add source information to each job
+            for job in job_data["jobs"]:
+                job["source"] = source_name
+            print(f"Found {len(job_data['jobs'])} jobs on {source_name} (page {task.page+1}) from {len(chunks)} chunks")
+            return job_data["jobs"]
+        
+        print(f"No jobs found on {source_name} (page {task.page+1}) or unable to parse.")
+        return []
+    
+    def _complete_jobs(self, messages, task):
+        """Run one extraction request for a task's page and return its jobs, or None if it failed"""
+        source_name = SOURCES[task.source]["name"]
+        
+        # Identical content with the same model and prompt is served from the cache
+        cache_key = LLMCache.make_key(MODEL, PROMPT_VERSION, TEMPERATURE, messages)
+        job_results = self.llm_cache.get(cache_key)
+        if job_results is not None:
+            with self.tracer.span("parse", source=task.source):
+                job_data = parse_jobs_response(job_results)
+            return None if job_data is None else job_data["jobs"]
+        
+        # JSON-mode request sized to the cards it carries. Jobs parsed early from a stream
+        # are not passed on (no on_job): they still need deduplicating across chunks
+        complete = stream_jobs if self.stream_extraction else request_jobs
+        try:
+            with self.tracer.span("llm_request", source=task.source):
+                result = complete(self.client, MODEL, messages, TEMPERATURE, max_tokens_for(messages))
+        except Exception as e:
+            print(f"Error with OpenAI API call for {source_name}: {e}")
+            self.extraction_stats.record_failure()
+            return None
+        
+        self.tracer.record_usage(MODEL, result["usage"], source=task.source, page=task.page + 1)
+        if result["first_job_s"] is not None:
+            self.tracer.observe("llm_first_job", result["first_job_s"], source=task.source)
+        self.extraction_stats.record(result)
+        
+        if not result["complete"]:
+            if not result["jobs"]:
+                print(f"Failed to parse OpenAI response as JSON: {result['text'][:100]}...")
+                return None
+            # Keep what was salvaged, but don't cache a partial answer
+            print(f"Response for {source_name} was cut off ({result['finish_reason']}), "
+                  f"kept {len(result['jobs'])} complete jobs")
+            return result["jobs"]
         
-        return self.jobs_data
+        self.llm_cache.set(cache_key, result["text"])
+        return result["jobs"]
+    
+    def _record_chunk_metrics(self, task, web, jobs, chunks, failed):
+        """Compare jobs recovered by chunked extraction with what truncation would have seen"""
+        reduced = web.reduction
+        cards = len(reduced.cards) if reduced else 0
+        
+        # Cards that start inside the first MAX_CONTENT_LENGTH characters of the reduced text
+        visible, offset = 0, 0
+        for i, card in enumerate(reduced.cards if reduced else []):
+            if offset >= MAX_CONTENT_LENGTH:
+                break
+            visible += 1
+            offset += len(f"[Card {i+1}] {card}") + 1
+        
+        self.chunk_metrics.append({
+            "source": task.source,
+            "page": task.page + 1,
+            "chunks": chunks,
+            "failed_chunks": failed,
+            "cards": cards,
+            "cards_within_truncation": visible,
+            "jobs": len(jobs),
+        })
+        if cards:
+            print(f"Recovered {len(jobs)} jobs from {cards} cards; truncating at {MAX_CONTENT_LENGTH} characters "
+                  f"would have covered {visible} cards")
     
     def _scrape_indeed(self, job_title, location, pages=2):
         """Scrape job listings from Indeed"""
         print(f"Scraping Indeed for {job_title} in {location}...")
-        formatted_title = job_title.replace(" ", "+")
-        formatted_location = location.replace(" ", "+")
-        
-        for page in range(pages):
-            start = page * 10  # Indeed uses increments of 10 for pagination
-            url = f"https://www.indeed.com/jobs?q={formatted_title}&l={formatted_location}&start={start}"
-            
-            # Create a WebsiteCrawler instance
-            web = WebsiteCrawler(url, 30)
-            
-            # Call OpenAI API
-            try:
-                response = self.client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=messages_for(web),
-                    temperature=0.2,  # Low temperature for consistent outputs
-                    max_tokens=4000   # Adjust based on your needs
-                )
-                
-                job_results = response.choices[0].message.content
-                
-                # Process the results
-                try:
-                    job_data = json.loads(job_results)
-                    if "jobs" in job_data and job_data["jobs"]:
-                        # Add source information to each job
-                        for job in job_data["jobs"]:
-                            job["source"] = "Indeed"
-                        
-                        # Extend our jobs data
-                        self.jobs_data.extend(job_data["jobs"])
-                        print(f"Found {len(job_data['jobs'])} jobs on Indeed (page {page+1})")
-                    else:
-                        print(f"No jobs found on Indeed (page {page+1}) or unable to parse.")
-                except json.JSONDecodeError:
-                    print(f"Failed to parse OpenAI response as JSON: {job_results[:100]}...")
-                
-                # Introduce delay to avoid rate limits
-                if page < pages - 1:
-                    delay = random.uniform(5, 10)
-                    print(f"Waiting {delay:.1f} seconds before next page...")
-                    time.sleep(delay)
-                    
-            except Exception as e:
-                print(f"Error with OpenAI API call for Indeed: {e}")
+        self._run_tasks(self._build_tasks("indeed", job_title, location, pages))
     
     def _scrape_linkedin(self, job_title, location, pages=2):
         """Scrape job listings from LinkedIn"""
         print(f"Scraping LinkedIn for {job_title} in {location}...")
-        formatted_title = job_title.replace(" ", "%20")
-        formatted_location = location.replace(" ", "%20")
-        
-        for page in range(pages):
-            start = page * 25  # LinkedIn uses increments of 25 for pagination
-            url = f"https://www.linkedin.com/jobs/search/?keywords={formatted_title}&location={formatted_location}&start={start}"
-            
-            # Create a WebsiteCrawler instance
-            web = WebsiteCrawler(url, 30)
-            
-            # Call OpenAI API
-            try:
-                response = self.client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=messages_for(web),
-                    temperature=0.2,
-                    max_tokens=4000
-                )
-                
-                job_results = response.choices[0].message.content
-                
-                # Process the results
-                try:
-                    job_data = json.loads(job_results)
-                    if "jobs" in job_data and job_data["jobs"]:
-                        # Add source information to each job
-                        for job in job_data["jobs"]:
-                            job["source"] = "LinkedIn"
-                        
-                        # Extend our jobs data
-                        self.jobs_data.extend(job_data["jobs"])
-                        print(f"Found {len(job_data['jobs'])} jobs on LinkedIn (page {page+1})")
-                    else:
-                        print(f"No jobs found on LinkedIn (page {page+1}) or unable to parse.")
-                except json.JSONDecodeError:
-                    print(f"Failed to parse OpenAI response as JSON: {job_results[:100]}...")
-                
-                # Introduce delay to avoid rate limits
-                if page < pages - 1:
-                    delay = random.uniform(5, 10)
-                    print(f"Waiting {delay:.1f} seconds before next page...")
-                    time.sleep(delay)
-                    
-            except Exception as e:
-                print(f"Error with OpenAI API call for LinkedIn: {e}")
+        self._run_tasks(self._build_tasks("linkedin", job_title, location, pages))
     
     def _scrape_glassdoor(self, job_title, location, pages=2):
         """Scrape job listings from Glassdoor"""
         print(f"Scraping Glassdoor for {job_title} in {location}...")
-        formatted_title = job_title.replace(" ", "-")
-        formatted_location = location.replace(" ", "-").replace(",", "")
+        self._run_tasks(self._build_tasks("glassdoor", job_title, location, pages))
+    
+    def filter_jobs(self, keywords=None, locations=None, remote=False, min_salary=None, collapse_duplicates=True):
+        """Filter jobs based on criteria
         
-        for page in range(pages):
-            # Glassdoor URLs are a bit different
-            url = f"https://www.glassdoor.com/Job/{formatted_location}-{formatted_title}-jobs-SRCH_IL.0,{len(formatted_location)}_IN{len(formatted_location)}_KO{len(formatted_location)+1},{len(formatted_location)+1+len(formatted_title)}_IP{page+1}.htm"
-            
-            # Create a WebsiteCrawler instance
-            web = WebsiteCrawler(url, 30)
-            
-            # Call OpenAI API
-            try:
-                response = self.client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=messages_for(web),
-                    temperature=0.2,
-                    max_tokens=4000
-                )
-                
-                job_results = response.choices[0].message.content
-                
-                # Process the results
-                try:
-                    job_data = json.loads(job_results)
-                    if "jobs" in job_data and job_data["jobs"]:
-                        # Add source information to each job
-                        for job in job_data["jobs"]:
-                            job["source"] = "Glassdoor"
-                        
-                        # Extend our jobs data
-                        self.jobs_data.extend(job_data["jobs"])
-                        print(f"Found {len(job_data['jobs'])} jobs on Glassdoor (page {page+1})")
-                    else:
-                        print(f"No jobs found on Glassdoor (page {page+1}) or unable to parse.")
-                except json.JSONDecodeError:
-                    print(f"Failed to parse OpenAI response as JSON: {job_results[:100]}...")
-                
-                # Introduce delay to avoid rate limits
-                if page < pages - 1:
-                    delay = random.uniform(5, 10)
-                    print(f"Waiting {delay:.1f} seconds before next page...")
-                    time.sleep(delay)
-                    
-            except Exception as e:
-                print(f"Error with OpenAI API call for Glassdoor: {e}")
-    
-    def filter_jobs(self, keywords=None, locations=None, remote=False, min_salary=None):
-        """Filter jobs based on criteria"""
-        filtered_jobs = self.jobs_data.copy()
-        
-        if keywords:
-            filtered_jobs = [job for job in filtered_jobs if 
-                            any(keyword.lower() in job.get('title', '').lower() or 
-                               keyword.lower() in job.get('description', '').lower() or
-                               (job.get('skills') and any(keyword.lower() in skill.lower() for skill in job.get('skills', [])))
-                               for keyword in keywords)]
-        
-        if locations:
-            filtered_jobs = [job for job in filtered_jobs if 
-                            any(location.lower() in job.get('location', '').lower() 
-                               for location in locations)]
-        
-        if remote:
-            remote_keywords = ['remote', 'work from home', 'wfh', 'virtual']
-            filtered_jobs = [job for job in filtered_jobs if 
-                            any(keyword in job.get('location', '').lower() or
-                               keyword in job.get('title', '').lower() or
-                               keyword in job.get('description', '').lower()
-                               for keyword in remote_keywords)]
-        
-        if min_salary:
-            # This is a simple implementation; actual salary parsing would be more complex
-            def extract_salary_value(salary_str):
-                import re
-                if not salary_str or salary_str == "Not specified":
-                    return 0
-                # Try to extract numeric values from salary string
-                numbers = re.findall(r'\d+[,\d]*', salary_str)
-                if numbers:
-                    # Remove commas and convert to float
-                    return float(numbers[0].replace(',', ''))
-                return 0
-            
-            filtered_jobs = [job for job in filtered_jobs if extract_salary_value(job.get('salary', '')) >= min_salary]
+        Criteria are answered from the job index, where salaries, remote status and
+        locations were parsed once at ingest. Keywords and locations match as
+        case-insensitive substrings, as before; salaries written like "$120k" are now
+        read as 120,000. With collapse_duplicates the same role posted on several
+        sources is returned once.
+        """
+        index = self.job_index
+        ids = index.search(keywords=keywords, locations=locations, remote=remote, min_salary=min_salary)
         
+        if not collapse_duplicates:
+            return [index.jobs[i] for i in ids]
+        
+        # A cluster matches when any of its postings matches
+        dedup = self.dedup
+        roots, filtered_jobs = set(), []
+        for i in ids:
+            root = dedup.cluster_of(index.keys[i])
+            if root not in roots:
+                roots.add(root)
+                filtered_jobs.append(dedup.canonical(root))
         return filtered_jobs
     
-    def save_to_csv(self, filename="gpt_jobs_data.csv"):
-        """Save job data to CSV file"""
-        if not self.jobs_data:
+    def save_to_csv(self, filename="gpt_jobs_data.csv", batch_size=1000):
+        """Save job data to CSV file, writing the store in batches"""
+        if not self.store.count():
             print("No jobs data to save.")
             return
         
         try:
-            # Convert jobs data to DataFrame
-            df = pd.DataFrame(self.jobs_data)
+            saved = 0
+            columns = None
+            batch = []
+            
+            def write_batch():
+                nonlocal columns
+                # Convert jobs data to DataFrame
+                df = pd.DataFrame(batch)
+                
+                # Convert skills list to string if present
+                if 'skills' in df.columns:
+                    df['skills'] = df['skills'].apply(lambda x: ', '.join(x) if isinstance(x, list) else x)
+                
+                # Keep the first batch's columns so appended rows line up
+                if columns is None:
+                    columns = list(df.columns)
+                    df.to_csv(filename, index=False)
+                else:
+                    df.reindex(columns=columns).to_csv(filename, index=False, header=False, mode='a')
             
-            # Convert skills list to string if present
-            if 'skills' in df.columns:
-                df['skills'] = df['skills'].apply(lambda x: ', '.join(x) if isinstance(x, list) else x)
+            with self.tracer.span("save_csv"):
+                for job in self.store.iter_jobs(batch_size=batch_size):
+                    batch.append(job)
+                    if len(batch) >= batch_size:
+                        write_batch()
+                        saved += len(batch)
+                        batch = []
+                if batch:
+                    write_batch()
+                    saved += len(batch)
             
-            # Save to CSV
-            df.to_csv(filename, index=False)
-            print(f"Successfully saved {len(self.jobs_data)} jobs to {filename}")
+            print(f"Successfully saved {saved} jobs to {filename}")
             
         except Exception as e:
             print(f"Error saving to CSV: {e}")
     
     def save_to_json(self, filename="gpt_jobs_data.json"):
-        """Save job data to JSON file"""
-        if not self.jobs_data:
+        """Save job data to JSON file, streaming jobs out of the store"""
+        if not self.store.count():
             print("No jobs data to save.")
             return
         
         try:
-            with open(filename, 'w', encoding='utf-8') as jsonfile:
-                json.dump(self.jobs_data, jsonfile, indent=4)
+            saved = 0
+            with self.tracer.span("save_json"), open(filename, 'w', encoding='utf-8') as jsonfile:
+                jsonfile.write("[\n")
+                for job in self.store.iter_jobs():
+                    if saved:
+                        jsonfile.write(",\n")
+                    jsonfile.write(json.dumps(job, indent=4))
+                    saved += 1
+                jsonfile.write("\n]\n")
             
-            print(f"Successfully saved {len(self.jobs_data)} jobs to {filename}")
+            print(f"Successfully saved {saved} jobs to {filename}")
             
         except Exception as e:
             print(f"Error saving to JSON: {e}")
     
     def display_jobs_summary(self):
         """Display a summary of the jobs data"""
-        if not self.jobs_data:
+        total = self.store.count()
+        if not total:
             return display(Markdown("No jobs data available."))
         
         summary = f"# Job Search Results\n\n"
-        summary += f"## Total Jobs Found: {len(self.jobs_data)}\n\n"
+        summary += f"## Total Jobs Found: {total}\n\n"
+        summary += f"## Unique Jobs (near-duplicates merged): {self.dedup.cluster_count()}\n\n"
         
         # Source distribution
-        sources = {}
-        for job in self.jobs_data:
-            source = job.get('source', 'Unknown')
-            if source in sources:
-                sources[source] += 1
-            else:
-                sources[source] = 1
-        
         summary += "## Source Distribution\n"
-        for source, count in sources.items():
-            summary += f"- {source}: {count} jobs\n"
+        for source, count in self.store.source_counts().items():
+            summary += f"- {source or 'Unknown'}: {count} jobs\n"
         
         # Sample of jobs
         summary += "\n## Sample Job Listings\n"
-        for i, job in enumerate(self.jobs_data[:5]):  # Show first 5 jobs
+        for i, job in enumerate(self.store.iter_jobs(limit=5)):  # Show first 5 jobs
             summary += f"### {i+1}. {job.get('title', 'Unknown Title')}\n"
             summary += f"**Company:** {job.get('company', 'Not specified')}\n\n"
             summary += f"**Location:** {job.get('location', 'Not specified')}\n\n"
@@ -442,15 +995,28 @@ if __name__ == "__main__":
     # Scrape from chosen sources
     scraper.scrape_jobs(job_title, location, sources=["indeed", "linkedin"])
     
+    # Or stream a larger search to disk, resumable after a crash:
+    # scraper.scrape_to(job_title, location, [JSONLSink("jobs.jsonl"), ParquetSink("jobs_parquet")],
+    #                   pages=10, checkpoint_path="jobs.checkpoint.json")
+    
+    # Or refresh a saved search, crawling only until pages are mostly known:
+    # scraper.refresh_jobs(job_title, location, max_pages=10)
+    
     # Filter jobs (example)
     filtered_jobs = scraper.filter_jobs(
         keywords=["python", "machine learning"],
         remote=True
     )
     
+    # Rank the stored jobs against a resume
+    # best = scraper.match_resumes(open("resume.txt").read(), k=20)[0]
+    
     # Save results
     scraper.save_to_csv()
     scraper.save_to_json()
     
     # Display summary
-    scraper.display_jobs_summary()
\ No newline at end of file
+    scraper.display_jobs_summary()
+    
+    # Release the pooled browsers
+    scraper.close()
\ No newline at end of file
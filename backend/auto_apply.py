@@ -0,0 +1,343 @@
+import json
+import random
+import sqlite3
+import threading
+import time
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit
+import httpx
+from job_store import job_fingerprint
+
+# Application states; a job only ever moves forward to applied or failed
+QUEUED, IN_FLIGHT, APPLIED, FAILED = "queued", "in_flight", "applied", "failed"
+
+
+class ApplyError(Exception):
+    def __init__(self, message, retryable=True):
+        """Raised by an apply function; retryable errors are retried with backoff"""
+        super().__init__(message)
+        self.retryable = retryable
+
+
+def site_of(link):
+    return urlsplit(link).netloc.lower()
+
+
+class ApplicationQueue:
+    def __init__(self, path="applications.sqlite", max_attempts=5, base_delay=30, max_delay=3600, lease_timeout=600):
+        """Durable queue of job applications keyed by job fingerprint
+
+        Enqueueing is idempotent: a job is stored once and keeps its state. A claimed
+        job is in_flight under a lease of lease_timeout seconds; leases left behind by a
+        crashed run are returned to the queue by recover(). Retryable failures come
+        back after an exponential backoff of base_delay * 2^(attempt-1) seconds (with
+        jitter, capped at max_delay) until max_attempts is reached.
+        """
+        self.path = path
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.lease_timeout = lease_timeout
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS applications (
+                fingerprint TEXT PRIMARY KEY,
+                site TEXT NOT NULL,
+                link TEXT NOT NULL,
+                job TEXT NOT NULL,
+                state TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt REAL NOT NULL,
+                leased_until REAL,
+                last_error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS applications_due ON applications (state, next_attempt)")
+
+    def enqueue_many(self, jobs):
+        """Queue jobs that have an application link; returns how many were new"""
+        now = time.time()
+        rows = []
+        for job in jobs:
+            link = job.get("application_link")
+            if not link or link == "Not specified" or not link.startswith("http"):
+                continue
+            rows.append((job.get("fingerprint") or job_fingerprint(job), site_of(link), link,
+                         json.dumps(job, ensure_ascii=False), QUEUED, now, now, now))
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.execute("BEGIN")
+            self._conn.executemany("""
+                INSERT OR IGNORE INTO applications (fingerprint, site, link, job, state, next_attempt, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            self._conn.execute("COMMIT")
+            return self._conn.total_changes - before
+
+    def claim(self, exclude_sites=(), now=None):
+        """Move the next due job to in_flight and return it, or None if nothing is due"""
+        now = time.time() if now is None else now
+        query = "SELECT fingerprint, site, link, job, attempts FROM applications WHERE state = ? AND next_attempt <= ?"
+        params = [QUEUED, now]
+        if exclude_sites:
+            query += f" AND site NOT IN ({','.join('?' * len(exclude_sites))})"
+            params.extend(exclude_sites)
+        query += " ORDER BY next_attempt LIMIT 1"
+        with self._lock:
+            row = self._conn.execute(query, params).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE applications SET state = ?, leased_until = ?, updated_at = ? WHERE fingerprint = ?",
+                (IN_FLIGHT, now + self.lease_timeout, now, row[0])
+            )
+        fingerprint, site, link, job, attempts = row
+        return {"fingerprint": fingerprint, "site": site, "link": link, "job": json.loads(job), "attempts": attempts}
+
+    def _finish(self, fingerprint, state, error=None, next_attempt=None):
+        now = time.time()
+        with self._lock:
+            self._conn.execute("""
+                UPDATE applications
+                SET state = ?, attempts = attempts + 1, last_error = ?, leased_until = NULL,
+                    next_attempt = COALESCE(?, next_attempt), updated_at = ?
+                WHERE fingerprint = ? AND state = ?
+            """, (state, error, next_attempt, now, fingerprint, IN_FLIGHT))
+
+    def complete(self, fingerprint):
+        self._finish(fingerprint, APPLIED)
+
+    def backoff(self, attempts):
+        """Delay before retry number `attempts`, with up to 20% jitter"""
+        delay = min(self.max_delay, self.base_delay * 2 ** max(attempts - 1, 0))
+        return delay * random.uniform(0.8, 1.0)
+
+    def fail(self, fingerprint, error, retryable=True, attempts=0):
+        """Record a failed attempt; returns True if the job will be retried"""
+        attempts += 1
+        if retryable and attempts < self.max_attempts:
+            self._finish(fingerprint, QUEUED, str(error), time.time() + self.backoff(attempts))
+            return True
+        self._finish(fingerprint, FAILED, str(error))
+        return False
+
+    def recover(self, expired_only=True):
+        """Return in-flight jobs to the queue; by default only those whose lease ran out"""
+        now = time.time()
+        query = "UPDATE applications SET state = ?, leased_until = NULL, updated_at = ? WHERE state = ?"
+        params = [QUEUED, now, IN_FLIGHT]
+        if expired_only:
+            query += " AND leased_until < ?"
+            params.append(now)
+        with self._lock:
+            return self._conn.execute(query, params).rowcount
+
+    def next_due(self):
+        """Earliest next_attempt among queued jobs, or None if the queue is empty"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT MIN(next_attempt) FROM applications WHERE state = ?", (QUEUED,)
+            ).fetchone()[0]
+
+    def counts(self):
+        """Number of jobs in each state"""
+        with self._lock:
+            return dict(self._conn.execute("SELECT state, COUNT(*) FROM applications GROUP BY state"))
+
+    def failures(self, limit=20):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT link, attempts, last_error FROM applications WHERE state = ? ORDER BY updated_at DESC LIMIT ?",
+                (FAILED, limit)
+            ).fetchall()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class ApplyMetrics:
+    def __init__(self):
+        """Throughput, latency and failure counts of one runner session"""
+        self._lock = threading.Lock()
+        self.started = time.monotonic()
+        self.sites = {}
+
+    def record(self, site, outcome, seconds):
+        with self._lock:
+            stats = self.sites.setdefault(site, {"applied": 0, "retried": 0, "failed": 0, "seconds": 0.0})
+            stats[outcome] += 1
+            stats["seconds"] += seconds
+
+    def summary(self):
+        elapsed = time.monotonic() - self.started
+        with self._lock:
+            totals = {key: sum(stats[key] for stats in self.sites.values()) for key in ("applied", "retried", "failed")}
+            sites = {site: dict(stats) for site, stats in self.sites.items()}
+        attempts = sum(totals.values())
+        return dict(totals, elapsed_s=elapsed, attempts=attempts,
+                    applied_per_min=totals["applied"] / elapsed * 60 if elapsed else 0.0,
+                    failure_rate=(totals["retried"] + totals["failed"]) / attempts if attempts else 0.0,
+                    sites=sites)
+
+    def report(self):
+        summary = self.summary()
+        lines = [f"Applied {summary['applied']} ({summary['applied_per_min']:.1f}/min), "
+                 f"{summary['retried']} retried, {summary['failed']} failed "
+                 f"({summary['failure_rate']:.0%} of {summary['attempts']} attempts) in {summary['elapsed_s']:.1f}s"]
+        for site, stats in sorted(summary["sites"].items()):
+            attempts = stats["applied"] + stats["retried"] + stats["failed"]
+            lines.append(f"  {site}: {stats['applied']} applied, {stats['retried']} retried, {stats['failed']} failed, "
+                         f"{stats['seconds'] / attempts:.2f}s per attempt")
+        return "\n".join(lines)
+
+
+class ApplicationRunner:
+    def __init__(self, queue, apply, workers=4, per_site=1, poll=0.5):
+        """Run queued applications on a bounded pool of worker threads
+
+        apply(job, link, idempotency_key) submits one application and raises ApplyError
+        on failure. At most `workers` applications run at once and at most `per_site`
+        of them against the same site.
+        """
+        self.queue = queue
+        self.apply = apply
+        self.workers = workers
+        self.per_site = per_site
+        self.poll = poll
+        self.metrics = ApplyMetrics()
+        self._active = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def _claim(self):
+        with self._lock:
+            busy = [site for site, count in self._active.items() if count >= self.per_site]
+            item = self.queue.claim(exclude_sites=busy)
+            if item is not None:
+                self._active[item["site"]] = self._active.get(item["site"], 0) + 1
+            return item
+
+    def _release(self, site):
+        with self._lock:
+            self._active[site] -= 1
+
+    def _idle(self):
+        with self._lock:
+            return not any(self._active.values())
+
+    def _worker(self, until_empty):
+        while not self._stop.is_set():
+            item = self._claim()
+            if item is None:
+                due = self.queue.next_due()
+                if until_empty and due is None and self._idle():
+                    return
+                wait = self.poll if due is None else min(self.poll, max(due - time.time(), 0.01))
+                self._stop.wait(wait)
+                continue
+
+            start = time.monotonic()
+            try:
+                self.apply(item["job"], item["link"], item["fingerprint"])
+            except Exception as e:
+                retryable = getattr(e, "retryable", True)
+                retried = self.queue.fail(item["fingerprint"], e, retryable, item["attempts"])
+                self.metrics.record(item["site"], "retried" if retried else "failed", time.monotonic() - start)
+            else:
+                self.queue.complete(item["fingerprint"])
+                self.metrics.record(item["site"], "applied", time.monotonic() - start)
+            finally:
+                self._release(item["site"])
+
+    def run(self, until_empty=True):
+        """Work the queue until nothing is queued or in flight (or stop() is called)
+
+        In-flight jobs left by a previous run that crashed are queued again first,
+        so only one runner should use a queue file at a time.
+        """
+        recovered = self.queue.recover(expired_only=False)
+        if recovered:
+            print(f"Recovered {recovered} applications left in flight by an earlier run")
+        threads = [threading.Thread(target=self._worker, args=(until_empty,), daemon=True) for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(0.5)
+        except KeyboardInterrupt:
+            self.stop()
+        print(self.metrics.report())
+        return self.metrics.summary()
+
+    def stop(self):
+        self._stop.set()
+
+
+class _FormParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.forms = []
+        self._form = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "form":
+            self._form = {"action": attrs.get("action") or "", "method": (attrs.get("method") or "get").lower(),
+                          "fields": {}}
+            self.forms.append(self._form)
+        elif self._form is not None and tag in ("input", "textarea", "select") and attrs.get("name"):
+            self._form["fields"][attrs["name"]] = {"type": (attrs.get("type") or tag).lower(),
+                                                   "value": attrs.get("value") or ""}
+
+    def handle_endtag(self, tag):
+        if tag == "form":
+            self._form = None
+
+
+class FormSubmitter:
+    def __init__(self, profile, timeout=20):
+        """Apply by filling the first form on an application page with profile values
+
+        profile maps form field names (e.g. name, email, phone, resume) to values.
+        Fields the profile doesn't cover keep their default (e.g. hidden) values, and a
+        page with no form is a permanent failure. Every submission carries an
+        Idempotency-Key so a retried one is not counted twice by the site.
+        """
+        self.profile = profile
+        self.client = httpx.Client(timeout=timeout, follow_redirects=True)
+
+    def _check(self, response):
+        if response.status_code == 429 or response.status_code >= 500:
+            raise ApplyError(f"HTTP {response.status_code} from {response.url}", retryable=True)
+        if response.status_code >= 400:
+            raise ApplyError(f"HTTP {response.status_code} from {response.url}", retryable=False)
+
+    def __call__(self, job, link, idempotency_key):
+        try:
+            page = self.client.get(link)
+            self._check(page)
+            parser = _FormParser()
+            parser.feed(page.text)
+            if not parser.forms:
+                raise ApplyError(f"No application form on {link}", retryable=False)
+            form = parser.forms[0]
+            data = {name: self.profile.get(name, field["value"]) for name, field in form["fields"].items()
+                    if field["type"] not in ("submit", "button")}
+            url = urljoin(str(page.url), form["action"])
+            headers = {"Idempotency-Key": idempotency_key}
+            if form["method"] == "post":
+                response = self.client.post(url, data=data, headers=headers)
+            else:
+                response = self.client.get(url, params=data, headers=headers)
+            self._check(response)
+        except httpx.HTTPError as e:
+            raise ApplyError(f"{type(e).__name__} on {link}: {e}", retryable=True)
+
+    def close(self):
+        self.client.close()
@@ -0,0 +1,61 @@
+"""Benchmark near-duplicate candidate generation as the corpus grows
+
+Run from the backend directory:  python benchmarks/bench_dedup.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dedup import NearDuplicateClusterer
+
+TITLES = ["Data Scientist", "Senior Data Scientist", "Machine Learning Engineer", "Software Engineer",
+          "Backend Engineer", "Data Analyst", "Product Manager", "DevOps Engineer", "Research Scientist"]
+SOURCE_NAMES = ["Indeed", "LinkedIn", "Glassdoor"]
+
+
+def make_vocabulary(rng, size=5000):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(3, 10))) for _ in range(size)]
+
+
+def make_corpus(size, duplicate_rate=0.3, seed=7):
+    """Synthetic postings where a share are lightly edited copies from another source"""
+    rng = random.Random(seed)
+    words = make_vocabulary(rng)
+    jobs = []
+    for i in range(size):
+        if jobs and rng.random() < duplicate_rate:
+            original = rng.choice(jobs)
+            job = dict(original)
+            job["title"] = original["title"].replace("Senior", "Sr.")
+            job["description"] = original["description"] + " Apply today."
+            job["source"] = rng.choice(SOURCE_NAMES)
+        else:
+            job = {
+                "title": rng.choice(TITLES),
+                "company": " ".join(rng.choice(words) for _ in range(2)).title(),
+                "description": " ".join(rng.choice(words) for _ in range(40)),
+                "source": rng.choice(SOURCE_NAMES),
+            }
+        jobs.append(job)
+    return jobs
+
+
+def run(sizes=(1000, 2000, 4000, 8000)):
+    print(f"{'jobs':>8} {'clusters':>9} {'comparisons':>12} {'per insert':>11} {'pairwise':>12} {'seconds':>8}")
+    for size in sizes:
+        clusterer = NearDuplicateClusterer()
+        start = time.perf_counter()
+        for i, job in enumerate(make_corpus(size)):
+            clusterer.add(i, job)
+        elapsed = time.perf_counter() - start
+        pairwise = size * (size - 1) // 2
+        print(f"{size:>8} {clusterer.cluster_count():>9} {clusterer.comparisons:>12} "
+              f"{clusterer.comparisons / size:>11.1f} {pairwise:>12} {elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    run()
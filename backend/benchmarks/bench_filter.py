@@ -0,0 +1,107 @@
+"""Benchmark the indexed filter engine against the original list-scan filter_jobs
+
+Run from the backend directory:  python benchmarks/bench_filter.py [size]
+"""
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_index import JobIndex
+
+TITLES = ["Data Scientist", "Senior Data Scientist", "Machine Learning Engineer", "Software Engineer",
+          "Backend Engineer", "Data Analyst", "Product Manager", "DevOps Engineer", "Research Scientist"]
+SKILLS = ["Python", "SQL", "AWS", "Spark", "Java", "Kubernetes", "TensorFlow", "React", "Go", "Tableau"]
+LOCATIONS = ["New York, NY", "San Francisco, CA", "Austin, TX", "Remote", "Seattle, WA", "Boston, MA",
+             "Chicago, IL", "Denver, CO (Remote Available)"]
+WORDS = ("build maintain deploy models pipelines dashboards stakeholders experiments platform services "
+         "latency customers analytics ownership mentoring roadmap machine learning data team").split()
+
+QUERIES = [
+    {"keywords": ["python", "machine learning"], "remote": True},
+    {"keywords": ["kubernetes"], "locations": ["new york"], "min_salary": 120000},
+    {"locations": ["austin", "seattle"], "min_salary": 150000},
+    {"min_salary": 100000},
+]
+
+
+def make_jobs(size, seed=11):
+    rng = random.Random(seed)
+    jobs = []
+    for _ in range(size):
+        low = rng.randrange(60, 200) * 1000
+        jobs.append({
+            "title": rng.choice(TITLES),
+            "company": f"Company {rng.randrange(10000)}",
+            "location": rng.choice(LOCATIONS),
+            "salary": rng.choice([f"${low:,} - ${low + 30000:,}", "Not specified"]),
+            "description": " ".join(rng.choice(WORDS) for _ in range(25)),
+            "skills": rng.sample(SKILLS, 3),
+        })
+    return jobs
+
+
+def legacy_filter(jobs, keywords=None, locations=None, remote=False, min_salary=None):
+    """The list-scan implementation filter_jobs used before the index"""
+    filtered_jobs = jobs.copy()
+    if keywords:
+        filtered_jobs = [job for job in filtered_jobs if
+                         any(keyword.lower() in job.get('title', '').lower() or
+                             keyword.lower() in job.get('description', '').lower() or
+                             (job.get('skills') and any(keyword.lower() in skill.lower() for skill in job.get('skills', [])))
+                             for keyword in keywords)]
+    if locations:
+        filtered_jobs = [job for job in filtered_jobs if
+                         any(location.lower() in job.get('location', '').lower() for location in locations)]
+    if remote:
+        remote_keywords = ['remote', 'work from home', 'wfh', 'virtual']
+        filtered_jobs = [job for job in filtered_jobs if
+                         any(keyword in job.get('location', '').lower() or
+                             keyword in job.get('title', '').lower() or
+                             keyword in job.get('description', '').lower()
+                             for keyword in remote_keywords)]
+    if min_salary:
+        def extract_salary_value(salary_str):
+            if not salary_str or salary_str == "Not specified":
+                return 0
+            numbers = re.findall(r'\d+[,\d]*', salary_str)
+            if numbers:
+                return float(numbers[0].replace(',', ''))
+            return 0
+        filtered_jobs = [job for job in filtered_jobs if extract_salary_value(job.get('salary', '')) >= min_salary]
+    return filtered_jobs
+
+
+def best_of(fn, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def run(size=1_000_000):
+    print(f"Generating {size:,} jobs...")
+    jobs = make_jobs(size)
+
+    start = time.perf_counter()
+    index = JobIndex()
+    for i, job in enumerate(jobs):
+        index.add(job, key=i)
+    print(f"Indexed in {time.perf_counter() - start:.1f}s\n")
+
+    print(f"{'query':<80} {'matches':>9} {'legacy ms':>10} {'index ms':>9}")
+    for query in QUERIES:
+        legacy_time, legacy_result = best_of(lambda: legacy_filter(jobs, **query), repeat=1)
+        index_time, ids = best_of(lambda: index.search(**query))
+        print(f"{str(query):<80} {len(ids):>9,} {legacy_time * 1000:>10.1f} {index_time * 1000:>9.2f}")
+        if len(legacy_result) != len(ids):
+            print(f"  MISMATCH: legacy matched {len(legacy_result):,}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
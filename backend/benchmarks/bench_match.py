@@ -0,0 +1,98 @@
+"""Benchmark resume-to-job ranking with the sparse match index
+
+Builds an index over synthetic postings, saves it, reopens it memory-mapped and
+times top-50 queries for single resumes and for a batch.
+
+Run from the backend directory:  python benchmarks/bench_match.py [size]
+"""
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resume_ai import MatchIndex
+
+TITLES = ["Data Scientist", "Senior Data Scientist", "Machine Learning Engineer", "Software Engineer",
+          "Backend Engineer", "Data Analyst", "Product Manager", "DevOps Engineer", "Research Scientist"]
+SKILLS = ["Python", "SQL", "AWS", "Spark", "Java", "Kubernetes", "TensorFlow", "React", "Go", "Tableau",
+          "PyTorch", "Airflow", "Scala", "Docker", "Snowflake", "dbt", "Terraform", "Rust", "Excel", "Looker"]
+
+
+def make_vocabulary(rng, size=20000):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(3, 10))) for _ in range(size)]
+
+
+def zipf_words(rng, words, count):
+    # Word frequencies in postings are roughly Zipfian: a few very common, a long tail
+    return [words[min(int(rng.paretovariate(1.0)) - 1, len(words) - 1)] for _ in range(count)]
+
+
+def make_jobs(size, rng, words):
+    return [{
+        "title": rng.choice(TITLES),
+        "description": " ".join(zipf_words(rng, words, 40)),
+        "skills": rng.sample(SKILLS, 4),
+    } for _ in range(size)]
+
+
+def make_resumes(count, rng, words):
+    return [" ".join(rng.sample(TITLES, 2) + rng.sample(SKILLS, 6) + zipf_words(rng, words, 250))
+            for _ in range(count)]
+
+
+def best_of(fn, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def run(size=1_000_000, batch=16):
+    rng = random.Random(3)
+    words = make_vocabulary(rng)
+    rng.shuffle(words)
+
+    index = MatchIndex()
+    start = time.perf_counter()
+    for offset in range(0, size, 50000):
+        jobs = make_jobs(min(50000, size - offset), rng, words)
+        index.add_many(jobs, range(offset, offset + len(jobs)))
+    index.merge()
+    print(f"Indexed {size:,} jobs in {time.perf_counter() - start:.1f}s ({index._base.nnz:,} nonzeros)")
+
+    directory = tempfile.mkdtemp(prefix="jobbot-match-")
+    try:
+        start = time.perf_counter()
+        index.save(directory)
+        print(f"Saved in {time.perf_counter() - start:.1f}s")
+        start = time.perf_counter()
+        index = MatchIndex.load(directory)
+        print(f"Opened memory-mapped in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        resumes = make_resumes(batch, rng, words)
+        index.top_k(resumes[:1])  # page in the postings once
+        single, results = best_of(lambda: index.top_k(resumes[:1], k=50))
+        batched, _ = best_of(lambda: index.top_k(resumes, k=50), repeat=3)
+        print(f"Top-50 for one resume: {single * 1000:.1f} ms ({len(results[0])} results, best score {results[0][0][1]:.3f})")
+        print(f"Top-50 for {batch} resumes in one batch: {batched * 1000:.1f} ms "
+              f"({batched / batch * 1000:.1f} ms per resume)")
+
+        # Incremental update on top of the mapped index
+        start = time.perf_counter()
+        index.add_many(make_jobs(1000, rng, words), range(size, size + 1000))
+        added = time.perf_counter() - start
+        with_delta, _ = best_of(lambda: index.top_k(resumes[:1], k=50))
+        print(f"Added 1,000 jobs in {added * 1000:.1f} ms; top-50 with the delta: {with_delta * 1000:.1f} ms")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
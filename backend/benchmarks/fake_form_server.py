@@ -0,0 +1,86 @@
+"""Local stand-in for a job site's application form
+
+GET /jobs/<id> serves a small application form; POST /apply/<id> accepts it after a
+configurable delay, failing a share of submissions with 503 or 429 so retries get
+exercised. Submissions are de-duplicated on the Idempotency-Key header.
+"""
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+_FORM = """<!DOCTYPE html><html><body><h1>Apply for job {job_id}</h1>
+<form action="/apply/{job_id}" method="post">
+<input type="hidden" name="job_id" value="{job_id}">
+<input type="text" name="name"><input type="email" name="email"><input type="tel" name="phone">
+<textarea name="resume"></textarea><input type="submit" value="Apply">
+</form></body></html>"""
+
+
+class FakeFormServer:
+    def __init__(self, latency=0.05, failure_rate=0.2, port=0, seed=0):
+        """Serve application forms; failure_rate of submissions get a 503 or 429"""
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.submissions = {}
+        self.duplicates = 0
+        self.rejected = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _send(self, status, body=b"", content_type="text/html"):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client was killed mid-request, as the crash test does on purpose
+                    pass
+
+            def do_GET(self):
+                parts = self.path.strip("/").split("/")
+                if len(parts) == 2 and parts[0] == "jobs":
+                    self._send(200, _FORM.format(job_id=parts[1]).encode("utf-8"))
+                elif len(parts) == 2 and parts[0] == "gone":
+                    self._send(404, b"This job is no longer available")
+                else:
+                    self._send(404)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                fields = parse_qs(self.rfile.read(length).decode("utf-8"))
+                time.sleep(server.latency)
+                key = self.headers.get("Idempotency-Key") or fields.get("email", [""])[0]
+                with server._lock:
+                    if key in server.submissions:
+                        server.duplicates += 1
+                        self._send(200, b"Already applied")
+                        return
+                    if server._rng.random() < server.failure_rate:
+                        server.rejected += 1
+                        self._send(server._rng.choice([503, 429]), b"Try again later")
+                        return
+                    if not fields.get("email"):
+                        self._send(400, b"Email is required")
+                        return
+                    server.submissions[key] = fields
+                self._send(200, b"Application received")
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,182 @@
+"""Local stand-in for the OpenAI chat completions endpoint
+
+Point the client at it with OpenAI(api_key="test", base_url=<base_url>). Responses are
+built from the "[Card N] a | b | c" lines the extractor sends, after a configurable delay.
+With max_concurrent set, requests beyond that many in flight get a 429 with Retry-After,
+like a provider enforcing a rate limit.
+"""
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_CARD_LINE = re.compile(r"^\[Card \d+\] (.*)$", re.MULTILINE)
+
+
+def canned_jobs(content):
+    """Turn reduced card lines into the jobs JSON the real model would return"""
+    jobs = []
+    for line in _CARD_LINE.findall(content):
+        fields, _, links = line.partition(" | links: ")
+        parts = [part.strip() for part in fields.split(" | ")]
+        parts += ["Not specified"] * (5 - len(parts))
+        jobs.append({
+            "title": parts[0],
+            "company": parts[1],
+            "location": parts[2],
+            "salary": parts[3],
+            "description": parts[4],
+            "application_link": links.split()[0] if links else "Not specified",
+            "skills": ["Python", "SQL"],
+            "job_type": "Full-time",
+            "date_posted": "Not specified",
+        })
+    return {"jobs": jobs}
+
+
+class FakeOpenAIServer:
+    def __init__(self, latency=0.5, port=0, response=None, max_concurrent=None, retry_after=0.5, wrap=None):
+        """Serve /v1/chat/completions with `latency` seconds of delay per request
+
+        `response` overrides the canned content (a dict is JSON-encoded). `wrap` is a
+        format string put around the content, e.g. prose and a code fence. Replies are
+        cut off at the request's max_tokens, and "stream": true is answered with
+        server-sent events.
+        """
+        self.latency = latency
+        self.response = response
+        self.wrap = wrap
+        self.max_concurrent = max_concurrent
+        self.retry_after = retry_after
+        self.requests = 0
+        self.rate_limited = 0
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                with server._lock:
+                    limited = server.max_concurrent is not None and server.in_flight >= server.max_concurrent
+                    if limited:
+                        server.rate_limited += 1
+                    else:
+                        server.requests += 1
+                        server.in_flight += 1
+                if limited:
+                    self._rate_limit()
+                    return
+                try:
+                    content, finish_reason = self._content(body)
+                    if body.get("stream"):
+                        self._stream(body, content, finish_reason)
+                    else:
+                        time.sleep(server.latency)
+                        self._complete(body, content, finish_reason)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up on the request, e.g. a cancelled batch
+                    pass
+                finally:
+                    with server._lock:
+                        server.in_flight -= 1
+
+            def _content(self, body):
+                prompt = self._prompt(body)
+                if server.response is None:
+                    content = json.dumps(canned_jobs(prompt))
+                elif isinstance(server.response, str):
+                    content = server.response
+                else:
+                    content = json.dumps(server.response)
+                if server.wrap:
+                    content = server.wrap.format(content)
+                # Cut the reply off at max_tokens like the real API does
+                max_chars = (body.get("max_tokens") or 0) * 4
+                if max_chars and len(content) > max_chars:
+                    return content[:max_chars], "length"
+                return content, "stop"
+
+            def _prompt(self, body):
+                return "\n".join(str(m.get("content", "")) for m in body.get("messages", []))
+
+            def _usage(self, body, content):
+                prompt = self._prompt(body)
+                return {
+                    "prompt_tokens": len(prompt) // 4,
+                    "completion_tokens": len(content) // 4,
+                    "total_tokens": (len(prompt) + len(content)) // 4,
+                }
+
+            def _complete(self, body, content, finish_reason):
+                payload = {
+                    "id": f"chatcmpl-fake-{server.requests}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body.get("model", "fake"),
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": finish_reason,
+                    }],
+                    "usage": self._usage(body, content),
+                }
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _stream(self, body, content, finish_reason):
+                """Server-sent events: a fifth of the latency before the first token, the
+                rest spread evenly over chunks of about four tokens"""
+                pieces = [content[i:i + 16] for i in range(0, len(content), 16)] or [""]
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.end_headers()
+                time.sleep(server.latency * 0.2)
+
+                def event(choices, usage=None):
+                    chunk = {"id": f"chatcmpl-fake-{server.requests}", "object": "chat.completion.chunk",
+                             "created": int(time.time()), "model": body.get("model", "fake"), "choices": choices}
+                    if usage is not None:
+                        chunk["usage"] = usage
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+
+                for i, piece in enumerate(pieces):
+                    delta = {"content": piece} if i else {"role": "assistant", "content": piece}
+                    event([{"index": 0, "delta": delta, "finish_reason": None}])
+                    time.sleep(server.latency * 0.8 / len(pieces))
+                event([{"index": 0, "delta": {}, "finish_reason": finish_reason}])
+                if (body.get("stream_options") or {}).get("include_usage"):
+                    event([], self._usage(body, content))
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+
+            def _rate_limit(self):
+                data = json.dumps({"error": {"message": "Rate limit reached", "type": "requests",
+                                             "code": "rate_limit_exceeded"}}).encode("utf-8")
+                self.send_response(429)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Retry-After", str(server.retry_after))
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}/v1"
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,129 @@
+"""Local HTTP server that replays recorded job-board pages
+
+Fixtures live in benchmarks/fixtures/<source>.html. Capture a live page with
+`python benchmarks/fixture_server.py record <source> <url>`, or regenerate the
+synthetic stand-ins with `python benchmarks/fixture_server.py synthetic`.
+"""
+import os
+import random
+import sys
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from functools import partial
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def do_GET(self):
+        # Every page of a search replays the same recording; drop the query string
+        self.path = self.path.split("?", 1)[0]
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fixture_server(directory=FIXTURES_DIR, port=0):
+    """Serve the fixtures directory on localhost and return (server, base_url)"""
+    server = ThreadingHTTPServer(("127.0.0.1", port), partial(_QuietHandler, directory=directory))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def record(source, url, directory=FIXTURES_DIR):
+    """Save the rendered page source of a live URL as a fixture"""
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from Claudescraper import WebsiteCrawler
+
+    page_source = WebsiteCrawler(url, 30).crawl()
+    if not page_source:
+        print(f"Could not record {url}")
+        return
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{source}.html")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(page_source)
+    print(f"Recorded {len(page_source):,} characters to {path}")
+
+
+_TITLES = ["Data Scientist", "Senior Data Scientist", "Machine Learning Engineer", "Data Analyst",
+           "Applied Scientist", "Analytics Engineer", "Research Scientist", "ML Platform Engineer"]
+_COMPANIES = ["Northwind Analytics", "Contoso Health", "Fabrikam AI", "Tailspin Capital", "Adatum Labs",
+              "Woodgrove Bank", "Litware Media", "Proseware Inc."]
+_LOCATIONS = ["New York, NY", "Remote", "Brooklyn, NY", "Jersey City, NJ", "New York, NY (Hybrid)"]
+
+
+def _noise(rng, kilobytes):
+    """Inline scripts, styles and tracking markup like a real page's head"""
+    blob = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz0123456789{}();=") for _ in range(1024))
+    scripts = "".join(f"<script>window.__data{i}='{blob}';</script>" for i in range(kilobytes // 2))
+    styles = "".join(f"<style>.c{i}{{color:#{i:06x};margin:{i}px}}</style>" for i in range(200))
+    return scripts + styles
+
+
+def _cards(source, rng, count):
+    cards = []
+    for i in range(count):
+        title, company = rng.choice(_TITLES), rng.choice(_COMPANIES)
+        location = rng.choice(_LOCATIONS)
+        salary = f"${rng.randrange(90, 180)},000 - ${rng.randrange(180, 240)},000 a year"
+        snippet = "Build models and pipelines with Python, SQL and Spark; partner with product teams."
+        if source == "indeed":
+            cards.append(
+                f'<li><div class="cardOutline tapItem job_seen_beacon" data-jk="{i:016x}">'
+                f'<h2 class="jobTitle css-1"><a class="jcs-JobTitle" href="/rc/clk?jk={i:016x}&from=serp">'
+                f'<span title="{title}">{title}</span></a></h2>'
+                f'<span data-testid="company-name">{company}</span>'
+                f'<div data-testid="text-location">{location}</div>'
+                f'<div data-testid="attribute_snippet_testid">{salary}</div>'
+                f'<div class="job-snippet"><ul><li>{snippet}</li></ul></div>'
+                f'<span class="date">Posted {rng.randrange(1, 30)} days ago</span>'
+                f'<svg viewBox="0 0 24 24"><path d="M12 2L2 7l10 5 10-5-10-5z"/></svg></div></li>'
+            )
+        elif source == "linkedin":
+            cards.append(
+                f'<li><div class="base-card base-search-card job-search-card" data-entity-urn="urn:li:jobPosting:{i}">'
+                f'<a class="base-card__full-link" href="https://www.linkedin.com/jobs/view/{3900000000 + i}?trk=public_jobs">'
+                f'<span class="sr-only">{title}</span></a>'
+                f'<div class="base-search-card__info"><h3 class="base-search-card__title">{title}</h3>'
+                f'<h4 class="base-search-card__subtitle"><a href="/company/{i}">{company}</a></h4>'
+                f'<div class="base-search-card__metadata"><span class="job-search-card__location">{location}</span>'
+                f'<span class="job-search-card__salary-info">{salary}</span>'
+                f'<time datetime="2026-10-{rng.randrange(1, 17):02d}">1 week ago</time></div></div></div></li>'
+            )
+        else:
+            cards.append(
+                f'<li data-test="jobListing" class="JobsList_jobListItem__wjTHv"><div class="JobCard_jobCardContainer__arQlW">'
+                f'<span class="EmployerProfile_compactEmployerName__9MGcV">{company}</span>'
+                f'<a data-test="job-title" class="JobCard_jobTitle__GLyJ1" href="/partner/jobListing.htm?jobListingId={1009000000 + i}">{title}</a>'
+                f'<div data-test="emp-location">{location}</div>'
+                f'<div data-test="detailSalary">{salary}</div>'
+                f'<div class="JobCard_jobDescriptionSnippet__yWW8q">{snippet}</div>'
+                f'<div data-test="job-age">{rng.randrange(1, 30)}d</div></div></li>'
+            )
+    return "".join(cards)
+
+
+def generate_synthetic(directory=FIXTURES_DIR, cards=25, seed=42):
+    """Write synthetic stand-ins that mimic each board's markup and page weight"""
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    for source in ("indeed", "linkedin", "glassdoor"):
+        html = (f"<!DOCTYPE html><html><head><title>{source} jobs</title>{_noise(rng, 60)}</head>"
+                f"<body><header><nav><a href='/'>Home</a><a href='/jobs'>Jobs</a></nav></header>"
+                f"<main><ul class='results'>{_cards(source, rng, cards)}</ul></main>"
+                f"{_noise(rng, 20)}<footer>© {source}</footer></body></html>")
+        path = os.path.join(directory, f"{source}.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(html)
+        print(f"Wrote {len(html):,} characters to {path}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 4 and sys.argv[1] == "record":
+        record(sys.argv[2], sys.argv[3])
+    elif len(sys.argv) >= 2 and sys.argv[1] == "synthetic":
+        generate_synthetic()
+    else:
+        print(__doc__)
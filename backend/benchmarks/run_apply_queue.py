@@ -0,0 +1,74 @@
+"""Exercise the application queue against local stand-in form servers
+
+Queues applications across three fake sites, kills the first runner mid-flight to
+simulate a crash, resumes with a fresh runner and checks that every reachable job
+was applied to exactly once.
+
+Run from the backend directory:  python benchmarks/run_apply_queue.py [jobs]
+"""
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from auto_apply import ApplicationQueue, ApplicationRunner, FormSubmitter, APPLIED, FAILED
+from fake_form_server import FakeFormServer
+
+PROFILE = {"name": "Ada Lovelace", "email": "ada@example.com", "phone": "555-0100", "resume": "Analyst, engines."}
+
+
+def open_queue(path):
+    return ApplicationQueue(path, max_attempts=4, base_delay=0.2, max_delay=2, lease_timeout=30)
+
+
+def crashing_run(path, workers):
+    """Child process body: work the queue until the parent kills it"""
+    ApplicationRunner(open_queue(path), FormSubmitter(PROFILE), workers=workers, per_site=2).run()
+
+
+def run(jobs=60, workers=6, crash_after=1.0):
+    sites = [FakeFormServer(latency=0.2, failure_rate=0.2, seed=i).start() for i in range(3)]
+    path = os.path.join(tempfile.mkdtemp(prefix="jobbot-apply-"), "applications.sqlite")
+    queue = open_queue(path)
+
+    postings = [{"title": f"Job {i}", "company": f"Company {i % 7}", "location": "Remote",
+                 "application_link": f"{sites[i % 3].base_url}/jobs/{i}"} for i in range(jobs)]
+    # A few postings that were taken down, which must fail without retries
+    postings += [{"title": f"Expired {i}", "company": "Gone Inc.", "location": "Remote",
+                  "application_link": f"{sites[i].base_url}/gone/{i}"} for i in range(3)]
+    print(f"Queued {queue.enqueue_many(postings)} applications; re-enqueueing adds {queue.enqueue_many(postings)}")
+
+    child = multiprocessing.Process(target=crashing_run, args=(path, workers))
+    child.start()
+    time.sleep(crash_after)
+    child.kill()
+    child.join()
+    print(f"Killed the first runner after {crash_after:.1f}s: {queue.counts()}")
+
+    runner = ApplicationRunner(queue, FormSubmitter(PROFILE), workers=workers, per_site=2)
+    runner.run()
+
+    counts = queue.counts()
+    submitted = sum(len(site.submissions) for site in sites)
+    duplicates = sum(site.duplicates for site in sites)
+    print(f"Final states: {counts}")
+    print(f"Sites received {submitted} applications ({duplicates} repeated submissions were deduplicated, "
+          f"{sum(site.rejected for site in sites)} rejected with 503/429)")
+    for link, attempts, error in queue.failures(limit=5):
+        print(f"  failed after {attempts} attempts: {link} ({error})")
+
+    ok = counts.get(APPLIED, 0) == submitted and counts.get(APPLIED, 0) + counts.get(FAILED, 0) == len(postings)
+    print("OK: every job applied exactly once or failed" if ok else "MISMATCH between queue and sites")
+
+    queue.close()
+    for site in sites:
+        site.stop()
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run(int(sys.argv[1]) if len(sys.argv) > 1 else 60) else 1)
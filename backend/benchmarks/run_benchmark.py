@@ -0,0 +1,236 @@
+"""Offline end-to-end benchmark of the scraping pipeline
+
+Replays the recorded pages in benchmarks/fixtures from a local HTTP server and points
+the OpenAI client at a local stand-in, so runs are repeatable and cost nothing.
+
+Run from the backend directory:
+    python benchmarks/run_benchmark.py --pages 3 --llm-latency 0.5 [--no-browser] [--force-llm] [--wait-mode sleep]
+                                       [--stream] [--llm-wrap]
+
+Each run is saved to benchmarks/results/ and compared with the previous run.
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import urllib.request
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import Claudescraper
+from Claudescraper import JobScraper, SOURCES
+from crawl_scheduler import CrawlTask
+from extractors import ExtractorRegistry
+from fake_openai import FakeOpenAIServer
+from fixture_server import start_fixture_server
+from streaming_extraction import JobStreamParser
+
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+# Prose and a code fence around the JSON, as models add without JSON mode
+LLM_WRAP = "Here are the job listings I found:\n```json\n{}\n```\nLet me know if you need anything else."
+STAGES = ["driver_start", "page_load", "html_reduction", "selector_extract", "llm_round_trip", "parse", "persist"]
+
+
+class StageTimer:
+    def __init__(self):
+        self.durations = {stage: [] for stage in STAGES}
+
+    def wrap(self, stage, fn):
+        """Return fn wrapped so every call's duration is recorded under stage"""
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.durations[stage].append(time.perf_counter() - start)
+        return timed
+
+    def summary(self):
+        out = {}
+        for stage, values in self.durations.items():
+            if not values:
+                continue
+            out[stage] = {
+                "count": len(values),
+                "total_s": sum(values),
+                "mean_ms": statistics.mean(values) * 1000,
+                "p50_ms": statistics.median(values) * 1000,
+                "max_ms": max(values) * 1000,
+            }
+        return out
+
+
+class StaticPage:
+    """Minimal stand-in for WebsiteCrawler when pages are fetched without a browser"""
+
+    def __init__(self, url, page_source):
+        self.url = url
+        self.page_source = page_source
+        self.reduction = None
+
+    def get_page_source(self):
+        return self.page_source
+
+
+def fetch_static(task):
+    with urllib.request.urlopen(task.url, timeout=30) as response:
+        return StaticPage(task.url, response.read().decode("utf-8", errors="replace"))
+
+
+def instrument(scraper, timer, browser):
+    """Wrap each pipeline stage of a scraper with the stage timer"""
+    scraper._fetch_page = timer.wrap("page_load", scraper._fetch_page if browser else fetch_static)
+    scraper.extractors.extract = timer.wrap("selector_extract", scraper.extractors.extract)
+    # A streamed completion returns before any of the reply has arrived, so the round
+    # trip is timed around the whole request, including reading the stream
+    Claudescraper.stream_jobs = timer.wrap("llm_round_trip", Claudescraper.stream_jobs)
+    Claudescraper.request_jobs = timer.wrap("llm_round_trip", Claudescraper.request_jobs)
+    scraper.store.upsert_many = timer.wrap("persist", scraper.store.upsert_many)
+    Claudescraper.reduce_html = timer.wrap("html_reduction", Claudescraper.reduce_html)
+    # Replies are parsed piece by piece while they stream in (and whole on a cache hit)
+    JobStreamParser.feed = timer.wrap("parse", JobStreamParser.feed)
+
+
+def run(args):
+    # Fixed seed so the crawler's human-like pauses are the same on every run
+    random.seed(0)
+
+    fixture_server, fixture_url = start_fixture_server()
+    fake = FakeOpenAIServer(latency=args.llm_latency, wrap=LLM_WRAP if args.llm_wrap else None).start()
+    workdir = tempfile.mkdtemp(prefix="jobbot-bench-")
+
+    scraper = JobScraper(
+        api_key="test",
+        base_url=fake.base_url,
+        cache_path=os.path.join(workdir, "cache.sqlite"),
+        bypass_cache=True,
+        store_path=os.path.join(workdir, "jobs.sqlite"),
+        rate_per_domain=1000,
+        pool_size=len(SOURCES),
+        trace=True,
+        # Browser runs measure Chrome, so don't let the plain HTTP path serve the fixtures
+        http_first=False,
+        wait_mode=args.wait_mode,
+        stream_extraction=args.stream,
+    )
+    if args.force_llm:
+        scraper.extractors = ExtractorRegistry(selector_sets={})
+
+    timer = StageTimer()
+    instrument(scraper, timer, browser=not args.no_browser)
+
+    if not args.no_browser:
+        timer.wrap("driver_start", scraper.driver_pool.warm)()
+
+    tasks = [
+        CrawlTask(source, f"{source}.fixtures", page, f"{fixture_url}/{source}.html?page={page}")
+        for source in SOURCES for page in range(args.pages)
+    ]
+
+    jobs = 0
+    start = time.perf_counter()
+    for task, page_jobs in scraper._iter_pages(tasks):
+        jobs += len(page_jobs)
+    wall = time.perf_counter() - start
+    trace = scraper.tracer.summary()
+
+    extraction = scraper.extraction_stats
+    scraper.close()
+    fake.stop()
+    fixture_server.shutdown()
+
+    return {
+        "label": args.label,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {
+            "pages_per_source": args.pages,
+            "llm_latency_s": args.llm_latency,
+            "browser": not args.no_browser,
+            "force_llm": args.force_llm,
+            "wait_mode": args.wait_mode,
+            "stream": args.stream,
+            "llm_wrap": args.llm_wrap,
+        },
+        "pages": len(tasks),
+        "jobs": jobs,
+        "llm_requests": fake.requests,
+        "llm_first_job_s": extraction.mean_first_job,
+        "llm_parse_failure_rate": extraction.failure_rate,
+        "llm_truncated": extraction.truncated,
+        "wall_s": wall,
+        "jobs_per_s": jobs / wall if wall else 0.0,
+        "stages": timer.summary(),
+        "llm_usage": trace["usage_by_source"],
+        "llm_cost_usd": trace["total_cost_usd"],
+    }
+
+
+def print_report(result, previous=None):
+    print(f"\nPages: {result['pages']}  Jobs: {result['jobs']}  LLM requests: {result['llm_requests']}")
+    print(f"Wall time: {result['wall_s']:.2f}s  Throughput: {result['jobs_per_s']:.1f} jobs/s")
+    if result.get("llm_usage"):
+        tokens = sum(u["prompt_tokens"] + u["completion_tokens"] for u in result["llm_usage"].values())
+        print(f"LLM tokens: {tokens:,}  Estimated cost: ${result['llm_cost_usd']:.4f}")
+    if result.get("llm_first_job_s") is not None:
+        print(f"LLM time to first parsed job: {result['llm_first_job_s'] * 1000:.0f} ms  "
+              f"Parse failures: {result['llm_parse_failure_rate']:.0%}  Truncated replies: {result['llm_truncated']}")
+    if previous:
+        change = (result['jobs_per_s'] - previous['jobs_per_s']) / max(previous['jobs_per_s'], 1e-9) * 100
+        print(f"Throughput vs previous run ({previous['timestamp']}): {change:+.1f}%")
+
+    print(f"\n{'stage':<18} {'count':>6} {'mean ms':>10} {'p50 ms':>10} {'max ms':>10} {'vs prev':>9}")
+    for stage, stats in result["stages"].items():
+        delta = ""
+        if previous and stage in previous.get("stages", {}):
+            before = previous["stages"][stage]["mean_ms"]
+            delta = f"{(stats['mean_ms'] - before) / max(before, 1e-9) * 100:+.1f}%"
+        print(f"{stage:<18} {stats['count']:>6} {stats['mean_ms']:>10.2f} {stats['p50_ms']:>10.2f} "
+              f"{stats['max_ms']:>10.2f} {delta:>9}")
+
+
+def latest_result(config):
+    """Most recent saved run with the same configuration, if any"""
+    for path in sorted(glob.glob(os.path.join(RESULTS_DIR, "*.json")), reverse=True):
+        with open(path, encoding="utf-8") as f:
+            result = json.load(f)
+        if result.get("config") == config:
+            return result
+    return None
+
+
+def save_result(result):
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    name = f"{result['timestamp'].replace(':', '')}-{result['label']}.json"
+    path = os.path.join(RESULTS_DIR, name)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=3, help="pages replayed per source")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="seconds of delay per fake LLM call")
+    parser.add_argument("--no-browser", action="store_true", help="fetch fixtures over plain HTTP instead of Chrome")
+    parser.add_argument("--force-llm", action="store_true", help="disable selector extraction so every page hits the LLM")
+    parser.add_argument("--wait-mode", choices=["events", "sleep"], default="events",
+                        help="how Chrome waits for pages; run both to compare page times")
+    parser.add_argument("--stream", action="store_true", help="stream LLM replies instead of waiting for whole ones")
+    parser.add_argument("--llm-wrap", action="store_true", help="wrap fake LLM replies in prose and a code fence")
+    parser.add_argument("--label", default="run", help="name saved with the results")
+    args = parser.parse_args()
+
+    result = run(args)
+    previous = latest_result(result["config"])
+    print_report(result, previous)
+    print(f"\nSaved results to {save_result(result)}")
+
+
+if __name__ == "__main__":
+    main()
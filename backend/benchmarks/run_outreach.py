@@ -0,0 +1,86 @@
+"""Exercise batched outreach generation against the local OpenAI stand-in
+
+Generates messages for job/contact pairs (a share of them exact repeats) against a
+server that rate-limits beyond a fixed number of concurrent requests, interrupts the
+first batch part-way, resumes it from the checkpoint and checks that no finished
+message is generated again (only requests still in flight at the interruption are).
+
+Run from the backend directory:  python benchmarks/run_outreach.py [pairs]
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from outreach import OutreachGenerator
+from fake_openai import FakeOpenAIServer
+
+SENDER = "Data analyst with five years of Python, SQL and dashboarding experience in retail."
+
+
+def make_pairs(count, rng, repeat_share=0.2):
+    pairs = []
+    for i in range(count):
+        if pairs and rng.random() < repeat_share:
+            pairs.append(rng.choice(pairs))
+            continue
+        job = {"title": rng.choice(["Data Analyst", "Data Scientist", "Analytics Engineer"]),
+               "company": f"Company {i % 97}", "location": "Remote", "skills": ["Python", "SQL"],
+               "application_link": f"https://example.com/jobs/{i}"}
+        contact = {"name": f"Contact {i}", "title": "Hiring Manager", "company": job["company"]}
+        pairs.append((job, contact))
+    return pairs
+
+
+def run(count=400, latency=0.2, server_limit=12):
+    server = FakeOpenAIServer(latency=latency, response="Hi, I'd love to chat about the role.",
+                              max_concurrent=server_limit, retry_after=0.3).start()
+    directory = tempfile.mkdtemp(prefix="jobbot-outreach-")
+    output_path = os.path.join(directory, "outreach.jsonl")
+    checkpoint_path = os.path.join(directory, "outreach.checkpoint.json")
+    pairs = make_pairs(count, random.Random(5))
+
+    def generator(cache_name):
+        return OutreachGenerator(api_key="test", base_url=server.base_url, concurrency=8, max_concurrency=32,
+                                 base_delay=0.2, cache_path=os.path.join(directory, cache_name))
+
+    first = generator("cache-first.sqlite")
+    sequential = len(pairs) * latency
+
+    async def interrupted():
+        task = asyncio.ensure_future(first.agenerate(pairs, "email", SENDER, output_path, checkpoint_path, flush_every=20))
+        await asyncio.sleep(sequential / 20)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(interrupted())
+    finished = first.stats["generated"]
+    print(f"Interrupted the first batch after {finished} messages "
+          f"({server.requests - finished} requests lost in flight, {server.rate_limited} rate-limited)")
+
+    # A separate cache file, so anything skipped on resume is skipped thanks to the checkpoint
+    second = generator("cache-second.sqlite")
+    messages = second.generate(pairs, "email", SENDER, output_path, checkpoint_path)
+    print(second.report())
+    print(f"Sequential calls would take about {sequential:.0f}s; the resumed batch took {second.stats['seconds']:.1f}s")
+
+    stats = second.stats
+    ok = (all(messages) and stats["resumed"] == finished
+          and stats["generated"] == stats["unique"] - finished)
+    print("OK: finished messages were resumed, not regenerated" if ok
+          else f"MISMATCH: resumed {stats['resumed']} of {finished}, generated {stats['generated']}")
+    first.close()
+    second.close()
+    server.stop()
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run(int(sys.argv[1]) if len(sys.argv) > 1 else 400) else 1)
@@ -0,0 +1,74 @@
+from concurrent.futures import ThreadPoolExecutor
+
+# Rough characters-per-token ratio for English text and compact markup
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text):
+    """Cheap token estimate used to size chunks without a tokenizer"""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def chunk_cards(cards, token_budget=3000):
+    """Pack job cards into chunks that stay under a token budget
+
+    Cards are never split across chunks unless a single card is larger than the
+    whole budget, in which case it is cut into budget-sized pieces.
+    """
+    max_chars = token_budget * CHARS_PER_TOKEN
+    chunks, current, current_tokens = [], [], 0
+
+    for card in cards:
+        if estimate_tokens(card) > token_budget:
+            if current:
+                chunks.append("\n".join(current))
+                current, current_tokens = [], 0
+            chunks.extend(card[i:i + max_chars] for i in range(0, len(card), max_chars))
+            continue
+
+        card_tokens = estimate_tokens(card)
+        if current and current_tokens + card_tokens > token_budget:
+            chunks.append("\n".join(current))
+            current, current_tokens = [], 0
+        current.append(card)
+        current_tokens += card_tokens
+
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def job_key(job):
+    """Identity used to drop the same posting extracted from overlapping chunks"""
+    def norm(field):
+        value = job.get(field) or ""
+        return " ".join(str(value).lower().split())
+    return (norm("title"), norm("company"), norm("location"), norm("application_link"))
+
+
+def merge_jobs(job_lists):
+    """Merge per-chunk job lists into one deduplicated list, keeping first occurrences"""
+    merged, seen = [], set()
+    for jobs in job_lists:
+        for job in jobs or []:
+            key = job_key(job)
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append(job)
+    return merged
+
+
+def map_reduce_extract(chunk_messages, extract, concurrency=4):
+    """Run extract(messages) over every chunk in parallel and merge the results
+
+    Returns the merged {"jobs": [...]} dict and the number of chunks that failed.
+    """
+    if not chunk_messages:
+        return {"jobs": []}, 0
+
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(chunk_messages)))) as executor:
+        results = list(executor.map(extract, chunk_messages))
+
+    failed = sum(1 for jobs in results if jobs is None)
+    return {"jobs": merge_jobs(results)}, failed
@@ -0,0 +1,164 @@
+import queue
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from metrics import NULL_TRACER
+
+# A single page to fetch: the domain drives rate limiting, source/page are for reporting
+CrawlTask = namedtuple("CrawlTask", ["source", "domain", "page", "url"])
+
+_DONE = object()
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity=1):
+        """Token bucket allowing `rate` requests per second with bursts up to `capacity`"""
+        if rate <= 0:
+            raise ValueError("Token bucket rate must be positive.")
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Block until a token is available and return how long we waited"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+
+class CrawlScheduler:
+    def __init__(self, fetch, extract, rate_per_domain=0.15, burst=1, domain_rates=None,
+                 fetch_workers_per_domain=1, extract_workers=3, queue_size=6, tracer=None):
+        """Run page fetches for different domains concurrently and feed them to extraction
+
+        fetch(task) returns a fetched page (or None on failure) and extract(task, page)
+        returns a list of jobs. Fetching and extraction are separate stages joined by a
+        bounded queue, and politeness is enforced with one token bucket per domain.
+        Time spent waiting on a bucket is reported to tracer as "rate_limit_wait".
+        """
+        self.fetch = fetch
+        self.extract = extract
+        self.rate_per_domain = rate_per_domain
+        self.burst = burst
+        self.domain_rates = domain_rates or {}
+        self.fetch_workers_per_domain = fetch_workers_per_domain
+        self.extract_workers = extract_workers
+        self.queue_size = queue_size
+        self.tracer = tracer or NULL_TRACER
+        self._buckets = {}
+        self._buckets_lock = threading.Lock()
+
+    def bucket_for(self, domain):
+        """Return the token bucket for a domain, creating it on first use"""
+        with self._buckets_lock:
+            if domain not in self._buckets:
+                rate = self.domain_rates.get(domain, self.rate_per_domain)
+                self._buckets[domain] = TokenBucket(rate, self.burst)
+            return self._buckets[domain]
+
+    def _fetch_domain(self, domain, tasks, pages, stop):
+        """Fetch one domain's pages in order, waiting on that domain's bucket only"""
+        bucket = self.bucket_for(domain)
+        for task in tasks:
+            if stop.is_set():
+                return
+            waited = bucket.acquire()
+            self.tracer.observe("rate_limit_wait", waited, domain=domain)
+            if waited >= 0.1:
+                print(f"Rate limit for {domain}: waited {waited:.1f} seconds")
+            try:
+                page = self.fetch(task)
+            except Exception as e:
+                print(f"Error fetching {task.url}: {e}")
+                page = None
+            if page is None:
+                continue
+            # Don't block forever on a full queue if the consumer has gone away
+            while not stop.is_set():
+                try:
+                    pages.put((task, page), timeout=0.5)
+                    break
+                except queue.Full:
+                    continue
+
+    def _extract_loop(self, pages, results):
+        """Pull fetched pages off the bounded queue and run extraction on them"""
+        while True:
+            item = pages.get()
+            if item is _DONE:
+                results.put(_DONE)
+                return
+            task, page = item
+            try:
+                jobs = self.extract(task, page)
+            except Exception as e:
+                print(f"Error extracting jobs from {task.source} (page {task.page+1}): {e}")
+                jobs = []
+            results.put((task, jobs or []))
+
+    def iter_results(self, tasks):
+        """Yield (task, jobs) pairs as soon as each page has been extracted"""
+        by_domain = OrderedDict()
+        for task in tasks:
+            by_domain.setdefault(task.domain, []).append(task)
+        if not by_domain:
+            return
+
+        pages = queue.Queue(maxsize=self.queue_size)
+        results = queue.Queue()
+        stop = threading.Event()
+
+        fetchers = []
+        for domain, domain_tasks in by_domain.items():
+            # Split a domain's pages across its workers while keeping them in page order
+            workers = max(1, min(self.fetch_workers_per_domain, len(domain_tasks)))
+            for i in range(workers):
+                fetchers.append(threading.Thread(
+                    target=self._fetch_domain,
+                    args=(domain, domain_tasks[i::workers], pages, stop),
+                    daemon=True
+                ))
+        extractors = [
+            threading.Thread(target=self._extract_loop, args=(pages, results), daemon=True)
+            for _ in range(self.extract_workers)
+        ]
+
+        def close_pages():
+            for thread in fetchers:
+                thread.join()
+            for _ in extractors:
+                pages.put(_DONE)
+
+        for thread in fetchers + extractors:
+            thread.start()
+        threading.Thread(target=close_pages, daemon=True).start()
+
+        finished = 0
+        try:
+            while finished < len(extractors):
+                item = results.get()
+                if item is _DONE:
+                    finished += 1
+                    continue
+                yield item
+        finally:
+            # Stops the fetchers early when the caller abandons the iterator
+            stop.set()
+
+    def run(self, tasks):
+        """Run every task and return the (task, jobs) pairs in completion order"""
+        return list(self.iter_results(tasks))
@@ -0,0 +1,259 @@
+import random
+import re
+from collections import defaultdict
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Largest prime below 2^32: a * h + b stays below 2^64 for 32-bit a, b and h, so
+# the universal hash family can be evaluated on uint64 arrays without overflow
+_PRIME = 4294967291
+_MAX_HASH = (1 << 32) - 1
+# Odd 64-bit multiplier (Fibonacci hashing) that spreads packed shingle bytes over 32 bits
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+_NON_WORD = re.compile(r"[^a-z0-9 ]+")
+
+# Fields that say nothing about which posting a record is
+_PLACEHOLDERS = {"", "not specified", "n/a", "none"}
+
+
+def job_text(job):
+    """Normalized title, company and description used for near-duplicate matching"""
+    parts = []
+    for field, limit in (("title", 200), ("company", 100), ("description", 500)):
+        value = str(job.get(field) or "")
+        if value.lower() in _PLACEHOLDERS:
+            continue
+        parts.append(value[:limit])
+    return " ".join(_NON_WORD.sub(" ", " ".join(parts).lower()).split())
+
+
+def location_key(job):
+    """Normalized first part of the location ("New York, NY (Remote)" -> "new york"), or None if unknown"""
+    value = str(job.get("location") or "")
+    if value.strip().lower() in _PLACEHOLDERS:
+        return None
+    head = re.sub(r"\(.*?\)", " ", value).split(",")[0].lower()
+    return " ".join(_NON_WORD.sub(" ", head).split()) or None
+
+
+class MinHasher:
+    def __init__(self, num_perm=64, shingle_size=5, seed=1):
+        """MinHash signatures over byte shingles, stable across processes
+
+        A signature is a uint32 array of num_perm values, computed for all
+        permutations and shingles at once with NumPy.
+        """
+        if not 0 < shingle_size <= 8:
+            raise ValueError("shingle_size must be between 1 and 8 bytes.")
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = random.Random(seed)
+        permutations = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+        self._a = np.array([a for a, _ in permutations], dtype=np.uint64)[:, None]
+        self._b = np.array([b for _, b in permutations], dtype=np.uint64)[:, None]
+        self._shifts = np.arange(shingle_size, dtype=np.uint64) * np.uint64(8)
+
+    def shingle_hashes(self, text):
+        """Distinct 32-bit hashes of the text's shingles of shingle_size bytes"""
+        data = np.frombuffer(text.encode("utf-8"), dtype=np.uint8)
+        if not len(data):
+            return np.empty(0, dtype=np.uint64)
+        k = self.shingle_size
+        windows = sliding_window_view(data, k) if len(data) > k else data[None, :]
+        packed = (windows.astype(np.uint64) << self._shifts[:windows.shape[1]]).sum(axis=1, dtype=np.uint64)
+        return np.unique((packed * _MIX) >> np.uint64(32))
+
+    def signature(self, text):
+        hashes = self.shingle_hashes(text)
+        if not len(hashes):
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint32)
+        return ((self._a * hashes + self._b) % np.uint64(_PRIME)).min(axis=1).astype(np.uint32)
+
+
+def estimate_jaccard(sig_a, sig_b):
+    """Fraction of matching MinHash slots, an estimate of shingle-set Jaccard similarity"""
+    return np.count_nonzero(sig_a == sig_b) / len(sig_a)
+
+
+class LSHIndex:
+    def __init__(self, num_perm=64, bands=16):
+        """Banded LSH over MinHash signatures
+
+        Two signatures become candidates when all rows of at least one band match,
+        so lookups only touch items sharing a bucket instead of the whole corpus.
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by the number of bands.")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.buckets = [defaultdict(list) for _ in range(bands)]
+
+    def band_keys(self, signature):
+        """(band, bytes of the band's rows) for each band of a signature"""
+        return [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes()) for band in range(self.bands)]
+
+    def query(self, signature):
+        """Keys sharing a bucket with the signature, in the order they were inserted per band"""
+        candidates = {}
+        for band, key in self.band_keys(signature):
+            candidates.update(dict.fromkeys(self.buckets[band].get(key, ())))
+        return list(candidates)
+
+    def insert(self, key, signature):
+        for band, band_key in self.band_keys(signature):
+            self.buckets[band][band_key].append(key)
+
+    def insert_band(self, key, band, band_key):
+        """Put a key in one bucket, e.g. when restoring saved band keys"""
+        self.buckets[band][band_key].append(key)
+
+
+class NearDuplicateClusterer:
+    def __init__(self, threshold=0.6, num_perm=64, bands=16):
+        """Incrementally cluster near-duplicate postings across sources
+
+        Each added job is compared only with its LSH candidates; matches above
+        `threshold` estimated Jaccard similarity are merged into one cluster, unless
+        the two clusters name different locations (the same role in another city
+        is a different job). A posting without a location joins at most one city.
+
+        Signatures, locations and cluster roots can be saved (see pending) and
+        restored in a later process, so only new postings are ever hashed and compared.
+        """
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm=num_perm)
+        self.index = LSHIndex(num_perm=num_perm, bands=bands)
+        # Saved state is only reused by a clusterer with the same settings
+        self.scheme = (f"minhash-v2:perm={num_perm}:bands={bands}:shingle={self.hasher.shingle_size}"
+                       f":threshold={threshold}")
+        self.signatures = {}
+        self.locations = {}
+        self.jobs = {}
+        self.parent = {}
+        self.members = {}
+        self.comparisons = 0
+        self._new = []
+        self._dirty = set()
+
+    def _find(self, key):
+        root = key
+        while self.parent[root] != root:
+            root = self.parent[root]
+        # Path compression
+        while self.parent[key] != root:
+            self.parent[key], key = root, self.parent[key]
+        return root
+
+    def _union(self, a, b):
+        """Merge the clusters of a and b; returns the new root, or None if their locations conflict"""
+        root_a, root_b = self._find(a), self._find(b)
+        if root_a == root_b:
+            return root_a
+        location_a, location_b = self.locations[root_a], self.locations[root_b]
+        if location_a and location_b and location_a != location_b:
+            return None
+        if len(self.members[root_a]) < len(self.members[root_b]):
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        moved = self.members.pop(root_b)
+        self.members[root_a].extend(moved)
+        # Location known for the cluster as a whole, kept on its root
+        self.locations[root_a] = location_a or location_b
+        self._dirty.update(moved)
+        self._dirty.add(root_a)
+        return root_a
+
+    def add(self, key, job):
+        """Add a job under a unique key and return the key of its cluster"""
+        if key in self.jobs:
+            self.jobs[key] = job
+            return self._find(key)
+
+        signature = self.hasher.signature(job_text(job))
+        candidates = self.index.query(signature)
+
+        self.signatures[key] = signature
+        self.locations[key] = location_key(job)
+        self.jobs[key] = job
+        self.parent[key] = key
+        self.members[key] = [key]
+        self._new.append(key)
+        self._dirty.add(key)
+
+        # Most similar first, so a posting without a location joins the closest city
+        self.comparisons += len(candidates)
+        scored = [(estimate_jaccard(signature, self.signatures[candidate]), candidate) for candidate in candidates]
+        root = key
+        for similarity, candidate in sorted(scored, key=lambda item: -item[0]):
+            if similarity < self.threshold:
+                break
+            root = self._union(root, candidate) or root
+
+        self.index.insert(key, signature)
+        return root
+
+    def restore(self, key, job, signature, location, cluster):
+        """Reload a saved posting without hashing or comparing it
+
+        signature is the saved bytes and cluster the saved root; its band keys are
+        restored separately with restore_band.
+        """
+        self.signatures[key] = np.frombuffer(signature, dtype=np.uint32)
+        self.locations[key] = location
+        self.jobs[key] = job
+        self.parent[key] = cluster
+        self.members.setdefault(cluster, []).append(key)
+
+    def restore_band(self, key, band, band_key):
+        self.index.insert_band(key, band, band_key)
+
+    def pending(self):
+        """State changed since the last call, as (rows, bands) to save
+
+        rows are (key, signature bytes, location, cluster root) for every posting that
+        was added or moved to another cluster; bands are (band, band key, key) for the
+        postings that were added.
+        """
+        rows = [(key, self.signatures[key].tobytes(), self.locations[key], self._find(key)) for key in self._dirty]
+        bands = [(band, band_key, key) for key in self._new for band, band_key in self.index.band_keys(self.signatures[key])]
+        self._new, self._dirty = [], set()
+        return rows, bands
+
+    def cluster_of(self, key):
+        """Key of the cluster a job belongs to"""
+        return self._find(key)
+
+    def cluster_count(self):
+        return len(self.members)
+
+    def _completeness(self, job):
+        return sum(1 for value in job.values() if str(value).strip().lower() not in _PLACEHOLDERS)
+
+    def canonical(self, root):
+        """Pick the most complete record of a cluster and attach every member's link, grouped by source"""
+        keys = self.members[root]
+        best = max(keys, key=lambda k: (self._completeness(self.jobs[k]), -keys.index(k)))
+        record = dict(self.jobs[best])
+
+        links = {}
+        for k in keys:
+            job = self.jobs[k]
+            link = job.get("application_link")
+            if link and link != "Not specified":
+                source_links = links.setdefault(job.get("source", "Unknown"), [])
+                if link not in source_links:
+                    source_links.append(link)
+        record["sources"] = sorted({self.jobs[k].get("source", "Unknown") for k in keys})
+        record["links"] = links
+        record["duplicates"] = len(keys)
+        return record
+
+    def canonical_jobs(self):
+        """One canonical record per cluster, in the order clusters were first seen"""
+        seen_roots, records = set(), []
+        for key in self.jobs:
+            root = self._find(key)
+            if root not in seen_roots:
+                seen_roots.add(root)
+                records.append(self.canonical(root))
+        return records
@@ -0,0 +1,241 @@
+import queue
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+from page_ready import BLOCKED_URL_PATTERNS
+
+
+def build_chrome_options(headless=False, profile_dir=None, block_resources=False):
+    """Build Chrome options with the anti-detection measures used by the crawler"""
+    options = Options()
+
+    # Anti-detection measures
+    options.add_argument('--disable-blink-features=AutomationControlled')
+    options.add_argument('--disable-extensions')
+    options.add_experimental_option('excludeSwitches', ['enable-automation'])
+    options.add_experimental_option('useAutomationExtension', False)
+
+    # Additional options
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+
+    if headless:
+        options.add_argument('--headless=new')
+        options.add_argument('--window-size=1920,1080')
+
+    # Don't download images; fonts and media are blocked over CDP in create_driver
+    if block_resources:
+        options.add_experimental_option('prefs', {
+            'profile.managed_default_content_settings.images': 2,
+            'profile.default_content_setting_values.notifications': 2,
+        })
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_argument('--autoplay-policy=user-gesture-required')
+
+    # Give every session its own profile so pooled drivers don't share state
+    if profile_dir:
+        options.add_argument(f'--user-data-dir={profile_dir}')
+
+    return options
+
+
+def create_driver(driver_path, headless=False, profile_dir=None, block_resources=False):
+    """Start a Chrome session using an already-resolved chromedriver binary"""
+    service = Service(executable_path=driver_path)
+    driver = webdriver.Chrome(service=service, options=build_chrome_options(headless, profile_dir, block_resources))
+
+    if block_resources:
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        except Exception as e:
+            print(f"Could not block resources over CDP: {e}")
+
+    # Modify navigator properties to avoid detection
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    return driver
+
+
+class PooledDriver:
+    """A Chrome session owned by a DriverPool, with its own profile directory"""
+
+    def __init__(self, driver, profile_dir):
+        self.driver = driver
+        self.profile_dir = profile_dir
+        self.pages_served = 0
+        self.broken = False
+
+    def is_healthy(self):
+        """Check that the browser still answers WebDriver commands"""
+        if self.broken:
+            return False
+        try:
+            self.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def quit(self):
+        """Shut down the browser and remove its profile directory"""
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+        shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+
+class DriverPool:
+    # Seconds between checks for a freed slot while waiting for a session
+    POLL_INTERVAL = 0.5
+
+    def __init__(self, size=2, max_pages_per_driver=20, chrome_path=None, headless=True, block_resources=True):
+        """Keep a fixed number of warm Chrome sessions that crawls can lease
+
+        The chromedriver binary is resolved once for the whole pool. Sessions are
+        recycled after max_pages_per_driver pages or as soon as they fail a health check.
+        With block_resources images, fonts and media are never downloaded.
+        """
+        if size < 1:
+            raise ValueError("Driver pool size must be at least 1.")
+
+        self.size = size
+        self.max_pages_per_driver = max_pages_per_driver
+        self.headless = headless
+        self.block_resources = block_resources
+        self.driver_path = chrome_path or ChromeDriverManager().install()
+
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._closed = False
+
+        self.stats = {"started": 0, "recycled": 0, "crashed": 0, "leases": 0}
+
+    def _start_driver(self):
+        """Start a new pooled session with a fresh profile"""
+        profile_dir = tempfile.mkdtemp(prefix="jobbot-chrome-")
+        try:
+            driver = create_driver(self.driver_path, self.headless, profile_dir, self.block_resources)
+        except Exception:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+            raise
+        self.stats["started"] += 1
+        return PooledDriver(driver, profile_dir)
+
+    def warm(self):
+        """Start sessions until the pool holds its configured size"""
+        while True:
+            with self._lock:
+                if self._closed or self._created >= self.size:
+                    return
+                self._created += 1
+            try:
+                self._idle.put(self._start_driver())
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+    def _start_in_slot(self):
+        """Start a session for a slot already counted in _created, freeing the slot on failure"""
+        try:
+            return self._start_driver()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def acquire(self, timeout=None):
+        """Take a healthy session from the pool, starting one if there is spare capacity
+
+        Waiters poll so that a slot freed by a failed restart is picked up again
+        instead of leaving them blocked on an empty pool.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("Driver pool is closed.")
+                can_start = self._idle.empty() and self._created < self.size
+                if can_start:
+                    self._created += 1
+
+            if can_start:
+                pooled = self._start_in_slot()
+                break
+
+            wait = self.POLL_INTERVAL
+            if deadline is not None:
+                wait = min(wait, deadline - time.monotonic())
+                if wait <= 0:
+                    raise TimeoutError("Timed out waiting for a pooled Chrome driver.")
+            try:
+                pooled = self._idle.get(timeout=wait)
+            except queue.Empty:
+                continue
+            if pooled.is_healthy():
+                break
+            self.stats["crashed"] += 1
+            pooled.quit()
+            pooled = self._start_in_slot()
+            break
+
+        self.stats["leases"] += 1
+        return pooled
+
+    def release(self, pooled):
+        """Return a session to the pool, recycling it if it is worn out or broken"""
+        pooled.pages_served += 1
+
+        if self._closed:
+            pooled.quit()
+            return
+
+        if pooled.broken or pooled.pages_served >= self.max_pages_per_driver:
+            if pooled.broken:
+                self.stats["crashed"] += 1
+            else:
+                self.stats["recycled"] += 1
+            pooled.quit()
+            try:
+                pooled = self._start_in_slot()
+            except Exception as e:
+                # The slot is free again; a waiting acquire() starts a session in it
+                print(f"Error restarting pooled Chrome driver: {e}")
+                return
+
+        self._idle.put(pooled)
+
+    @contextmanager
+    def lease(self, timeout=300):
+        """Context manager that yields a leased session and always returns it
+
+        Raises TimeoutError if no session becomes available within timeout seconds.
+        """
+        pooled = self.acquire(timeout=timeout)
+        try:
+            yield pooled
+        except Exception:
+            pooled.broken = True
+            raise
+        finally:
+            self.release(pooled)
+
+    def close(self):
+        """Quit every idle session; leased sessions are quit when they are released"""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            pooled.quit()
+            with self._lock:
+                self._created -= 1
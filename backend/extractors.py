@@ -0,0 +1,240 @@
+import re
+import threading
+from urllib.parse import urljoin
+from html_reducer import parse_html
+
+# Versioned selector sets per source, newest first. A field selector may end in
+# "@attr" to read an attribute instead of the element text, and may list
+# alternatives separated by commas.
+SELECTOR_SETS = {
+    "indeed": [
+        {
+            "version": "indeed-2024",
+            "card": "div.job_seen_beacon",
+            "fields": {
+                "title": "h2.jobTitle span[title], h2.jobTitle",
+                "company": "[data-testid=company-name], span.companyName",
+                "location": "[data-testid=text-location], div.companyLocation",
+                "salary": "[data-testid=attribute_snippet_testid], div.salary-snippet-container",
+                "description": "div.job-snippet, [data-testid=jobsnippet_footer]",
+                "date_posted": "span.date, [data-testid=myJobsStateDate]",
+                "application_link": "h2.jobTitle a@href, a.jcs-JobTitle@href",
+            },
+        },
+        {
+            "version": "indeed-legacy",
+            "card": "div.jobsearch-SerpJobCard",
+            "fields": {
+                "title": "h2.title a@title, h2.title",
+                "company": "span.company",
+                "location": "div.location, span.location",
+                "salary": "span.salaryText",
+                "description": "div.summary",
+                "date_posted": "span.date",
+                "application_link": "h2.title a@href",
+            },
+        },
+    ],
+    "linkedin": [
+        {
+            "version": "linkedin-guest-2024",
+            "card": "div.base-card",
+            "fields": {
+                "title": "h3.base-search-card__title",
+                "company": "h4.base-search-card__subtitle",
+                "location": "span.job-search-card__location",
+                "salary": "span.job-search-card__salary-info",
+                "date_posted": "time@datetime, time",
+                "application_link": "a.base-card__full-link@href",
+            },
+        },
+        {
+            "version": "linkedin-loggedin-2024",
+            "card": "li.jobs-search-results__list-item",
+            "fields": {
+                "title": "a.job-card-list__title@aria-label, a.job-card-list__title",
+                "company": "span.job-card-container__primary-description, div.artdeco-entity-lockup__subtitle",
+                "location": "li.job-card-container__metadata-item",
+                "date_posted": "time@datetime",
+                "application_link": "a.job-card-list__title@href",
+            },
+        },
+    ],
+    "glassdoor": [
+        {
+            "version": "glassdoor-2024",
+            "card": "li[data-test=jobListing]",
+            "fields": {
+                "title": "[data-test=job-title]",
+                "company": "[class*=EmployerProfile_compactEmployerName], [class*=EmployerProfile_employerName]",
+                "location": "[data-test=emp-location]",
+                "salary": "[data-test=detailSalary]",
+                "description": "[class*=JobCard_jobDescriptionSnippet]",
+                "date_posted": "[data-test=job-age]",
+                "application_link": "a[data-test=job-title]@href, a[data-test=job-link]@href",
+            },
+        },
+    ],
+}
+
+# Fields a card must have to count as complete
+REQUIRED_FIELDS = ("title", "company", "location")
+
+_SIMPLE_SELECTOR = re.compile(r"^([a-zA-Z0-9]*)((?:\.[\w-]+)*)((?:\[[^\]]+\])*)$")
+_ATTR_SELECTOR = re.compile(r"\[([\w-]+)(?:([*^$]?=)([^\]]*))?\]")
+
+
+def _compile_simple(selector):
+    """Compile a compound selector like tag.class[attr=value] into a predicate"""
+    match = _SIMPLE_SELECTOR.match(selector)
+    if not match:
+        raise ValueError(f"Unsupported selector: {selector}")
+    tag, classes, attributes = match.groups()
+    classes = [c for c in classes.split(".") if c]
+    attributes = [(name, op, value.strip("\"'")) for name, op, value in _ATTR_SELECTOR.findall(attributes)]
+
+    def matches(node):
+        if tag and node.tag != tag:
+            return False
+        if classes:
+            node_classes = node.classes
+            if any(c not in node_classes for c in classes):
+                return False
+        for name, op, value in attributes:
+            actual = node.attrs.get(name)
+            if actual is None:
+                return False
+            if op == "=" and actual != value:
+                return False
+            if op == "*=" and value not in actual:
+                return False
+            if op == "^=" and not actual.startswith(value):
+                return False
+            if op == "$=" and not actual.endswith(value):
+                return False
+        return True
+
+    return matches
+
+
+def _compile(selector):
+    """Compile a descendant selector ("a b c") into a list of predicates"""
+    return [_compile_simple(part) for part in selector.split()]
+
+
+def select(node, selector):
+    """Return descendants of node matching a descendant selector, in document order"""
+    steps = _compile(selector) if isinstance(selector, str) else selector
+    current = [node]
+    for step in steps:
+        found, seen = [], set()
+        for parent in current:
+            for child in parent.iter():
+                if child is not parent and id(child) not in seen and step(child):
+                    seen.add(id(child))
+                    found.append(child)
+        current = found
+    return current
+
+
+class SelectorExtractor:
+    def __init__(self, source, version, card, fields):
+        """Deterministic card parser built from one versioned selector set"""
+        self.source = source
+        self.version = version
+        self.card = _compile(card)
+        self.fields = {}
+        for field, spec in fields.items():
+            alternatives = []
+            for option in spec.split(","):
+                option = option.strip()
+                selector, _, attr = option.partition("@")
+                alternatives.append((_compile(selector), attr or None))
+            self.fields[field] = alternatives
+
+    def _read_field(self, card, alternatives):
+        for selector, attr in alternatives:
+            for node in select(card, selector):
+                value = node.attrs.get(attr) if attr else node.text()
+                if value and value.strip():
+                    return value.strip()
+        return None
+
+    def extract(self, root, base_url=None):
+        """Parse every card under root into a job dict using the selector set"""
+        jobs = []
+        for card in select(root, self.card):
+            job = {field: self._read_field(card, alternatives) for field, alternatives in self.fields.items()}
+            if job.get("application_link") and base_url:
+                job["application_link"] = urljoin(base_url, job["application_link"])
+            jobs.append(job)
+        return jobs
+
+
+class ExtractorRegistry:
+    def __init__(self, selector_sets=None, min_cards=3, min_completeness=0.8):
+        """Per-source registry of selector extractors with quality checks and fallback stats
+
+        A selector set is accepted when it finds at least min_cards cards and at least
+        min_completeness of them have every required field; otherwise the caller falls
+        back to the LLM.
+        """
+        self.min_cards = min_cards
+        self.min_completeness = min_completeness
+        self.extractors = {}
+        self.stats = {}
+        self._lock = threading.Lock()
+        for source, sets in (SELECTOR_SETS if selector_sets is None else selector_sets).items():
+            for selector_set in sets:
+                self.register(source, **selector_set)
+
+    def register(self, source, version, card, fields):
+        """Add a selector set for a source; sets are tried in registration order"""
+        self.extractors.setdefault(source, []).append(SelectorExtractor(source, version, card, fields))
+
+    def _quality(self, jobs):
+        if not jobs:
+            return 0.0
+        complete = sum(1 for job in jobs if all(job.get(field) for field in REQUIRED_FIELDS))
+        return complete / len(jobs)
+
+    def _record(self, source, outcome, version=None):
+        with self._lock:
+            stats = self.stats.setdefault(source, {"pages": 0, "selector_hits": 0, "fallbacks": 0, "versions": {}})
+            stats["pages"] += 1
+            if outcome == "hit":
+                stats["selector_hits"] += 1
+                stats["versions"][version] = stats["versions"].get(version, 0) + 1
+            else:
+                stats["fallbacks"] += 1
+
+    def extract(self, source, page_source, base_url=None):
+        """Return (jobs, version) from the first selector set that passes, or (None, None)"""
+        extractors = self.extractors.get(source)
+        if not extractors or not page_source:
+            self._record(source, "fallback")
+            return None, None
+
+        root = parse_html(page_source)
+        for extractor in extractors:
+            jobs = extractor.extract(root, base_url)
+            if len(jobs) >= self.min_cards and self._quality(jobs) >= self.min_completeness:
+                for job in jobs:
+                    for field, value in job.items():
+                        if not value:
+                            job[field] = "Not specified"
+                    job.setdefault("description", "Not specified")
+                    job.setdefault("skills", [])
+                    job.setdefault("job_type", "Not specified")
+                self._record(source, "hit", extractor.version)
+                return jobs, extractor.version
+
+        self._record(source, "fallback")
+        return None, None
+
+    def fallback_rate(self, source):
+        """Share of pages for a source that needed the LLM; a jump means the layout changed"""
+        stats = self.stats.get(source)
+        if not stats or not stats["pages"]:
+            return 0.0
+        return stats["fallbacks"] / stats["pages"]
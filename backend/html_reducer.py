@@ -0,0 +1,271 @@
+import re
+from collections import defaultdict
+from html import escape
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+# Elements whose whole content is dropped before anything reaches the model
+SKIP_TAGS = {"script", "style", "svg", "noscript", "head", "template", "iframe", "canvas"}
+
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+             "param", "source", "track", "wbr"}
+
+# The only attributes worth keeping in minimal HTML output
+KEEP_ATTRS = {"href", "title", "aria-label", "datetime", "data-jk", "data-job-id", "data-id"}
+
+# Attributes kept in the parsed tree only so that selectors can match on them
+SELECTOR_ATTRS = {"class", "id", "data-test", "data-testid"}
+
+BLOCK_TAGS = {"div", "li", "p", "tr", "td", "h1", "h2", "h3", "h4", "h5", "h6", "section",
+              "article", "header", "footer", "ul", "ol", "table", "br"}
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class Node:
+    __slots__ = ("tag", "attrs", "parent", "children")
+
+    def __init__(self, tag, attrs=None, parent=None):
+        self.tag = tag
+        self.attrs = attrs or {}
+        self.parent = parent
+        self.children = []
+
+    @property
+    def classes(self):
+        return self.attrs.get("class", "").split()
+
+    def signature(self):
+        """Tag plus sorted class list; repeated job cards share a signature"""
+        return (self.tag, tuple(sorted(self.classes)))
+
+    def iter(self):
+        """Walk this node and every descendant element"""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(child for child in reversed(node.children) if isinstance(child, Node))
+
+    def text_parts(self):
+        """Return the non-empty text fragments in document order, split at block elements"""
+        parts = []
+        current = []
+
+        def walk(node):
+            for child in node.children:
+                if isinstance(child, str):
+                    current.append(child)
+                else:
+                    if child.tag in BLOCK_TAGS and current:
+                        parts.append("".join(current))
+                        current.clear()
+                    walk(child)
+                    if child.tag in BLOCK_TAGS and current:
+                        parts.append("".join(current))
+                        current.clear()
+
+        walk(self)
+        if current:
+            parts.append("".join(current))
+        return [part for part in (_WHITESPACE.sub(" ", p).strip() for p in parts) if part]
+
+    def text(self):
+        return " ".join(self.text_parts())
+
+    def links(self):
+        return [node.attrs["href"] for node in self.iter() if node.tag == "a" and node.attrs.get("href")]
+
+
+class _TreeBuilder(HTMLParser):
+    """Streaming parser that builds a slim DOM with script/style/svg content removed"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node("document")
+        self.stack = [self.root]
+        self.skip_tag = None
+        self.skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if self.skip_tag:
+            if tag == self.skip_tag:
+                self.skip_depth += 1
+            return
+        if tag in SKIP_TAGS:
+            self.skip_tag = tag
+            self.skip_depth = 1
+            return
+
+        kept = {name: value for name, value in attrs if value and (name in KEEP_ATTRS or name in SELECTOR_ATTRS)}
+        node = Node(tag, kept, self.stack[-1])
+        self.stack[-1].children.append(node)
+        if tag not in VOID_TAGS:
+            self.stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        if self.skip_tag or tag in SKIP_TAGS:
+            return
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and self.stack[-1].tag == tag:
+            self.stack.pop()
+
+    def handle_endtag(self, tag):
+        if self.skip_tag:
+            if tag == self.skip_tag:
+                self.skip_depth -= 1
+                if self.skip_depth == 0:
+                    self.skip_tag = None
+            return
+        # Close the nearest matching element, tolerating unclosed children
+        for i in range(len(self.stack) - 1, 0, -1):
+            if self.stack[i].tag == tag:
+                del self.stack[i:]
+                return
+
+    def handle_data(self, data):
+        if self.skip_tag or not data.strip():
+            return
+        self.stack[-1].children.append(data)
+
+
+class ReducedPage:
+    def __init__(self, cards, text, original_length):
+        """Result of reducing a page: one compact entry per job card"""
+        self.cards = cards
+        self.text = text
+        self.original_length = original_length
+
+    @property
+    def reduced_length(self):
+        return len(self.text)
+
+    @property
+    def compression_ratio(self):
+        """Original size divided by reduced size"""
+        return self.original_length / max(1, self.reduced_length)
+
+    def summary(self):
+        saved = 100 * (1 - self.reduced_length / max(1, self.original_length))
+        return (f"Reduced page from {self.original_length:,} to {self.reduced_length:,} characters "
+                f"({saved:.1f}% smaller, {len(self.cards)} job cards)")
+
+
+def parse_html(html, chunk_size=65536):
+    """Parse HTML incrementally and return the slim DOM root
+
+    Accepts a string or an iterable of string chunks (e.g. a streamed response).
+    """
+    builder = _TreeBuilder()
+    if isinstance(html, str):
+        for i in range(0, len(html), chunk_size):
+            builder.feed(html[i:i + chunk_size])
+    else:
+        for chunk in html:
+            builder.feed(chunk)
+    builder.close()
+    return builder.root
+
+
+def find_job_cards(root, min_cards=3, min_text=40):
+    """Find the most likely repeated job-card subtrees in the DOM
+
+    Elements are grouped by tag and class signature; the group with enough members,
+    enough text per member and links inside wins. Nested members of a group are dropped.
+    """
+    groups = defaultdict(list)
+    for node in root.iter():
+        if node is root or not node.classes:
+            continue
+        groups[node.signature()].append(node)
+
+    best, best_score = None, 0
+    for signature, nodes in groups.items():
+        if len(nodes) < min_cards:
+            continue
+        members = set(map(id, nodes))
+        outer = [n for n in nodes if not _has_ancestor_in(n, members)]
+        if len(outer) < min_cards:
+            continue
+        text_lengths = [len(n.text()) for n in outer]
+        average = sum(text_lengths) / len(outer)
+        if average < min_text:
+            continue
+        with_links = sum(1 for n in outer if n.links())
+        score = len(outer) * min(average, 600) * (1 + with_links / len(outer))
+        if score > best_score:
+            best, best_score = outer, score
+    return best or []
+
+
+def _has_ancestor_in(node, members):
+    parent = node.parent
+    while parent is not None:
+        if id(parent) in members:
+            return True
+        parent = parent.parent
+    return False
+
+
+def card_to_text(node, base_url=None):
+    """Render a card as one compact line of text followed by its links"""
+    line = " | ".join(node.text_parts())
+    links = []
+    for href in node.links():
+        href = urljoin(base_url, href) if base_url else href
+        if href not in links:
+            links.append(href)
+    if links:
+        line += " | links: " + " ".join(links[:3])
+    return line
+
+
+def card_to_html(node, base_url=None):
+    """Render a card as minimal HTML keeping only useful attributes"""
+    out = []
+
+    def walk(current):
+        for child in current.children:
+            if isinstance(child, str):
+                out.append(escape(_WHITESPACE.sub(" ", child)))
+                continue
+            attrs = ""
+            for name, value in child.attrs.items():
+                if name not in KEEP_ATTRS:
+                    continue
+                if name == "href" and base_url:
+                    value = urljoin(base_url, value)
+                attrs += f' {name}="{escape(value)}"'
+            if child.tag in VOID_TAGS:
+                out.append(f"<{child.tag}{attrs}>")
+                continue
+            out.append(f"<{child.tag}{attrs}>")
+            walk(child)
+            out.append(f"</{child.tag}>")
+
+    walk(node)
+    return f"<{node.tag}>" + "".join(out) + f"</{node.tag}>"
+
+
+def reduce_html(html, base_url=None, output="text", min_cards=3):
+    """Strip a listing page down to compact per-card content for the LLM
+
+    Falls back to the page's visible text when no repeated job cards are found.
+    """
+    original_length = len(html) if isinstance(html, str) else 0
+    if not isinstance(html, str):
+        chunks = list(html)
+        original_length = sum(len(chunk) for chunk in chunks)
+        html = chunks
+
+    root = parse_html(html)
+    render = card_to_html if output == "html" else card_to_text
+
+    cards = [render(node, base_url) for node in find_job_cards(root, min_cards=min_cards)]
+    if cards:
+        text = "\n".join(f"[Card {i+1}] {card}" for i, card in enumerate(cards))
+    else:
+        body = next((node for node in root.iter() if node.tag == "body"), root)
+        text = "\n".join(body.text_parts())
+
+    return ReducedPage(cards, text, original_length)
@@ -0,0 +1,165 @@
+import threading
+import zlib
+from collections import OrderedDict
+from urllib.parse import urlsplit
+import httpx
+from extractors import SELECTOR_SETS, select
+from html_reducer import parse_html, reduce_html
+from metrics import NULL_TRACER
+
+# Browser-like headers; httpx negotiates gzip/deflate (and br when brotli is installed)
+DEFAULT_HEADERS = {
+    "User-Agent": ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                   "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+class FetchedPage:
+    """A page fetched without a browser; quacks like WebsiteCrawler for extraction"""
+
+    def __init__(self, url, page_source, reduction=None, tracer=None, domain=None):
+        self.url = url
+        self.page_source = page_source
+        self.reduction = reduction
+        self.tracer = tracer or NULL_TRACER
+        self.domain = domain or urlsplit(url).netloc
+
+    def get_page_source(self):
+        return self.page_source
+
+
+class FetchStats:
+    def __init__(self):
+        """Per-domain counts and latencies of the path that served each page"""
+        self._lock = threading.Lock()
+        self.domains = {}
+
+    def record(self, domain, path, seconds):
+        with self._lock:
+            paths = self.domains.setdefault(domain, {})
+            stats = paths.setdefault(path, {"pages": 0, "total": 0.0})
+            stats["pages"] += 1
+            stats["total"] += seconds
+
+    def mean(self, domain, path):
+        stats = self.domains.get(domain, {}).get(path)
+        if not stats or not stats["pages"]:
+            return None
+        return stats["total"] / stats["pages"]
+
+    def summary(self, domain):
+        """One line per domain: pages per path and how much faster HTTP was than the browser"""
+        paths = self.domains.get(domain, {})
+        counts = ", ".join(f"{stats['pages']} via {path}" for path, stats in sorted(paths.items()))
+        line = f"Fetch paths for {domain}: {counts}"
+        http, browser = self.mean(domain, "http"), self.mean(domain, "browser")
+        if http is not None and browser is not None:
+            line += f" (http {http:.2f}s vs browser {browser:.2f}s per page)"
+        return line
+
+
+class HttpFetcher:
+    def __init__(self, timeout=20, max_connections=20, min_cards=3, max_cached=500, max_cache_bytes=32 * 1024 * 1024,
+                 headers=None, selector_sets=None):
+        """Pooled keep-alive HTTP client for pages that don't need JavaScript
+
+        Responses are revalidated with ETag/If-Modified-Since, so an unchanged page
+        costs a 304 and is served from memory. Cached pages are kept zlib-compressed
+        and the cache is bounded both by entries (max_cached) and by compressed size
+        (max_cache_bytes), least recently used first. A page counts as having job
+        content when the source's own card selectors (extractors.SELECTOR_SETS) match at
+        least min_cards elements; consent walls and link lists repeat elements too, so
+        reduce_html's generic card count is only used for sources without selectors.
+        """
+        self.min_cards = min_cards
+        self.card_selectors = {
+            source: [selector_set["card"] for selector_set in sets]
+            for source, sets in (SELECTOR_SETS if selector_sets is None else selector_sets).items()
+        }
+        self.max_cached = max_cached
+        self.max_cache_bytes = max_cache_bytes
+        self.cache_bytes = 0
+        self.client = httpx.Client(
+            headers=headers or DEFAULT_HEADERS,
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.not_modified = 0
+
+    def _validators(self, url):
+        with self._lock:
+            cached = self._cache.get(url)
+            if cached is None:
+                return None, {}
+            self._cache.move_to_end(url)
+        headers = {}
+        if cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+        return cached, headers
+
+    def _remember(self, url, response):
+        etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        body = zlib.compress(response.text.encode("utf-8"), 6)
+        if len(body) > self.max_cache_bytes:
+            return
+        with self._lock:
+            old = self._cache.pop(url, None)
+            if old is not None:
+                self.cache_bytes -= len(old["body"])
+            self._cache[url] = {"etag": etag, "last_modified": last_modified, "body": body}
+            self.cache_bytes += len(body)
+            while len(self._cache) > self.max_cached or self.cache_bytes > self.max_cache_bytes:
+                _, evicted = self._cache.popitem(last=False)
+                self.cache_bytes -= len(evicted["body"])
+
+    def get(self, url):
+        """Fetch a URL with conditional headers and return its HTML, or None on failure"""
+        cached, headers = self._validators(url)
+        try:
+            response = self.client.get(url, headers=headers)
+        except httpx.HTTPError as e:
+            print(f"HTTP fetch failed for {url}: {e}")
+            return None
+        if response.status_code == 304 and cached is not None:
+            self.not_modified += 1
+            return zlib.decompress(cached["body"]).decode("utf-8")
+        if response.status_code != 200:
+            return None
+        self._remember(url, response)
+        return response.text
+
+    def has_cards(self, html, source):
+        """Whether any of the source's card selectors matches at least min_cards elements
+
+        Returns None for a source without selectors.
+        """
+        selectors = self.card_selectors.get(source)
+        if not selectors:
+            return None
+        root = parse_html(html)
+        return any(len(select(root, selector)) >= self.min_cards for selector in selectors)
+
+    def fetch(self, url, tracer=None, domain=None, source=None):
+        """Return a FetchedPage if the server-rendered HTML has job cards, else None"""
+        html = self.get(url)
+        if not html:
+            return None
+        if self.has_cards(html, source) is False:
+            return None
+        with (tracer or NULL_TRACER).span("reduce_html", domain=domain or urlsplit(url).netloc):
+            reduction = reduce_html(html, base_url=url, min_cards=self.min_cards)
+        if source not in self.card_selectors and len(reduction.cards) < self.min_cards:
+            return None
+        return FetchedPage(url, html, reduction, tracer, domain)
+
+    def close(self):
+        self.client.close()
@@ -0,0 +1,93 @@
+import time
+
+
+def query_key(source, job_title, location):
+    """Stable identifier of one source's search, used to remember its crawl history"""
+    return "|".join([source, " ".join(job_title.lower().split()), " ".join(location.lower().split())])
+
+
+class PageBudget:
+    def __init__(self, pages=2, max_pages=10, known_threshold=0.8):
+        """Decides page by page how far to paginate one search
+
+        Crawling stops once a page is mostly postings we already have (at least
+        known_threshold of them), and the budget of `pages` grows by one, up to
+        max_pages, whenever a page turns out to be entirely new.
+        """
+        self.pages = pages
+        self.max_pages = max(pages, max_pages)
+        self.known_threshold = known_threshold
+        self.next_page = 0
+        self.new_jobs = 0
+        self.seen_jobs = 0
+        self.stopped = None
+
+    @property
+    def active(self):
+        return self.stopped is None and self.next_page < self.pages
+
+    def observe(self, new, total):
+        """Record how many of a page's postings were new and decide whether to continue"""
+        self.next_page += 1
+        self.new_jobs += new
+        self.seen_jobs += total
+        if total == 0:
+            self.stopped = "empty page"
+        elif (total - new) / total >= self.known_threshold:
+            self.stopped = "mostly known"
+        elif new == total and self.pages < self.max_pages:
+            self.pages += 1
+        if self.stopped is None and self.next_page >= self.pages:
+            self.stopped = "page limit" if self.pages < self.max_pages else "max pages"
+
+
+class RevisitPolicy:
+    def __init__(self, target_new=10, min_interval=3600, max_interval=7 * 24 * 3600, smoothing=0.5):
+        """Learns how often each search should be refreshed from its new-posting rate
+
+        The observed rate of new postings per second is smoothed across runs, and the
+        next visit is scheduled when about target_new postings are expected to have
+        appeared, clamped to [min_interval, max_interval] seconds.
+        """
+        self.target_new = target_new
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.smoothing = smoothing
+
+    def is_due(self, state, now=None):
+        """True if a search with this crawl state should be refreshed now"""
+        if not state:
+            return True
+        now = time.time() if now is None else now
+        return now >= state["last_crawled"] + state["interval"]
+
+    def interval_for(self, rate):
+        if rate <= 0:
+            return self.max_interval
+        return min(self.max_interval, max(self.min_interval, self.target_new / rate))
+
+    def retry(self, state, now=None):
+        """Crawl state after a refresh that failed: try again after min_interval
+
+        The learned rate and the time of the last good crawl are kept, so a transient
+        failure neither stretches the interval nor skews the next rate estimate.
+        Returns None when there is no earlier state (the search is simply still due).
+        """
+        if not state:
+            return None
+        now = time.time() if now is None else now
+        return dict(state, interval=now - state["last_crawled"] + self.min_interval)
+
+    def update(self, state, new_jobs, now=None):
+        """Return the crawl state after a refresh that found new_jobs new postings"""
+        now = time.time() if now is None else now
+        if state:
+            elapsed = max(now - state["last_crawled"], 1.0)
+            observed = new_jobs / elapsed
+            rate = self.smoothing * observed + (1 - self.smoothing) * state["new_rate"]
+            runs = state["runs"] + 1
+        else:
+            # First visit: everything is new, so assume a moderate rate until a second run
+            rate = self.target_new / self.min_interval if new_jobs else 0.0
+            runs = 1
+        return {"last_crawled": now, "new_rate": rate, "interval": self.interval_for(rate), "runs": runs}
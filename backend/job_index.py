@@ -0,0 +1,331 @@
+import re
+import numpy as np
+
+REMOTE_KEYWORDS = ['remote', 'work from home', 'wfh', 'virtual']
+
+_TOKEN = re.compile(r"[a-z0-9+#]+(?:\.[a-z0-9]+)*")
+# Phrase tokens that tokenize the same inside a longer document token, so adjacent-pair
+# postings give a superset of the phrase's substring matches
+_PLAIN_TOKEN = re.compile(r"[a-z0-9.]+")
+_SALARY_NUMBER = re.compile(r"(\d+(?:,\d{3})*(?:\.\d+)?)\s*([kK])?")
+
+
+def tokenize(text):
+    return _TOKEN.findall(text.lower()) if text else []
+
+
+def parse_salary(salary_str):
+    """Parse a salary string into a (low, high) pair of numbers; (0, 0) when unknown"""
+    if not salary_str or salary_str == "Not specified":
+        return 0.0, 0.0
+    values = []
+    for number, thousands in _SALARY_NUMBER.findall(str(salary_str)):
+        value = float(number.replace(",", ""))
+        if thousands:
+            value *= 1000
+        values.append(value)
+    if not values:
+        return 0.0, 0.0
+    return values[0], max(values[:2])
+
+
+def is_remote(job):
+    text = " ".join(str(job.get(field) or "") for field in ("location", "title", "description")).lower()
+    return any(keyword in text for keyword in REMOTE_KEYWORDS)
+
+
+def _skills(job):
+    skills = job.get("skills") or []
+    if isinstance(skills, str):
+        return [skills]
+    return [str(skill) for skill in skills]
+
+
+class JobIndex:
+    # Job fields the index reads; a change to any other field only replaces the record
+    INDEXED_FIELDS = ("title", "description", "skills", "location", "salary")
+
+    # Above this many vocabulary terms containing a query token, scanning the
+    # documents directly is cheaper than merging their posting lists
+    MAX_EXPANSION = 5000
+
+    def __init__(self):
+        """Filter index over jobs with fields parsed once at ingest
+
+        Matching keeps filter_jobs' substring semantics: a keyword matches when it
+        occurs in the title, the description or one of the skills, and a location
+        when it occurs in the location ("sql" matches "PostgreSQL", "san fran" matches
+        "San Francisco"). Tokens go into inverted indexes; a query token is looked up
+        by scanning the much smaller vocabulary for terms that contain it, and
+        candidates are confirmed against the text unless the query is one whole
+        token. Adjacent token pairs have posting lists too, so a multi-word phrase is
+        answered from the pairs it can span; two whole tokens separated by one space
+        need no confirmation. Remote status is a posting list and salaries a NumPy
+        column. Ids are assigned in ingest order, so posting lists are sorted.
+        """
+        self.jobs = []
+        self.keys = []
+        self.text = []
+        self.locations = []
+        self.keyword_postings = {}
+        self.location_postings = {}
+        self.keyword_vocabulary = []
+        self.location_vocabulary = []
+        # (first, second, separated by one space) -> ids, and first token -> its pair keys
+        self.keyword_pairs = {}
+        self.location_pairs = {}
+        self.keyword_followers = {}
+        self.location_followers = {}
+        self.remote_ids = []
+        self._salary = np.zeros(1024)
+        self._live = np.ones(1024, dtype=bool)
+        self.removed = 0
+        self._arrays = {}
+        self._expansions = {}
+        self.size = 0
+
+    def add(self, job, key=None):
+        """Index one job and return its internal id"""
+        doc_id = self.size
+        # Fields are joined with newlines, which tokens and phrases never contain, so a
+        # phrase cannot match across a field boundary
+        text = "\n".join(str(part).lower() for part in [job.get("title") or "", job.get("description") or ""] + _skills(job))
+        location = str(job.get("location") or "").lower()
+
+        self.jobs.append(job)
+        self.keys.append(key)
+        self.text.append(text)
+        self.locations.append(location)
+
+        self._index_text(text, self.keyword_postings, self.keyword_vocabulary, self.keyword_pairs,
+                         self.keyword_followers, doc_id)
+        self._index_text(location, self.location_postings, self.location_vocabulary, self.location_pairs,
+                         self.location_followers, doc_id)
+        if is_remote(job):
+            self.remote_ids.append(doc_id)
+
+        if doc_id >= len(self._salary):
+            self._salary = np.concatenate([self._salary, np.zeros(len(self._salary))])
+            self._live = np.concatenate([self._live, np.ones(len(self._live), dtype=bool)])
+        self._salary[doc_id] = parse_salary(job.get("salary"))[0]
+
+        self.size += 1
+        return doc_id
+
+    def remove(self, doc_id):
+        """Leave a job out of search results; its id is never reused"""
+        if self._live[doc_id]:
+            self._live[doc_id] = False
+            self.removed += 1
+
+    def update(self, doc_id, job, key=None):
+        """Bring an indexed job up to date and return its id
+
+        When only fields the index doesn't read changed (e.g. last_seen), the record is
+        replaced in place; otherwise the old entry is removed and the job is indexed
+        again under a new id.
+        """
+        old = self.jobs[doc_id]
+        if all(old.get(field) == job.get(field) for field in self.INDEXED_FIELDS):
+            self.jobs[doc_id] = job
+            return doc_id
+        self.remove(doc_id)
+        return self.add(job, key=key)
+
+    @property
+    def live(self):
+        """Boolean mask of the ids that have not been removed"""
+        return self._live[:self.size]
+
+    @property
+    def count(self):
+        return self.size - self.removed
+
+    def _index_text(self, text, postings, vocabulary, pairs, followers, doc_id):
+        matches = list(_TOKEN.finditer(text))
+        for term in {match.group() for match in matches}:
+            self._post(postings, vocabulary, term, doc_id)
+        adjacent = {(a.group(), b.group(), text[a.end():b.start()] == " ") for a, b in zip(matches, matches[1:])}
+        for pair in adjacent:
+            ids = pairs.get(pair)
+            if ids is None:
+                ids = pairs[pair] = []
+                followers.setdefault(pair[0], []).append(pair)
+            ids.append(doc_id)
+
+    @staticmethod
+    def _post(postings, vocabulary, term, doc_id):
+        ids = postings.get(term)
+        if ids is None:
+            ids = postings[term] = []
+            vocabulary.append(term)
+        ids.append(doc_id)
+
+    @property
+    def salary(self):
+        return self._salary[:self.size]
+
+    def _array(self, name, postings):
+        """Posting list as a NumPy array, cached until the list grows"""
+        cached = self._arrays.get(name)
+        if cached is None or cached[0] != len(postings):
+            cached = (len(postings), np.asarray(postings, dtype=np.int64))
+            self._arrays[name] = cached
+        return cached[1]
+
+    def _expand(self, field, vocabulary, token):
+        """Vocabulary terms containing token, cached until the vocabulary grows"""
+        cached = self._expansions.get((field, token))
+        if cached is None or cached[0] != len(vocabulary):
+            cached = (len(vocabulary), [term for term in vocabulary if token in term])
+            self._expansions[(field, token)] = cached
+        return cached[1]
+
+    def _token_mask(self, field, postings, vocabulary, token):
+        """Ids with a token containing `token`, or None when too many terms match"""
+        terms = self._expand(field, vocabulary, token)
+        if len(terms) > self.MAX_EXPANSION:
+            return None
+        mask = np.zeros(self.size, dtype=bool)
+        for term in terms:
+            mask[self._array((field, term), postings[term])] = True
+        return mask
+
+    def _pair_keys(self, field, vocabulary, pairs, followers, tokens):
+        """Pair keys each adjacent pair of phrase tokens can match, or None when too many do
+
+        In a substring match the first token ends a document token, the last one starts
+        one and the tokens in between are whole tokens.
+        """
+        cached = self._expansions.get(("pairs", field, tokens))
+        if cached is None or cached[0] != len(pairs):
+            steps, total = [], 0
+            for i, (head, tail) in enumerate(zip(tokens, tokens[1:])):
+                heads = [term for term in self._expand(field, vocabulary, head) if term.endswith(head)] if i == 0 else [head]
+                last = i == len(tokens) - 2
+                keys = [key for term in heads for key in followers.get(term, ())
+                        if (key[1].startswith(tail) if last else key[1] == tail)]
+                steps.append(keys)
+                total += len(keys)
+            cached = (len(pairs), steps if total <= self.MAX_EXPANSION else None)
+            self._expansions[("pairs", field, tokens)] = cached
+        return cached[1]
+
+    def _pair_phrase_mask(self, phrase, tokens, pairs, followers, vocabulary, documents, field, within):
+        """Ids whose field contains a multi-word phrase, from pair postings; None if too broad"""
+        steps = self._pair_keys(field, vocabulary, pairs, followers, tokens)
+        if steps is None:
+            return None
+        candidates = np.ones(self.size, dtype=bool) if within is None else within.copy()
+        for keys in steps:
+            step_mask = np.zeros(self.size, dtype=bool)
+            for key in keys:
+                step_mask[self._array((field, key), pairs[key])] = True
+            candidates &= step_mask
+            if not candidates.any():
+                return candidates
+        # Two whole tokens with one space between them are the phrase itself
+        exact = (tokens[0], tokens[1], True)
+        definite = np.zeros(self.size, dtype=bool)
+        if len(tokens) == 2 and exact in pairs:
+            definite[self._array((field, exact), pairs[exact])] = True
+            definite &= candidates
+        ids = np.flatnonzero(candidates & ~definite)
+        if len(ids):
+            definite[ids] = np.fromiter((phrase in documents[i] for i in ids.tolist()), dtype=bool, count=len(ids))
+        return definite
+
+    def _phrase_mask(self, phrases, postings, vocabulary, pairs, followers, documents, field, within=None):
+        """Boolean mask of ids whose field contains any of the phrases as a substring
+
+        Only ids in the `within` mask (the survivors of earlier steps) are confirmed.
+        """
+        mask = np.zeros(self.size, dtype=bool)
+        for phrase in phrases:
+            phrase = phrase.lower()
+            tokens = tokenize(phrase)
+            if (len(tokens) > 1 and phrase == " ".join(tokens)
+                    and all(_PLAIN_TOKEN.fullmatch(token) for token in tokens)):
+                phrase_mask = self._pair_phrase_mask(phrase, tuple(tokens), pairs, followers, vocabulary,
+                                                     documents, field, within)
+                if phrase_mask is not None:
+                    mask |= phrase_mask
+                    continue
+            # '+' and '#' can split differently next to a dotted token ("x.c++" is "x.c", "++"),
+            # so tokens holding them are narrowed by their plain parts only
+            plain = {part.strip(".") for token in tokens for part in _PLAIN_TOKEN.findall(token)} - {""}
+            phrase_mask = None
+            for token in sorted(plain, key=len, reverse=True):
+                token_mask = self._token_mask(field, postings, vocabulary, token)
+                if token_mask is None:
+                    continue
+                phrase_mask = token_mask if phrase_mask is None else phrase_mask & token_mask
+                if not phrase_mask.any():
+                    break
+            # A lone whole token is answered exactly by containment in the indexed tokens
+            exact = phrase_mask is not None and tokens == [phrase] and bool(_PLAIN_TOKEN.fullmatch(phrase))
+            if phrase_mask is None:
+                # Nothing selective to look up (e.g. punctuation only): scan every document
+                phrase_mask = np.ones(self.size, dtype=bool)
+            if within is not None:
+                phrase_mask &= within
+            if not exact and phrase_mask.any():
+                # Token containment is a superset of substring matches; confirm on the text
+                ids = np.flatnonzero(phrase_mask)
+                phrase_mask[ids] = np.fromiter((phrase in documents[i] for i in ids.tolist()), dtype=bool, count=len(ids))
+            mask |= phrase_mask
+        return mask
+
+    def compile(self, keywords=None, locations=None, remote=False, min_salary=None):
+        """Compile filter criteria into a query plan"""
+        # Cheap exact steps run first so phrase confirmation only visits their survivors
+        steps = []
+        if remote:
+            steps.append(("remote", lambda within: self._id_mask(self._array("remote", self.remote_ids))))
+        if min_salary:
+            steps.append(("min_salary", lambda within: self.salary >= min_salary))
+        if locations:
+            steps.append(("locations", lambda within: self._phrase_mask(
+                locations, self.location_postings, self.location_vocabulary, self.location_pairs,
+                self.location_followers, self.locations, "location", within)))
+        if keywords:
+            steps.append(("keywords", lambda within: self._phrase_mask(
+                keywords, self.keyword_postings, self.keyword_vocabulary, self.keyword_pairs,
+                self.keyword_followers, self.text, "keyword", within)))
+        return QueryPlan(self, steps)
+
+    def _id_mask(self, ids):
+        mask = np.zeros(self.size, dtype=bool)
+        mask[ids] = True
+        return mask
+
+    def search(self, keywords=None, locations=None, remote=False, min_salary=None):
+        """Return a NumPy array of the ids of jobs matching every criterion, in ingest order"""
+        return self.compile(keywords, locations, remote, min_salary).execute()
+
+
+class QueryPlan:
+    def __init__(self, index, steps):
+        """Named steps that each produce a boolean mask; the masks are ANDed together
+
+        Each step is given the mask of the steps before it and may skip ids outside it.
+        """
+        self.index = index
+        self.steps = steps
+
+    def explain(self):
+        return " AND ".join(name for name, _ in self.steps) or "all"
+
+    def execute(self):
+        if not self.steps:
+            return np.flatnonzero(self.index.live) if self.index.removed else np.arange(self.index.size)
+
+        mask = None
+        for name, evaluate in self.steps:
+            step_mask = evaluate(mask)
+            mask = step_mask if mask is None else mask & step_mask
+            if not mask.any():
+                break
+        if self.index.removed:
+            mask &= self.index.live
+        return np.flatnonzero(mask)
@@ -0,0 +1,274 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+# Query parameters that identify a posting; everything else (tracking, paging) is dropped
+LINK_ID_PARAMS = {"jk", "vjk", "jobid", "currentjobid", "jl", "id"}
+
+
+def _normalize_text(value):
+    if not value or value == "Not specified":
+        return ""
+    return " ".join(str(value).lower().split())
+
+
+def normalize_link(link):
+    """Reduce an application link to host, path and identifying query parameters"""
+    if not link or link == "Not specified":
+        return ""
+    parts = urlsplit(link.strip())
+    params = sorted((k.lower(), v) for k, v in parse_qsl(parts.query) if k.lower() in LINK_ID_PARAMS)
+    path = parts.path.rstrip("/")
+    return f"{parts.netloc.lower()}{path}" + (f"?{urlencode(params)}" if params else "")
+
+
+def job_fingerprint(job):
+    """Stable key for a posting from normalized title, company, location and link"""
+    key = "|".join([
+        _normalize_text(job.get("title")),
+        _normalize_text(job.get("company")),
+        _normalize_text(job.get("location")),
+        normalize_link(job.get("application_link")),
+    ])
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+class JobStore:
+    def __init__(self, path="jobs.sqlite"):
+        """Disk-backed job store that upserts postings by fingerprint
+
+        Each posting is stored once with first_seen/last_seen timestamps, so ingest
+        costs O(new jobs) and memory does not grow with the number of runs.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                fingerprint TEXT PRIMARY KEY,
+                source TEXT,
+                title TEXT,
+                company TEXT,
+                location TEXT,
+                application_link TEXT,
+                data TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                seen_count INTEGER NOT NULL DEFAULT 1
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_source ON jobs (source)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_company ON jobs (company)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_last_seen ON jobs (last_seen)")
+        # Per-search crawl history for incremental refreshes
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS crawl_state (
+                query TEXT PRIMARY KEY,
+                last_crawled REAL NOT NULL,
+                new_rate REAL NOT NULL,
+                interval REAL NOT NULL,
+                runs INTEGER NOT NULL
+            )
+        """)
+        # Near-duplicate clustering state (see dedup.NearDuplicateClusterer), so later
+        # runs restore it instead of hashing every stored posting again
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS dedup (
+                fingerprint TEXT PRIMARY KEY,
+                scheme TEXT NOT NULL,
+                signature BLOB NOT NULL,
+                location TEXT,
+                cluster TEXT NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS dedup_bands (
+                band INTEGER NOT NULL,
+                band_key BLOB NOT NULL,
+                fingerprint TEXT NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS dedup_bands_key ON dedup_bands (band, band_key)")
+        self._conn.commit()
+
+    def upsert_many(self, jobs):
+        """Insert new postings and refresh known ones; returns the fingerprints that were new"""
+        if not jobs:
+            return []
+
+        now = time.time()
+        rows = {}
+        for job in jobs:
+            fingerprint = job_fingerprint(job)
+            rows[fingerprint] = (
+                fingerprint,
+                job.get("source"),
+                job.get("title"),
+                job.get("company"),
+                job.get("location"),
+                job.get("application_link"),
+                json.dumps(job, ensure_ascii=False),
+                now,
+                now,
+            )
+
+        with self._lock:
+            known = self._existing(list(rows))
+            with self._conn:
+                self._conn.executemany("""
+                    INSERT INTO jobs (fingerprint, source, title, company, location, application_link,
+                                      data, first_seen, last_seen)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(fingerprint) DO UPDATE SET
+                        source = excluded.source,
+                        data = excluded.data,
+                        last_seen = excluded.last_seen,
+                        seen_count = seen_count + 1
+                """, list(rows.values()))
+        return [fingerprint for fingerprint in rows if fingerprint not in known]
+
+    def _existing(self, fingerprints):
+        found = set()
+        # Stay under SQLite's bound-parameter limit
+        for i in range(0, len(fingerprints), 500):
+            batch = fingerprints[i:i + 500]
+            placeholders = ",".join("?" * len(batch))
+            found.update(row[0] for row in self._conn.execute(
+                f"SELECT fingerprint FROM jobs WHERE fingerprint IN ({placeholders})", batch
+            ))
+        return found
+
+    def known(self, fingerprints):
+        """Return the subset of fingerprints already in the store"""
+        with self._lock:
+            return self._existing(list(fingerprints))
+
+    def get(self, fingerprint):
+        """Look up one posting by fingerprint"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, first_seen, last_seen FROM jobs WHERE fingerprint = ?", (fingerprint,)
+            ).fetchone()
+        return self._to_job(fingerprint, row) if row else None
+
+    def get_many(self, fingerprints):
+        """Look up postings by fingerprint, in the given order; unknown ones are skipped"""
+        fingerprints = list(fingerprints)
+        rows = {}
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for i in range(0, len(fingerprints), 500):
+                batch = fingerprints[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows.update((row[0], row[1:]) for row in self._conn.execute(
+                    f"SELECT fingerprint, data, first_seen, last_seen FROM jobs WHERE fingerprint IN ({placeholders})", batch
+                ))
+        return [self._to_job(fingerprint, rows[fingerprint]) for fingerprint in fingerprints if fingerprint in rows]
+
+    def _to_job(self, fingerprint, row):
+        job = json.loads(row[0])
+        job["fingerprint"] = fingerprint
+        job["first_seen"] = row[1]
+        job["last_seen"] = row[2]
+        return job
+
+    def iter_jobs(self, source=None, since=None, limit=None, batch_size=1000):
+        """Yield stored postings in first-seen order, reading in batches"""
+        query = "SELECT fingerprint, data, first_seen, last_seen FROM jobs"
+        clauses, params = [], []
+        if source:
+            clauses.append("source = ?")
+            params.append(source)
+        if since:
+            clauses.append("last_seen >= ?")
+            params.append(since)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY first_seen, rowid"
+        if limit:
+            query += f" LIMIT {int(limit)}"
+
+        with self._lock:
+            cursor = self._conn.execute(query, params)
+            rows = cursor.fetchmany(batch_size)
+        while rows:
+            for fingerprint, data, first_seen, last_seen in rows:
+                yield self._to_job(fingerprint, (data, first_seen, last_seen))
+            with self._lock:
+                rows = cursor.fetchmany(batch_size)
+
+    def crawl_state(self, query):
+        """Return the stored crawl state of a search, or None if it was never crawled"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_crawled, new_rate, interval, runs FROM crawl_state WHERE query = ?", (query,)
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("last_crawled", "new_rate", "interval", "runs"), row))
+
+    def set_crawl_state(self, query, state):
+        with self._lock, self._conn:
+            self._conn.execute("""
+                INSERT OR REPLACE INTO crawl_state (query, last_crawled, new_rate, interval, runs)
+                VALUES (?, ?, ?, ?, ?)
+            """, (query, state["last_crawled"], state["new_rate"], state["interval"], state["runs"]))
+
+    def dedup_state(self, scheme):
+        """Saved clustering state as {fingerprint: (signature, location, cluster)}
+
+        State saved with a different scheme is deleted, so it is rebuilt from scratch.
+        """
+        with self._lock:
+            stale = self._conn.execute("SELECT 1 FROM dedup WHERE scheme != ? LIMIT 1", (scheme,)).fetchone()
+            if stale:
+                with self._conn:
+                    self._conn.execute("DELETE FROM dedup")
+                    self._conn.execute("DELETE FROM dedup_bands")
+                return {}
+            return {row[0]: row[1:] for row in self._conn.execute(
+                "SELECT fingerprint, signature, location, cluster FROM dedup"
+            )}
+
+    def iter_dedup_bands(self, batch_size=10000):
+        """Yield saved (band, band_key, fingerprint) rows"""
+        with self._lock:
+            cursor = self._conn.execute("SELECT band, band_key, fingerprint FROM dedup_bands ORDER BY rowid")
+            rows = cursor.fetchmany(batch_size)
+        while rows:
+            yield from rows
+            with self._lock:
+                rows = cursor.fetchmany(batch_size)
+
+    def save_dedup(self, scheme, rows, bands):
+        """Save clustering rows and band keys from NearDuplicateClusterer.pending"""
+        with self._lock, self._conn:
+            self._conn.executemany("""
+                INSERT OR REPLACE INTO dedup (fingerprint, scheme, signature, location, cluster)
+                VALUES (?, ?, ?, ?, ?)
+            """, [(key, scheme, signature, location, cluster) for key, signature, location, cluster in rows])
+            self._conn.executemany(
+                "INSERT INTO dedup_bands (band, band_key, fingerprint) VALUES (?, ?, ?)", bands
+            )
+
+    def last_updated(self):
+        """Latest last_seen timestamp in the store, a cheap change marker for readers"""
+        with self._lock:
+            return self._conn.execute("SELECT MAX(last_seen) FROM jobs").fetchone()[0] or 0.0
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def source_counts(self):
+        """Number of stored postings per source"""
+        with self._lock:
+            return dict(self._conn.execute("SELECT source, COUNT(*) FROM jobs GROUP BY source ORDER BY source"))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
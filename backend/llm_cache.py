@@ -0,0 +1,105 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class LLMCache:
+    def __init__(self, path="llm_cache.sqlite", ttl=7 * 24 * 3600, max_entries=5000, bypass=False):
+        """Persistent, content-addressed cache for LLM extraction results
+
+        Entries expire after `ttl` seconds and the least recently used entries are
+        evicted once more than `max_entries` are stored. With bypass=True every
+        lookup misses and nothing is written.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.bypass = bypass
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model, prompt_version, temperature, messages):
+        """Hash the request parameters and whitespace-normalized message content"""
+        normalized = [
+            {"role": message["role"], "content": _WHITESPACE.sub(" ", message["content"]).strip()}
+            for message in messages
+        ]
+        payload = json.dumps([model, prompt_version, temperature, normalized], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Return the cached value for a key, or None on a miss or expired entry"""
+        if self.bypass:
+            self.misses += 1
+            return None
+
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (self.ttl and now - row[1] > self.ttl):
+                if row is not None:
+                    self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key, value):
+        """Store a value and evict least recently used entries beyond max_entries"""
+        if self.bypass:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            if self.ttl:
+                self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl,))
+            if self.max_entries:
+                self._conn.execute("""
+                    DELETE FROM llm_cache WHERE key IN (
+                        SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                    )
+                """, (self.max_entries,))
+            self._conn.commit()
+
+    def stats(self):
+        """Return hit/miss counters and the number of stored entries"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": entries,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
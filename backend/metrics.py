@@ -0,0 +1,142 @@
+import json
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# USD per 1M tokens as (prompt, completion); used for cost estimates only
+MODEL_PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+}
+
+_NULL_SPAN = nullcontext()
+
+
+def _format_labels(labels):
+    """Render (name, value) pairs as a Prometheus label set"""
+    if not labels:
+        return ""
+    escaped = []
+    for name, value in labels:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        escaped.append(f'{name}="{value}"')
+    return "{" + ",".join(escaped) + "}"
+
+
+class Tracer:
+    def __init__(self, enabled=True):
+        """Collects timing spans and token usage for a scraping run
+
+        When disabled every call returns immediately, so instrumentation can stay in
+        the hot paths at near-zero cost.
+        """
+        self.enabled = enabled
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self.spans = {}
+        self.usage = []
+
+    def span(self, name, **labels):
+        """Context manager timing a block under a span name and labels"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._span(name, labels)
+
+    @contextmanager
+    def _span(self, name, labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def observe(self, name, seconds, **labels):
+        """Record a duration that was measured elsewhere"""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            stats = self.spans.get(key)
+            if stats is None:
+                stats = self.spans[key] = {"count": 0, "total": 0.0, "max": 0.0}
+            stats["count"] += 1
+            stats["total"] += seconds
+            stats["max"] = max(stats["max"], seconds)
+
+    def record_usage(self, model, usage, **labels):
+        """Record prompt/completion tokens from a response's usage and estimate the cost"""
+        if not self.enabled or usage is None:
+            return
+        prompt = getattr(usage, "prompt_tokens", 0) or 0
+        completion = getattr(usage, "completion_tokens", 0) or 0
+        prompt_price, completion_price = MODEL_PRICES.get(model, (0.0, 0.0))
+        cost = (prompt * prompt_price + completion * completion_price) / 1_000_000
+        with self._lock:
+            self.usage.append(dict(labels, model=model, prompt_tokens=prompt,
+                                   completion_tokens=completion, cost_usd=cost))
+
+    def _usage_by(self, label):
+        totals = {}
+        for entry in self.usage:
+            key = entry.get(label, "unknown")
+            bucket = totals.setdefault(key, {"requests": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0})
+            bucket["requests"] += 1
+            bucket["prompt_tokens"] += entry["prompt_tokens"]
+            bucket["completion_tokens"] += entry["completion_tokens"]
+            bucket["cost_usd"] += entry["cost_usd"]
+        return totals
+
+    def summary(self):
+        """JSON-serializable run summary: span totals plus token usage and cost"""
+        with self._lock:
+            spans = [
+                dict(name=name, labels=dict(labels), count=stats["count"],
+                     total_s=stats["total"], mean_s=stats["total"] / stats["count"], max_s=stats["max"])
+                for (name, labels), stats in sorted(self.spans.items())
+            ]
+            usage = list(self.usage)
+            by_source = self._usage_by("source")
+        return {
+            "started": self.started,
+            "duration_s": time.time() - self.started,
+            "spans": spans,
+            "usage_by_source": by_source,
+            "usage_by_page": usage,
+            "total_cost_usd": sum(entry["cost_usd"] for entry in usage),
+        }
+
+    def save_summary(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def to_prometheus(self):
+        """Render the collected metrics in the Prometheus text exposition format"""
+        lines = [
+            "# HELP jobbot_span_seconds_total Time spent in each pipeline stage.",
+            "# TYPE jobbot_span_seconds_total counter",
+        ]
+        with self._lock:
+            spans = sorted(self.spans.items())
+            by_source = self._usage_by("source")
+        for (name, labels), stats in spans:
+            lines.append(f"jobbot_span_seconds_total{_format_labels((('span', name),) + labels)} {stats['total']:.6f}")
+        lines += ["# HELP jobbot_span_count_total Number of times each stage ran.",
+                  "# TYPE jobbot_span_count_total counter"]
+        for (name, labels), stats in spans:
+            lines.append(f"jobbot_span_count_total{_format_labels((('span', name),) + labels)} {stats['count']}")
+
+        lines += ["# HELP jobbot_llm_tokens_total LLM tokens used per source.",
+                  "# TYPE jobbot_llm_tokens_total counter"]
+        for source, totals in sorted(by_source.items()):
+            for kind in ("prompt", "completion"):
+                labels = (("source", source), ("kind", kind))
+                lines.append(f"jobbot_llm_tokens_total{_format_labels(labels)} {totals[kind + '_tokens']}")
+        lines += ["# HELP jobbot_llm_cost_usd_total Estimated LLM cost per source.",
+                  "# TYPE jobbot_llm_cost_usd_total counter"]
+        for source, totals in sorted(by_source.items()):
+            lines.append(f"jobbot_llm_cost_usd_total{_format_labels((('source', source),))} {totals['cost_usd']:.6f}")
+        return "\n".join(lines) + "\n"
+
+
+# Shared disabled tracer for code paths that were not given one
+NULL_TRACER = Tracer(enabled=False)
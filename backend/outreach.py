@@ -0,0 +1,338 @@
+import asyncio
+import json
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+import openai
+from openai import AsyncOpenAI
+from job_store import job_fingerprint
+from llm_cache import LLMCache
+from metrics import NULL_TRACER
+from sinks import Checkpoint, JSONLSink
+
+# Outreach model settings; bump OUTREACH_PROMPT_VERSION whenever the prompts change
+# so cached messages written for the old prompt are not reused
+OUTREACH_MODEL = "gpt-4o-mini"
+OUTREACH_TEMPERATURE = 0.7
+OUTREACH_PROMPT_VERSION = 1
+
+# Static instructions placed first, followed by the template, with per-pair details
+# last. At roughly 250 tokens this is below the 1024-token minimum for provider prompt
+# caching, so nothing relies on it; the report shows cached prompt tokens if a long
+# custom template ever pushes the shared prefix past that minimum
+OUTREACH_SYSTEM_PROMPT = """You write short, personalized outreach messages from a job seeker to a contact at a company that is hiring.
+
+Rules:
+1. Address the contact by first name when it is known.
+2. Mention the specific role and one concrete detail from the posting (a skill, the team or the product).
+3. Connect that detail to the sender's background in one sentence; never invent experience the sender did not list.
+4. Keep a warm, professional tone. No flattery, no buzzwords, no exclamation marks.
+5. End with one clear, low-effort ask (a short call, a referral or a pointer to the right person).
+6. Follow the template's format and length limits exactly.
+7. Reply with the message text only: no subject line unless the template asks for one, no placeholders, no commentary.
+
+The template for this batch follows. The job, the contact and the sender's background are given in the user message."""
+
+# Built-in templates; any other string passed as a template is used verbatim
+TEMPLATES = {
+    "email": "Template: cold email. Start with a subject line prefixed 'Subject: ', then at most 120 words in 2-3 short paragraphs.",
+    "linkedin": "Template: LinkedIn connection note. At most 300 characters, a single paragraph, no subject line.",
+    "referral": "Template: referral request to an employee who does not work on the hiring team. At most 100 words; ask whether they would be comfortable referring the sender or sharing who the hiring manager is.",
+}
+
+# Per-job description budget in the prompt; the opening of a posting carries most of its signal
+DESCRIPTION_CHARS = 600
+
+
+def job_brief(job):
+    """Compact text block describing a job for the outreach prompt"""
+    skills = job.get("skills") or []
+    if not isinstance(skills, str):
+        skills = ", ".join(str(skill) for skill in skills)
+    lines = [
+        f"Role: {job.get('title') or 'Not specified'}",
+        f"Company: {job.get('company') or 'Not specified'}",
+        f"Location: {job.get('location') or 'Not specified'}",
+    ]
+    if skills:
+        lines.append(f"Skills: {skills}")
+    description = " ".join(str(job.get("description") or "").split())
+    if description and description != "Not specified":
+        lines.append(f"Posting: {description[:DESCRIPTION_CHARS]}")
+    return "\n".join(lines)
+
+
+def contact_brief(contact):
+    """Compact text block describing the recipient"""
+    if isinstance(contact, str):
+        return f"Name: {contact}"
+    fields = [("Name", "name"), ("Title", "title"), ("Company", "company"), ("Notes", "notes")]
+    return "\n".join(f"{label}: {contact[key]}" for label, key in fields if contact.get(key))
+
+
+def outreach_messages(template, job, contact, sender):
+    """Messages for one job/contact pair: static prefix first, per-pair variables last"""
+    instructions = TEMPLATES.get(template, template)
+    return [
+        {"role": "system", "content": f"{OUTREACH_SYSTEM_PROMPT}\n\n{instructions}"},
+        {"role": "user", "content": f"Sender background:\n{sender}\n\nJob:\n{job_brief(job)}\n\nContact:\n{contact_brief(contact)}"},
+    ]
+
+
+def retry_after(error):
+    """Seconds the API asked us to wait in a Retry-After header, if any"""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveLimit:
+    def __init__(self, initial=8, minimum=1, maximum=32):
+        """Concurrency limit that adapts to rate limiting (additive increase, multiplicative decrease)
+
+        Every `limit` successes in a row raise the limit by one; a rate-limit error
+        halves it and pauses new requests for the requested delay. Errors from
+        requests that were already in flight during a pause do not halve it again.
+        """
+        self.limit = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.active = 0
+        self.peak = initial
+        self.decreases = 0
+        self._successes = 0
+        self._resume_at = 0.0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def release(self):
+        async with self._condition:
+            self.active -= 1
+            self._condition.notify_all()
+
+    def succeeded(self):
+        self._successes += 1
+        if self._successes >= self.limit and self.limit < self.maximum:
+            self.limit += 1
+            self.peak = max(self.peak, self.limit)
+            self._successes = 0
+
+    def rate_limited(self, delay):
+        now = time.monotonic()
+        if now >= self._resume_at:
+            self.limit = max(self.minimum, self.limit // 2)
+            self.decreases += 1
+        self._successes = 0
+        self._resume_at = max(self._resume_at, now + delay)
+
+
+class OutreachGenerator:
+    def __init__(self, api_key=None, base_url=None, client=None, model=OUTREACH_MODEL, temperature=OUTREACH_TEMPERATURE,
+                 concurrency=8, max_concurrency=32, max_retries=6, base_delay=1.0, max_delay=60.0, max_tokens=400,
+                 cache_path="outreach_cache.sqlite", cache_ttl=30 * 24 * 3600, cache_max_entries=200000, tracer=None):
+        """Generates outreach messages for many job/contact pairs concurrently
+
+        Requests run on an AsyncOpenAI client under an AdaptiveLimit starting at
+        `concurrency` and never exceeding `max_concurrency`. Rate-limit, timeout and
+        server errors are retried up to max_retries times with exponential backoff
+        (honouring Retry-After). Results are cached by (model, prompt version, template,
+        job, contact, sender), so identical inputs are generated once.
+        """
+        if client is None:
+            api_key = api_key or os.environ.get("OPENAI_API_KEY")
+            if not api_key:
+                raise ValueError("OpenAI API key is required. Provide it when initializing OutreachGenerator or set OPENAI_API_KEY environment variable.")
+            # Retries are handled here so rate limits can also shrink the concurrency limit
+            client = AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=0)
+        self.client = client
+        self.model = model
+        self.temperature = temperature
+        self.concurrency = concurrency
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_tokens = max_tokens
+        self.cache = LLMCache(cache_path, ttl=cache_ttl, max_entries=cache_max_entries)
+        self.tracer = tracer or NULL_TRACER
+        self.stats = {}
+
+    def key(self, messages):
+        return LLMCache.make_key(self.model, OUTREACH_PROMPT_VERSION, self.temperature, messages)
+
+    def generate(self, pairs, template="email", sender="", output_path=None, checkpoint_path=None, flush_every=50):
+        """Blocking wrapper around agenerate
+
+        asyncio.run cannot be called while an event loop is running (as it always is
+        in Jupyter), so in that case the batch runs on its own loop in a worker thread.
+        """
+        batch = self.agenerate(pairs, template, sender, output_path, checkpoint_path, flush_every)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(batch)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, batch).result()
+
+    async def agenerate(self, pairs, template="email", sender="", output_path=None, checkpoint_path=None, flush_every=50):
+        """Generate one message per (job, contact) pair; returns messages in input order
+
+        Failed pairs get None. With output_path every finished message is appended to a
+        JSON Lines file, and with checkpoint_path an interrupted batch resumes from it:
+        messages already written are read back instead of being generated again.
+        """
+        started = time.perf_counter()
+        self.stats = {"pairs": len(pairs), "unique": 0, "resumed": 0, "cached": 0, "generated": 0,
+                      "failed": 0, "retries": 0, "rate_limited": 0, "cached_prompt_tokens": 0, "prompt_tokens": 0}
+        keyed = []
+        unique = {}
+        for job, contact in pairs:
+            messages = outreach_messages(template, job, contact, sender)
+            key = self.key(messages)
+            keyed.append(key)
+            unique.setdefault(key, (messages, job, contact))
+        self.stats["unique"] = len(unique)
+
+        checkpoint = Checkpoint(checkpoint_path) if checkpoint_path else None
+        sink = JSONLSink(output_path, flush_every) if output_path else None
+        if sink is not None and checkpoint is not None:
+            # Drop rows written after the last commit, including a line torn by a crash
+            sink.resume(checkpoint.positions.get(output_path))
+        results = self._resume(output_path, checkpoint) if checkpoint and output_path else {}
+        self.stats["resumed"] = len(results)
+        if results:
+            print(f"Resuming from checkpoint: {len(results)} messages already written")
+        pending_keys = []
+
+        def write(key, job, contact, message):
+            results[key] = message
+            if sink is None:
+                return
+            sink.write([{"key": key, "template": template, "job_fingerprint": job_fingerprint(job),
+                         "title": job.get("title"), "company": job.get("company"),
+                         "contact": contact, "message": message}])
+            pending_keys.append(key)
+            if sink.needs_flush:
+                flush()
+
+        def flush():
+            sink.flush()
+            if checkpoint is not None:
+                checkpoint.commit(pending_keys, {output_path: sink.position()})
+            pending_keys.clear()
+
+        limit = AdaptiveLimit(self.concurrency, maximum=self.max_concurrency)
+        todo = [(key, item) for key, item in unique.items() if key not in results]
+        try:
+            for key, (messages, job, contact) in todo:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    self.stats["cached"] += 1
+                    write(key, job, contact, cached)
+
+            async def run(key, messages, job, contact):
+                message = await self._complete(messages, limit)
+                if message is None:
+                    self.stats["failed"] += 1
+                    return
+                self.stats["generated"] += 1
+                self.cache.set(key, message)
+                write(key, job, contact, message)
+
+            await asyncio.gather(*(run(key, messages, job, contact)
+                                   for key, (messages, job, contact) in todo if key not in results))
+        finally:
+            if sink is not None:
+                flush()
+                sink.close()
+
+        self.stats.update(seconds=time.perf_counter() - started, peak_concurrency=limit.peak,
+                          final_concurrency=limit.limit, limit_decreases=limit.decreases)
+        return [results.get(key) for key in keyed]
+
+    def _resume(self, output_path, checkpoint):
+        """Messages of checkpointed keys, read back from the output file"""
+        results = {}
+        if not os.path.exists(output_path):
+            return results
+        with open(output_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # a line torn by the crash, never checkpointed
+                if checkpoint.is_done(row.get("key")):
+                    results[row["key"]] = row["message"]
+        return results
+
+    async def _complete(self, messages, limit):
+        """One chat completion with adaptive backoff; returns the message text or None"""
+        for attempt in range(self.max_retries + 1):
+            await limit.acquire()
+            try:
+                with self.tracer.span("outreach_request"):
+                    response = await self.client.chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                        temperature=self.temperature,
+                        max_tokens=self.max_tokens,
+                    )
+            except openai.RateLimitError as e:
+                delay = retry_after(e) or self._backoff(attempt)
+                self.stats["rate_limited"] += 1
+                limit.rate_limited(delay)
+            except (openai.APITimeoutError, openai.APIConnectionError, openai.InternalServerError) as e:
+                delay = self._backoff(attempt)
+                print(f"Outreach request failed ({type(e).__name__}), retrying in {delay:.1f}s")
+            except openai.APIError as e:
+                print(f"Error with OpenAI API call for outreach: {e}")
+                return None
+            else:
+                limit.succeeded()
+                self._record_usage(response.usage)
+                return (response.choices[0].message.content or "").strip() or None
+            finally:
+                await limit.release()
+
+            if attempt < self.max_retries:
+                self.stats["retries"] += 1
+                await asyncio.sleep(delay)
+        print(f"Giving up on an outreach message after {self.max_retries + 1} attempts")
+        return None
+
+    def _backoff(self, attempt):
+        # Full jitter keeps workers that failed together from retrying together
+        return random.uniform(0.5, 1.0) * min(self.max_delay, self.base_delay * 2 ** attempt)
+
+    def _record_usage(self, usage):
+        if usage is None:
+            return
+        self.tracer.record_usage(self.model, usage, source="outreach")
+        self.stats["prompt_tokens"] += usage.prompt_tokens or 0
+        details = getattr(usage, "prompt_tokens_details", None)
+        self.stats["cached_prompt_tokens"] += getattr(details, "cached_tokens", 0) or 0
+
+    def report(self):
+        stats = self.stats
+        if not stats:
+            return "No outreach batch has run yet"
+        return (f"Outreach: {stats['pairs']} pairs ({stats['unique']} unique) in {stats.get('seconds', 0):.1f}s; "
+                f"{stats['generated']} generated, {stats['cached']} from cache, {stats['resumed']} resumed, "
+                f"{stats['failed']} failed; {stats['rate_limited']} rate-limited responses, "
+                f"concurrency peaked at {stats.get('peak_concurrency', 0)}; "
+                f"{stats['cached_prompt_tokens']}/{stats['prompt_tokens']} prompt tokens served from the prompt cache")
+
+    def close(self):
+        self.cache.close()
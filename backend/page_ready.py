@@ -0,0 +1,86 @@
+import time
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+from extractors import SELECTOR_SETS
+
+# Resources we never read; blocked in Chrome so pages settle sooner
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm", "*.mp3", "*.m3u8",
+]
+
+# One round trip returning what the readiness checks need
+_PAGE_STATE_JS = """
+var selector = arguments[0];
+return [
+    document.readyState,
+    document.getElementsByTagName('*').length,
+    performance.getEntriesByType('resource').length,
+    selector ? document.querySelectorAll(selector).length : 0,
+    document.body ? document.body.scrollHeight : 0
+];
+"""
+
+
+def card_selector(source):
+    """CSS selector matching a source's job cards in any known layout"""
+    return ", ".join(selector_set["card"] for selector_set in SELECTOR_SETS.get(source, []))
+
+
+class PageReadiness:
+    def __init__(self, timeout=15, poll=0.25, stable_for=0.75, min_cards=3, max_scrolls=6, scroll_timeout=2.5):
+        """Waits for a page to be usable instead of sleeping for a fixed time
+
+        A page is ready once it has min_cards job cards, or once the DOM size and the
+        number of network requests have not changed for stable_for seconds. Scrolling
+        continues only while each scroll makes new cards (or page height) appear.
+        """
+        self.timeout = timeout
+        self.poll = poll
+        self.stable_for = stable_for
+        self.min_cards = min_cards
+        self.max_scrolls = max_scrolls
+        self.scroll_timeout = scroll_timeout
+
+    def _state(self, driver, selector):
+        return driver.execute_script(_PAGE_STATE_JS, selector or "")
+
+    def wait_ready(self, driver, selector=None):
+        """Block until cards are present or the page has gone quiet; returns the reason"""
+        last = {"state": None, "since": time.monotonic()}
+
+        def ready(driver):
+            ready_state, nodes, requests, cards, _ = self._state(driver, selector)
+            if selector and cards >= self.min_cards:
+                return "cards"
+            now = time.monotonic()
+            if (nodes, requests) != last["state"]:
+                last["state"], last["since"] = (nodes, requests), now
+                return False
+            if ready_state == "complete" and now - last["since"] >= self.stable_for:
+                return "idle"
+            return False
+
+        try:
+            return WebDriverWait(driver, self.timeout, poll_frequency=self.poll).until(ready)
+        except TimeoutException:
+            return "timeout"
+
+    def scroll_lazy(self, driver, selector=None):
+        """Scroll to the bottom while doing so loads more content; returns the scroll count"""
+        scrolls = 0
+        for _ in range(self.max_scrolls):
+            _, _, _, cards, height = self._state(driver, selector)
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            scrolls += 1
+
+            def grew(driver):
+                _, _, _, new_cards, new_height = self._state(driver, selector)
+                return new_cards > cards or new_height > height
+
+            try:
+                WebDriverWait(driver, self.scroll_timeout, poll_frequency=self.poll).until(grew)
+            except TimeoutException:
+                break
+        return scrolls
@@ -0,0 +1,236 @@
+import json
+import math
+import os
+import zlib
+import numpy as np
+import scipy.sparse as sp
+from job_index import tokenize
+
+# Words too common in postings and resumes to say anything about fit
+STOP_WORDS = set("""
+a an and are as at be by for from has have in is it its of on or our that the their this to we
+will with you your who what when where which while us they them into over per via not all any
+""".split())
+
+
+def job_document(job):
+    """Text a job is matched on: title (counted twice), skills and description"""
+    skills = job.get("skills") or []
+    if not isinstance(skills, str):
+        skills = " ".join(str(skill) for skill in skills)
+    parts = [job.get("title"), job.get("title"), skills, job.get("description")]
+    return " ".join(str(part) for part in parts if part and part != "Not specified")
+
+
+class HashingVectorizer:
+    def __init__(self, n_features=1 << 18):
+        """Hashes words and adjacent word pairs into a fixed number of columns
+
+        No vocabulary is fitted, so new jobs can be vectorized at any time and every
+        vector stays comparable with the ones already stored.
+        """
+        self.n_features = n_features
+        self._buckets = {}
+
+    def bucket(self, term):
+        column = self._buckets.get(term)
+        if column is None:
+            column = zlib.crc32(term.encode("utf-8")) % self.n_features
+            if len(self._buckets) < 2_000_000:
+                self._buckets[term] = column
+        return column
+
+    def counts(self, text):
+        """Map of column -> term count for one document"""
+        tokens = [token for token in tokenize(text) if token not in STOP_WORDS]
+        counts = {}
+        for term in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+            column = self.bucket(term)
+            counts[column] = counts.get(column, 0) + 1
+        return counts
+
+    def transform(self, texts):
+        """CSR matrix of L2-normalized log term frequencies, one row per text"""
+        indptr, indices, data = [0], [], []
+        for text in texts:
+            counts = self.counts(text)
+            columns = sorted(counts)
+            weights = np.log1p(np.fromiter((counts[c] for c in columns), dtype=np.float32, count=len(columns)))
+            norm = float(np.sqrt((weights * weights).sum())) or 1.0
+            indices.extend(columns)
+            data.extend((weights / norm).tolist())
+            indptr.append(len(indices))
+        return sp.csr_matrix(
+            (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(texts), self.n_features),
+        )
+
+
+class MatchIndex:
+    def __init__(self, n_features=1 << 18, max_df=0.9, max_query_terms=64, merge_every=50000, min_prune_docs=100):
+        """Ranks stored jobs against resumes by sparse cosine similarity
+
+        Job rows are normalized log-TF vectors kept column-major (an inverted index), so
+        scoring a resume only touches the postings of its terms. IDF weights the resume
+        side only, which means stored rows never need rewriting as document frequencies
+        change. Common terms are down-weighted by IDF; only near-ubiquitous ones (in more
+        than max_df of jobs, once there are at least min_prune_docs jobs) are dropped, and
+        at most max_query_terms of the strongest are kept. Jobs added since the last merge sit in
+        a small delta that is folded in every merge_every jobs or on save.
+        """
+        self.vectorizer = HashingVectorizer(n_features)
+        self.n_features = n_features
+        self.max_df = max_df
+        self.min_prune_docs = min_prune_docs
+        self.max_query_terms = max_query_terms
+        self.merge_every = merge_every
+        self.df = np.zeros(n_features, dtype=np.int64)
+        self._base = sp.csc_matrix((0, n_features), dtype=np.float32)
+        self._base_keys = np.zeros(0, dtype="S64")
+        self._delta = []
+        self._delta_keys = []
+        self._delta_matrix = None
+        self._key_ids = None
+
+    @property
+    def size(self):
+        return self._base.shape[0] + len(self._delta_keys)
+
+    def key(self, doc_id):
+        base = self._base.shape[0]
+        if doc_id < base:
+            return self._base_keys[doc_id].decode("utf-8")
+        return self._delta_keys[doc_id - base]
+
+    def __contains__(self, key):
+        if self._key_ids is None:
+            self._key_ids = {self.key(i): i for i in range(self.size)}
+        return key in self._key_ids
+
+    def add_many(self, jobs, keys):
+        """Vectorize and append jobs; keys identify them in search results"""
+        keys = [str(key) for key in keys]
+        if not keys:
+            return
+        rows = self.vectorizer.transform([job_document(job) for job in jobs])
+        np.add.at(self.df, rows.indices, 1)
+        start = self.size
+        self._delta.append(rows)
+        self._delta_keys.extend(keys)
+        self._delta_matrix = None
+        if self._key_ids is not None:
+            self._key_ids.update((key, start + i) for i, key in enumerate(keys))
+        if len(self._delta_keys) >= self.merge_every:
+            self.merge()
+
+    def add(self, job, key):
+        self.add_many([job], [key])
+
+    def merge(self):
+        """Fold the delta rows into the column-major base matrix"""
+        if not self._delta:
+            return
+        rows = sp.vstack([self._base.tocsr()] + self._delta, format="csr")
+        self._base = rows.tocsc()
+        self._base.sort_indices()
+        self._base_keys = np.concatenate([self._base_keys, np.array(self._delta_keys, dtype="S64")])
+        self._delta, self._delta_keys, self._delta_matrix = [], [], None
+
+    def _query_weights(self, texts):
+        """Sparse (n_features x len(texts)) matrix of pruned, IDF-weighted resume vectors"""
+        total = max(self.size, 1)
+        rows, cols, vals = [], [], []
+        for i, text in enumerate(texts):
+            counts = self.vectorizer.counts(text)
+            terms = np.fromiter(counts, dtype=np.int64, count=len(counts))
+            if not len(terms):
+                continue
+            df = self.df[terms]
+            keep = df > 0
+            if total >= self.min_prune_docs:
+                keep &= df <= self.max_df * total
+            terms, df = terms[keep], df[keep]
+            tf = np.log1p(np.fromiter((counts[t] for t in terms), dtype=np.float32, count=len(terms)))
+            weights = tf * (np.log((1 + total) / (1 + df)) + 1).astype(np.float32)
+            if len(terms) > self.max_query_terms:
+                strongest = np.argpartition(-weights, self.max_query_terms)[:self.max_query_terms]
+                terms, weights = terms[strongest], weights[strongest]
+            norm = math.sqrt(float((weights * weights).sum())) or 1.0
+            rows.extend(terms.tolist())
+            cols.extend([i] * len(terms))
+            vals.extend((weights / norm).tolist())
+        return sp.csc_matrix((np.asarray(vals, dtype=np.float32), (rows, cols)), shape=(self.n_features, len(texts)))
+
+    def scores(self, texts):
+        """Dense (texts x jobs) cosine scores of every resume against every job"""
+        weights = self._query_weights(texts)
+        if self._delta and self._delta_matrix is None:
+            self._delta_matrix = sp.vstack(self._delta, format="csc")
+        base = self._base.shape[0]
+        scores = np.zeros((len(texts), self.size), dtype=np.float32)
+        for i in range(len(texts)):
+            # Gather only the posting lists of this resume's terms; one sparse-dense
+            # product per resume beats a joint product over the union of their terms
+            start, end = weights.indptr[i], weights.indptr[i + 1]
+            terms, values = weights.indices[start:end], weights.data[start:end]
+            if not len(terms):
+                continue
+            scores[i, :base] = self._base[:, terms] @ values
+            if self._delta_matrix is not None:
+                scores[i, base:] = self._delta_matrix[:, terms] @ values
+        return scores
+
+    def top_k(self, texts, k=50):
+        """For each resume text, the k best (key, score) pairs in descending score order"""
+        if isinstance(texts, str):
+            texts = [texts]
+        if not self.size:
+            return [[] for _ in texts]
+        scores = self.scores(texts)
+        k = min(k, scores.shape[1])
+        results = []
+        for row in scores:
+            best = np.argpartition(-row, k - 1)[:k] if k < len(row) else np.arange(len(row))
+            best = best[np.argsort(-row[best], kind="stable")]
+            results.append([(self.key(i), float(row[i])) for i in best if row[i] > 0])
+        return results
+
+    def save(self, directory):
+        """Write the index as .npy arrays that load() can memory-map
+
+        Files are written under temporary names and swapped in afterwards, because
+        the current arrays may be memory-mapped from the very files being replaced.
+        """
+        self.merge()
+        os.makedirs(directory, exist_ok=True)
+        base = self._base
+        arrays = {"indptr": base.indptr, "indices": base.indices, "data": base.data,
+                  "keys": self._base_keys, "df": self.df}
+        written = []
+        for name, array in arrays.items():
+            path = os.path.join(directory, f"{name}.npy")
+            with open(path + ".tmp", "wb") as f:
+                np.save(f, array)
+            written.append(path)
+        meta = {"n_features": self.n_features, "rows": base.shape[0], "max_df": self.max_df,
+                "max_query_terms": self.max_query_terms, "min_prune_docs": self.min_prune_docs}
+        path = os.path.join(directory, "meta.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        written.append(path)
+        for path in written:
+            os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """Open a saved index; with mmap the arrays are paged in from disk on demand"""
+        with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        index = cls(meta["n_features"], meta["max_df"], meta["max_query_terms"],
+                    min_prune_docs=meta.get("min_prune_docs", 100))
+        mode = "r" if mmap else None
+        arrays = [np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mode) for name in ("data", "indices", "indptr")]
+        index._base = sp.csc_matrix(tuple(arrays), shape=(meta["rows"], meta["n_features"]), copy=False)
+        index._base_keys = np.load(os.path.join(directory, "keys.npy"), mmap_mode=mode)
+        index.df = np.load(os.path.join(directory, "df.npy"))
+        return index
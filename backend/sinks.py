@@ -0,0 +1,215 @@
+import json
+import os
+
+# Columns written by the tabular sinks, matching the fields the extractor produces
+JOB_FIELDS = ["title", "company", "location", "salary", "description", "application_link",
+              "skills", "job_type", "date_posted", "source"]
+
+
+def _flat_row(job):
+    row = {}
+    for field in JOB_FIELDS:
+        value = job.get(field)
+        if isinstance(value, list):
+            value = ", ".join(str(v) for v in value)
+        row[field] = None if value is None else str(value)
+    return row
+
+
+class Checkpoint:
+    def __init__(self, path):
+        """Set of completed page keys persisted atomically, used to resume a crashed run
+
+        Alongside the keys it records how far each sink had durably written when they
+        were committed, so a resumed run can drop output written after that point.
+        """
+        self.path = path
+        self.completed = set()
+        self.positions = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                state = json.load(f)
+            self.completed = set(state.get("completed", []))
+            self.positions = state.get("positions", {})
+
+    def is_done(self, key):
+        return key in self.completed
+
+    def commit(self, keys, positions=None):
+        """Mark keys as completed, record sink positions and write the checkpoint file"""
+        if not keys and not positions:
+            return
+        self.completed.update(keys)
+        self.positions.update(positions or {})
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"completed": sorted(self.completed), "positions": self.positions}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+
+class JSONLSink:
+    def __init__(self, path, flush_every=50):
+        """Append-only JSON Lines sink; rows are fsynced every flush_every jobs"""
+        self.path = path
+        self.flush_every = flush_every
+        self.pending = 0
+        self.written = 0
+        self._file = open(path, "a", encoding="utf-8")
+        self._durable = self._file.tell()
+
+    def write(self, jobs):
+        for job in jobs:
+            self._file.write(json.dumps(job, ensure_ascii=False) + "\n")
+        self.pending += len(jobs)
+
+    @property
+    def needs_flush(self):
+        return self.pending >= self.flush_every
+
+    def flush(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.written += self.pending
+        self.pending = 0
+        self._durable = self._file.tell()
+
+    def position(self):
+        """Byte offset up to which the file is durable"""
+        return self._file.tell()
+
+    def resume(self, position):
+        """Truncate rows written after a checkpointed position, including a torn last line"""
+        self._file.flush()
+        if position is not None and position < self._file.tell():
+            self._file.truncate(position)
+            self._file.seek(position)
+            self._durable = position
+
+    def discard(self):
+        """Drop rows that were written but not yet flushed"""
+        self._file.flush()
+        self._file.truncate(self._durable)
+        self.pending = 0
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+
+class ParquetSink:
+    def __init__(self, directory, row_group_size=5000):
+        """Parquet dataset sink writing one part file (one row group) per flush
+
+        Part files are complete as soon as they are written, so a crash only loses
+        the rows still buffered; resuming continues the part numbering.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._pq = pq
+        self.schema = pa.schema([(field, pa.string()) for field in JOB_FIELDS])
+        self.directory = directory
+        self.row_group_size = row_group_size
+        self.buffer = []
+        self.written = 0
+        os.makedirs(directory, exist_ok=True)
+        self.part = len([name for name in os.listdir(directory) if name.endswith(".parquet")])
+
+    def write(self, jobs):
+        self.buffer.extend(_flat_row(job) for job in jobs)
+
+    @property
+    def pending(self):
+        return len(self.buffer)
+
+    @property
+    def needs_flush(self):
+        return len(self.buffer) >= self.row_group_size
+
+    def flush(self):
+        if not self.buffer:
+            return
+        table = self._pa.Table.from_pylist(self.buffer, schema=self.schema)
+        path = os.path.join(self.directory, f"part-{self.part:05d}.parquet")
+        tmp_path = path + ".tmp"
+        self._pq.write_table(table, tmp_path, row_group_size=len(self.buffer))
+        os.replace(tmp_path, path)
+        self.part += 1
+        self.written += len(self.buffer)
+        self.buffer = []
+
+    def position(self):
+        """Number of complete part files"""
+        return self.part
+
+    def resume(self, position):
+        """Remove part files written after a checkpointed position"""
+        if position is None:
+            return
+        for name in os.listdir(self.directory):
+            if name.startswith("part-") and name.endswith(".parquet") and int(name[5:10]) >= position:
+                os.remove(os.path.join(self.directory, name))
+        self.part = min(self.part, position)
+
+    def discard(self):
+        """Drop rows that were buffered but not yet written"""
+        self.buffer = []
+
+    def close(self):
+        self.flush()
+
+
+def _sink_id(sink):
+    return getattr(sink, "path", None) or getattr(sink, "directory", None)
+
+
+def write_stream(pages, sinks, checkpoint=None):
+    """Write (key, jobs) pages to every sink, checkpointing keys only once they are durable
+
+    Keys and sink positions are committed together after every flush. On resume,
+    output written after the last commit is dropped first; if the run fails, only
+    complete pages are flushed and committed, and anything else is discarded.
+    Memory stays bounded by the sinks' buffer sizes. Returns the number of jobs written.
+    """
+    pending_keys = []
+    total = 0
+
+    if checkpoint is not None:
+        for sink in sinks:
+            sink.resume(checkpoint.positions.get(_sink_id(sink)))
+
+    def flush_all():
+        for sink in sinks:
+            sink.flush()
+        if checkpoint is not None:
+            checkpoint.commit(pending_keys, {_sink_id(sink): sink.position() for sink in sinks})
+        pending_keys.clear()
+
+    partial_page = False
+    try:
+        for key, jobs in pages:
+            partial_page = True
+            for sink in sinks:
+                sink.write(jobs)
+            partial_page = False
+            total += len(jobs)
+            pending_keys.append(key)
+            if any(sink.needs_flush for sink in sinks):
+                flush_all()
+    except BaseException:
+        if partial_page:
+            # A page reached only some sinks; keep every sink at the last commit
+            for sink in sinks:
+                sink.discard()
+        else:
+            flush_all()
+        raise
+    else:
+        flush_all()
+    finally:
+        for sink in sinks:
+            sink.close()
+    return total
@@ -0,0 +1,290 @@
+import json
+import re
+import threading
+import time
+from chunked_extraction import estimate_tokens
+
+# Fields of an extracted job and the type each must have; anything else is dropped
+JOB_SCHEMA = {
+    "title": str,
+    "company": str,
+    "location": str,
+    "salary": str,
+    "description": str,
+    "application_link": str,
+    "skills": list,
+    "job_type": str,
+    "date_posted": str,
+}
+
+# Output budget per job card (nine short fields plus a one-line description) and for
+# the {"jobs": [...]} wrapper; used to size max_tokens from the cards in a request
+TOKENS_PER_CARD = 160
+RESPONSE_OVERHEAD_TOKENS = 50
+
+_CARD_LINE = re.compile(r"^\[Card \d+\]", re.MULTILINE)
+_CLOSERS = "}]"
+
+
+def max_tokens_for(messages, ceiling=4000, floor=256):
+    """Completion budget for an extraction request, from the number of cards it sends
+
+    Without card markers the page text is the only guide, and the extracted jobs are
+    never longer than the text they came from.
+    """
+    content = messages[-1]["content"]
+    cards = len(_CARD_LINE.findall(content))
+    budget = RESPONSE_OVERHEAD_TOKENS + cards * TOKENS_PER_CARD if cards else estimate_tokens(content)
+    return max(floor, min(ceiling, budget))
+
+
+def validate_job(job):
+    """Coerce a parsed job to JOB_SCHEMA, or return None if it has no usable title"""
+    if not isinstance(job, dict):
+        return None
+    title = job.get("title")
+    if not isinstance(title, str) or not title.strip():
+        return None
+
+    clean = {}
+    for field, kind in JOB_SCHEMA.items():
+        value = job.get(field)
+        if kind is list:
+            if isinstance(value, str):
+                value = [part.strip() for part in value.split(",") if part.strip()]
+            elif isinstance(value, list):
+                value = [str(item).strip() for item in value if isinstance(item, (str, int, float)) and str(item).strip()]
+            else:
+                value = []
+        elif isinstance(value, list):
+            value = ", ".join(str(item) for item in value if item is not None) or "Not specified"
+        elif value is None or isinstance(value, dict) or not str(value).strip():
+            value = "Not specified"
+        else:
+            value = str(value).strip()
+        clean[field] = value
+    return clean
+
+
+class JobStreamParser:
+    def __init__(self):
+        """Incremental parser that emits each job object as soon as its closing brace arrives
+
+        Jobs are the objects directly inside an array of the reply's first JSON object,
+        as in {"jobs": [...]}. Nothing is tracked before the first '{', so prose or code
+        fences around the JSON (even prose with brackets in it) are skipped. A malformed
+        job only loses that job, and when the reply is cut off every job that was
+        completed before the cut is kept. An object that yields no jobs only counts as
+        the answer if nothing but whitespace or fences follows it; a later object takes
+        its place.
+        """
+        self.jobs = []
+        self.rejected = 0
+        self.started = False
+        self.complete = False
+        self._text = ""
+        self._pos = 0
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        self._job_start = None
+        self._job_depth = None
+
+    def feed(self, delta):
+        """Consume the next piece of the reply; returns the jobs it completed"""
+        if (self.complete and self.jobs) or not delta:
+            return []
+        self._text += delta
+        emitted = []
+        text, stack = self._text, self._stack
+        for pos in range(self._pos, len(text)):
+            char = text[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                # Quotes only open strings inside JSON, not in prose around it
+                self._in_string = bool(stack)
+            elif char == "{" or (char == "[" and stack):
+                if not stack:
+                    self.started = True
+                    self.complete = False
+                elif char == "{" and self._job_start is None and stack[-1] == "[":
+                    self._job_start = pos
+                    self._job_depth = len(stack)
+                stack.append(char)
+            elif char in _CLOSERS and stack:
+                stack.pop()
+                if self._job_start is not None and len(stack) == self._job_depth:
+                    job = self._decode(text[self._job_start:pos + 1])
+                    self._job_start = None
+                    if job is not None:
+                        emitted.append(job)
+                if not stack:
+                    self.complete = True
+                    if self.jobs or emitted:
+                        break
+            elif self.complete and not char.isspace() and char != "`":
+                # Text after an object with no jobs: that object was not the answer
+                self.complete = False
+
+        # Keep only the text of a job that is still open
+        if self._job_start is None:
+            self._text, self._pos = "", 0
+        else:
+            self._text = text[self._job_start:]
+            self._pos = len(text) - self._job_start
+            self._job_start = 0
+        self.jobs.extend(emitted)
+        return emitted
+
+    def _decode(self, fragment):
+        try:
+            job = validate_job(json.loads(fragment))
+        except json.JSONDecodeError:
+            job = None
+        if job is None:
+            self.rejected += 1
+        return job
+
+    @property
+    def truncated(self):
+        return self.started and not self.complete
+
+
+def parse_jobs(text):
+    """Parse a whole reply; returns (jobs, ok) where ok is False if no JSON was found,
+    the reply was cut off before its first complete job, or an object without jobs
+    was followed by more text"""
+    parser = JobStreamParser()
+    parser.feed(text or "")
+    return parser.jobs, parser.complete or bool(parser.jobs)
+
+
+def stream_jobs(client, model, messages, temperature, max_tokens, on_job=None):
+    """Stream one JSON-mode extraction and parse jobs as they arrive
+
+    on_job, if given, is called with each job as soon as it is parsed, for callers that
+    can use jobs before the reply ends. Returns a dict with the parsed jobs, the raw reply
+    text, the usage reported at the end of the stream, the finish reason and the seconds
+    until the first job was parsed.
+    """
+    parser = JobStreamParser()
+    parts = []
+    usage, finish_reason, first_job = None, None, None
+    start = time.perf_counter()
+    stream = client.chat.completions.create(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        response_format={"type": "json_object"},
+        stream=True,
+        stream_options={"include_usage": True},
+    )
+    try:
+        for chunk in stream:
+            if chunk.usage is not None:
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            finish_reason = choice.finish_reason or finish_reason
+            delta = choice.delta.content if choice.delta else None
+            if not delta:
+                continue
+            parts.append(delta)
+            for job in parser.feed(delta):
+                if first_job is None:
+                    first_job = time.perf_counter() - start
+                if on_job is not None:
+                    on_job(job)
+    finally:
+        stream.close()
+
+    return {
+        "jobs": parser.jobs,
+        "text": "".join(parts),
+        "complete": parser.complete,
+        "rejected": parser.rejected,
+        "usage": usage,
+        "finish_reason": finish_reason,
+        "first_job_s": first_job,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def request_jobs(client, model, messages, temperature, max_tokens):
+    """Non-streaming JSON-mode extraction returning the same dict as stream_jobs"""
+    start = time.perf_counter()
+    response = client.chat.completions.create(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        response_format={"type": "json_object"},
+    )
+    text = response.choices[0].message.content or ""
+    parser = JobStreamParser()
+    parser.feed(text)
+    seconds = time.perf_counter() - start
+    return {
+        "jobs": parser.jobs,
+        "text": text,
+        "complete": parser.complete,
+        "rejected": parser.rejected,
+        "usage": response.usage,
+        "finish_reason": response.choices[0].finish_reason,
+        "first_job_s": seconds if parser.jobs else None,
+        "seconds": seconds,
+    }
+
+
+class ExtractionStats:
+    def __init__(self):
+        """Per-request outcomes of LLM extraction: failures, truncation and time to first job"""
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.failed = 0
+        self.truncated = 0
+        self.salvaged_jobs = 0
+        self.rejected_jobs = 0
+        self.first_job_times = []
+
+    def record(self, result):
+        with self._lock:
+            self.requests += 1
+            self.rejected_jobs += result["rejected"]
+            if result["first_job_s"] is not None:
+                self.first_job_times.append(result["first_job_s"])
+            if not result["complete"]:
+                if result["jobs"]:
+                    self.truncated += 1
+                    self.salvaged_jobs += len(result["jobs"])
+                else:
+                    self.failed += 1
+
+    def record_failure(self):
+        with self._lock:
+            self.requests += 1
+            self.failed += 1
+
+    @property
+    def failure_rate(self):
+        return self.failed / self.requests if self.requests else 0.0
+
+    @property
+    def mean_first_job(self):
+        times = self.first_job_times
+        return sum(times) / len(times) if times else None
+
+    def summary(self):
+        line = (f"LLM extraction: {self.requests} requests, {self.failure_rate:.0%} failed to parse, "
+                f"{self.truncated} truncated ({self.salvaged_jobs} jobs salvaged), {self.rejected_jobs} jobs rejected by the schema")
+        if self.mean_first_job is not None:
+            line += f"; first job parsed after {self.mean_first_job:.2f}s on average"
+        return line
@@ -0,0 +1,26 @@
+import os
+import sys
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "benchmarks"))
+
+
+@pytest.fixture
+def make_scraper(tmp_path):
+    """Build JobScrapers that share one store under tmp_path, closed after the test"""
+    from Claudescraper import JobScraper
+    scrapers = []
+
+    def make(**kwargs):
+        options = dict(api_key="test", store_path=str(tmp_path / "jobs.sqlite"),
+                       cache_path=str(tmp_path / "llm_cache.sqlite"), match_index_path=str(tmp_path / "match_index"))
+        options.update(kwargs)
+        scraper = JobScraper(**options)
+        scrapers.append(scraper)
+        return scraper
+
+    yield make
+    for scraper in scrapers:
+        scraper.close()
@@ -0,0 +1,130 @@
+import time
+import pytest
+from auto_apply import ApplicationQueue, ApplicationRunner, ApplyError, FormSubmitter, QUEUED, IN_FLIGHT, APPLIED, FAILED
+from fake_form_server import FakeFormServer
+import run_apply_queue
+
+PROFILE = {"name": "Ada Lovelace", "email": "ada@example.com", "phone": "555-0100", "resume": "Analyst, engines."}
+
+
+def posting(i, base_url="https://jobs.example.com"):
+    return {"title": f"Job {i}", "company": f"Company {i}", "location": "Remote",
+            "application_link": f"{base_url}/jobs/{i}"}
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = ApplicationQueue(str(tmp_path / "applications.sqlite"), max_attempts=3, base_delay=10, max_delay=60,
+                             lease_timeout=30)
+    yield queue
+    queue.close()
+
+
+def test_enqueue_is_idempotent_and_needs_a_link(queue):
+    jobs = [posting(i) for i in range(3)]
+    jobs.append({"title": "No link", "company": "Acme", "application_link": "Not specified"})
+    assert queue.enqueue_many(jobs) == 3
+    assert queue.enqueue_many(jobs) == 0
+    assert queue.counts() == {QUEUED: 3}
+
+
+def test_claim_then_complete_moves_forward_once(queue):
+    queue.enqueue_many([posting(0)])
+    item = queue.claim()
+    assert item["job"]["title"] == "Job 0" and item["attempts"] == 0
+    assert queue.counts() == {IN_FLIGHT: 1}
+    assert queue.claim() is None
+
+    queue.complete(item["fingerprint"])
+    assert queue.counts() == {APPLIED: 1}
+    # A late failure report for a finished job doesn't move it back
+    queue.fail(item["fingerprint"], "late")
+    assert queue.counts() == {APPLIED: 1}
+
+
+def test_claim_skips_busy_sites(queue):
+    queue.enqueue_many([posting(0, "https://a.example.com"), posting(1, "https://b.example.com")])
+    assert queue.claim(exclude_sites=["a.example.com"])["site"] == "b.example.com"
+    assert queue.claim(exclude_sites=["a.example.com"]) is None
+
+
+def test_backoff_doubles_with_jitter_and_is_capped(queue):
+    for attempts, full in [(1, 10), (2, 20), (3, 40), (4, 60), (10, 60)]:
+        delay = queue.backoff(attempts)
+        assert 0.8 * full <= delay <= full
+
+
+def test_retryable_failure_comes_back_after_backoff(queue):
+    queue.enqueue_many([posting(0)])
+    item = queue.claim()
+    before = time.time()
+    assert queue.fail(item["fingerprint"], ApplyError("HTTP 503"), retryable=True, attempts=item["attempts"])
+    assert queue.counts() == {QUEUED: 1}
+    assert queue.next_due() >= before + 8
+
+    assert queue.claim() is None
+    retry = queue.claim(now=queue.next_due())
+    assert retry["fingerprint"] == item["fingerprint"] and retry["attempts"] == 1
+
+
+def test_failures_stop_at_max_attempts_or_when_not_retryable(queue):
+    queue.enqueue_many([posting(0), posting(1)])
+    gone = queue.claim()
+    assert not queue.fail(gone["fingerprint"], "HTTP 404", retryable=False, attempts=gone["attempts"])
+
+    for attempt in range(queue.max_attempts):
+        item = queue.claim(now=time.time() + 3600)
+        retried = queue.fail(item["fingerprint"], "HTTP 503", retryable=True, attempts=item["attempts"])
+        assert retried == (attempt < queue.max_attempts - 1)
+    assert queue.counts() == {FAILED: 2}
+    assert sorted(attempts for _, attempts, _ in queue.failures()) == [1, queue.max_attempts]
+
+
+def test_recover_returns_abandoned_leases(queue):
+    queue.enqueue_many([posting(0), posting(1)])
+    queue.claim()
+    queue.lease_timeout = -1
+    queue.claim()
+    assert queue.recover() == 1
+    assert queue.counts() == {QUEUED: 1, IN_FLIGHT: 1}
+    assert queue.recover(expired_only=False) == 1
+    assert queue.counts() == {QUEUED: 2}
+
+
+def test_runner_recovers_a_crashed_run(tmp_path):
+    path = str(tmp_path / "applications.sqlite")
+    crashed = ApplicationQueue(path)
+    crashed.enqueue_many([posting(i) for i in range(4)])
+    crashed.claim()
+    crashed.claim()
+    crashed.close()
+
+    applied = []
+    queue = ApplicationQueue(path)
+    summary = ApplicationRunner(queue, lambda job, link, key: applied.append(key), workers=2, poll=0.05).run()
+    assert summary["applied"] == 4 and len(set(applied)) == 4
+    assert queue.counts() == {APPLIED: 4}
+    queue.close()
+
+
+def test_runner_applies_to_each_job_exactly_once(tmp_path):
+    sites = [FakeFormServer(latency=0.01, failure_rate=0.3, seed=i).start() for i in range(2)]
+    queue = ApplicationQueue(str(tmp_path / "applications.sqlite"), max_attempts=10, base_delay=0.01, max_delay=0.05)
+    postings = [posting(i, sites[i % 2].base_url) for i in range(20)]
+    postings.append({"title": "Expired", "company": "Gone Inc.", "application_link": f"{sites[0].base_url}/gone/1"})
+    queue.enqueue_many(postings)
+    submitter = FormSubmitter(PROFILE)
+    try:
+        ApplicationRunner(queue, submitter, workers=4, per_site=2, poll=0.05).run()
+        assert queue.counts() == {APPLIED: 20, FAILED: 1}
+        assert sum(len(site.submissions) for site in sites) == 20
+        assert all(fields["email"] == [PROFILE["email"]] for site in sites for fields in site.submissions.values())
+    finally:
+        submitter.close()
+        queue.close()
+        for site in sites:
+            site.stop()
+
+
+def test_killed_runner_resumes_without_duplicates():
+    assert run_apply_queue.run(jobs=24, workers=4, crash_after=0.5)
@@ -0,0 +1,59 @@
+from crawl_scheduler import CrawlTask
+from dedup import MinHasher, NearDuplicateClusterer, estimate_jaccard
+
+NURSING = "Provide patient care on the cardiac ward, night shifts, valid state license required"
+DESCRIPTION = "Build and maintain batch and streaming data pipelines in Python and SQL for the analytics team"
+
+
+def posting(i, source="Indeed", location="Austin, TX", title="Data Engineer", company="Acme", description=DESCRIPTION):
+    return {"title": title, "company": company, "location": location, "source": source,
+            "description": f"{description} {i}", "application_link": f"https://{source.lower()}.example.com/jobs/{i}"}
+
+
+def test_signatures_are_stable_and_estimate_similarity():
+    hasher = MinHasher()
+    text = "senior data engineer acme build and maintain data pipelines"
+    assert (hasher.signature(text) == MinHasher().signature(text)).all()
+    assert estimate_jaccard(hasher.signature(text), hasher.signature(text)) == 1.0
+    assert estimate_jaccard(hasher.signature(text), hasher.signature("registered nurse night shift")) < 0.2
+    assert estimate_jaccard(hasher.signature(""), hasher.signature("")) == 1.0
+
+
+def test_same_role_in_another_city_is_not_merged():
+    clusterer = NearDuplicateClusterer()
+    clusterer.add("indeed-austin", posting(1))
+    clusterer.add("linkedin-austin", posting(1, source="LinkedIn"))
+    clusterer.add("indeed-denver", posting(1, location="Denver, CO"))
+    clusterer.add("glassdoor-unknown", posting(1, source="Glassdoor", location="Not specified"))
+    assert clusterer.cluster_count() == 2
+    record = clusterer.canonical(clusterer.cluster_of("indeed-austin"))
+    assert record["duplicates"] == 3
+    assert sorted(record["links"]) == ["Glassdoor", "Indeed", "LinkedIn"]
+
+
+def test_clusters_are_restored_from_the_store_without_rehashing(make_scraper, monkeypatch):
+    jobs = [posting(0), posting(0, source="LinkedIn"), posting(1, location="Denver, CO"),
+            posting(2, title="Nurse", company="Mercy", description=NURSING)]
+    first = make_scraper()
+    first.store.upsert_many(jobs)
+    assert first.dedup.cluster_count() == 3
+    first.close()
+
+    def no_hashing(self, text):
+        raise AssertionError("restored postings must not be hashed again")
+
+    second = make_scraper()
+    with monkeypatch.context() as patch:
+        patch.setattr(MinHasher, "signature", no_hashing)
+        assert second.dedup.cluster_count() == 3
+
+    # New postings are clustered against the restored ones and saved in turn
+    task = CrawlTask("glassdoor", "www.glassdoor.com", 0, "https://www.glassdoor.com/")
+    second._store_page(task, [posting(2, source="Glassdoor", title="Nurse", company="Mercy", description=NURSING)])
+    assert second.dedup.cluster_count() == 3
+    second.close()
+
+    third = make_scraper()
+    records = {record["title"]: record for record in third.filter_jobs()}
+    assert records["Nurse"]["sources"] == ["Glassdoor", "Indeed"]
+    assert third.dedup.cluster_count() == 3
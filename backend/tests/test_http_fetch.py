@@ -0,0 +1,41 @@
+import os
+
+import httpx
+import pytest
+
+from http_fetch import HttpFetcher
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "fixtures")
+
+# Repeated, card-like blocks that are not job cards: a cookie wall with a list of vendors
+CONSENT_PAGE = "<html><body><div class='consent'>" + "".join(
+    f"<div class='vendor'><h3>Vendor {i}</h3><p>Uses cookies for measurement and advertising.</p>"
+    f"<a href='/privacy/{i}'>Privacy policy</a></div>"
+    for i in range(12)
+) + "</div></body></html>"
+
+
+def _fetcher(pages):
+    fetcher = HttpFetcher()
+    fetcher.client.close()
+    fetcher.client = httpx.Client(transport=httpx.MockTransport(
+        lambda request: httpx.Response(200, text=pages[request.url.path])
+    ))
+    return fetcher
+
+
+@pytest.mark.parametrize("source", ["indeed", "linkedin", "glassdoor"])
+def test_fixture_pages_have_cards_for_their_source(source):
+    with open(os.path.join(FIXTURES, f"{source}.html"), encoding="utf-8") as f:
+        fetcher = _fetcher({"/jobs": f.read()})
+    page = fetcher.fetch("http://fixtures.test/jobs", source=source)
+    fetcher.close()
+    assert page is not None and page.reduction.cards
+
+
+def test_consent_page_is_rendered_in_the_browser():
+    fetcher = _fetcher({"/jobs": CONSENT_PAGE})
+    # The generic rule alone takes the vendor list for job cards
+    assert fetcher.fetch("http://fixtures.test/jobs") is not None
+    assert fetcher.fetch("http://fixtures.test/jobs", source="indeed") is None
+    fetcher.close()
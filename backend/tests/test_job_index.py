@@ -0,0 +1,61 @@
+import random
+from job_index import JobIndex, parse_salary
+
+WORDS = ["machine", "learning", "data", "engineer", "react.js", "node", "c++", "sql", "postgresql", "san",
+         "francisco", "new", "york", "ml", "ai", "1.5", "x"]
+SEPARATORS = [" ", " ", " ", "  ", "-", ", ", ".", "/", "\n"]
+PHRASES = ["machine learning", "machine learn", "chine learning", "data engineer", "react", "react.js developer",
+           "js node", "sql", "gresql", "san fran", "new york", "york, new", "c++ engineer", "ml ai", "1.5 x",
+           "learning data engineer", "e l", "machine-learning", "ai", "x", "c++", "++", "c+"]
+
+
+def make_jobs(count, seed=5):
+    rng = random.Random(seed)
+
+    def text(words):
+        parts = []
+        for _ in range(words):
+            parts.extend([rng.choice(WORDS), rng.choice(SEPARATORS)])
+        return "".join(parts).strip().title() if rng.random() < 0.3 else "".join(parts).strip()
+
+    return [{"title": text(3), "description": text(12), "skills": [text(1), text(2)], "location": text(3),
+             "salary": rng.choice(["$120k", "$90,000 - $110,000", "Not specified"])} for _ in range(count)]
+
+
+def substring_filter(jobs, keywords=None, locations=None):
+    """filter_jobs' original semantics: case-insensitive substrings of a single field"""
+    def keyword_match(job, keyword):
+        fields = [job["title"], job["description"]] + job["skills"]
+        return any(keyword.lower() in field.lower() for field in fields)
+
+    return [i for i, job in enumerate(jobs)
+            if (not keywords or any(keyword_match(job, keyword) for keyword in keywords))
+            and (not locations or any(location.lower() in job["location"].lower() for location in locations))]
+
+
+def test_phrases_match_like_substrings():
+    jobs = make_jobs(600)
+    index = JobIndex()
+    for i, job in enumerate(jobs):
+        index.add(job, key=i)
+    for phrase in PHRASES:
+        assert index.search(keywords=[phrase]).tolist() == substring_filter(jobs, keywords=[phrase]), phrase
+        assert index.search(locations=[phrase]).tolist() == substring_filter(jobs, locations=[phrase]), phrase
+    query = {"keywords": ["machine learning", "c++ engineer"], "locations": ["new york"]}
+    assert index.search(**query).tolist() == substring_filter(jobs, **query)
+
+
+def test_phrases_see_jobs_added_after_a_query():
+    index = JobIndex()
+    index.add({"title": "Machine Learning Engineer", "location": "Austin, TX"})
+    assert index.search(keywords=["machine learning"]).tolist() == [0]
+    index.add({"title": "Senior machine learning lead", "location": "Remote"})
+    index.add({"title": "Machine-learning platform", "location": "Remote"})
+    assert index.search(keywords=["machine learning"]).tolist() == [0, 1]
+    assert index.search(keywords=["machine learning"], remote=True).tolist() == [1]
+
+
+def test_salary_parsing():
+    assert parse_salary("$120k - $150k") == (120000, 150000)
+    assert parse_salary("$90,000") == (90000, 90000)
+    assert parse_salary("Not specified") == (0, 0)
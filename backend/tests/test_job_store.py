@@ -0,0 +1,43 @@
+from job_store import JobStore, job_fingerprint
+
+
+def posting(i, title="Data Engineer", location="Austin, TX"):
+    return {"title": title, "company": f"Company {i}", "location": location, "source": "Indeed",
+            "application_link": f"https://www.indeed.com/viewjob?jk={i}&from=serp"}
+
+
+class FakeScheduler:
+    """Returns canned jobs for each crawl task instead of fetching pages"""
+
+    def __init__(self, jobs_for):
+        self.jobs_for = jobs_for
+
+    def iter_results(self, tasks):
+        for task in tasks:
+            yield task, self.jobs_for(task)
+
+
+def test_upsert_reports_only_new_postings(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite"))
+    assert len(store.upsert_many([posting(1), posting(2)])) == 2
+    # Same posting behind a different tracking parameter is not new
+    moved = dict(posting(1), application_link="https://www.indeed.com/viewjob?jk=1&from=email")
+    assert store.upsert_many([moved, posting(3)]) == [job_fingerprint(posting(3))]
+    assert store.count() == 3
+    jobs = store.get_many([job_fingerprint(posting(3)), "missing", job_fingerprint(posting(1))])
+    assert [job["company"] for job in jobs] == ["Company 3", "Company 1"]
+    store.close()
+
+
+def test_scrape_jobs_returns_only_this_search(make_scraper):
+    scraper = make_scraper()
+    scraper.store.upsert_many([posting(100, title="Nurse", location="Denver, CO")])
+    # Page 1 repeats a job from page 0, and one job was already stored by an earlier run
+    scraper.store.upsert_many([posting(1)])
+    pages = {0: [posting(1), posting(2)], 1: [posting(2), posting(3)]}
+    scraper._scheduler = FakeScheduler(lambda task: pages[task.page])
+
+    jobs = scraper.scrape_jobs("data engineer", "Austin, TX", sources=["indeed"], pages=2)
+    assert [job["company"] for job in jobs] == ["Company 1", "Company 2", "Company 3"]
+    assert scraper.store.count() == 4
+    assert len(list(scraper.jobs_data)) == 4
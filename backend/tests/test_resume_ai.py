@@ -0,0 +1,33 @@
+from resume_ai import MatchIndex
+
+SKILLS = ["python", "sql", "spark", "airflow", "pandas", "docker", "aws", "kafka", "tableau", "java"]
+
+
+def make_jobs(count):
+    return [{"title": f"Data Engineer {i}", "company": f"Company {i}",
+             "description": f"Build pipelines with {SKILLS[i % len(SKILLS)]} and {SKILLS[(i * 3) % len(SKILLS)]}",
+             "skills": ["Python", SKILLS[i % len(SKILLS)]]} for i in range(count)]
+
+
+def test_top_k_returns_k_jobs_per_resume():
+    index = MatchIndex()
+    index.add_many(make_jobs(20), range(20))
+    results = index.top_k(["python engineer data", "spark airflow pipelines"], k=10)
+    assert [len(matches) for matches in results] == [10, 10]
+    for matches in results:
+        scores = [score for _, score in matches]
+        assert scores == sorted(scores, reverse=True)
+    assert len(index.top_k("python engineer data", k=50)[0]) == 20
+
+
+def test_saved_index_reloads_over_its_own_files(tmp_path):
+    index = MatchIndex()
+    index.add_many(make_jobs(20), range(20))
+    expected = index.top_k("spark airflow", k=5)
+    for _ in range(2):
+        index.save(str(tmp_path))
+        index = MatchIndex.load(str(tmp_path))
+    assert index.top_k("spark airflow", k=5) == expected
+    index.add({"title": "Kafka Engineer", "description": "kafka streams"}, "new")
+    index.save(str(tmp_path))
+    assert MatchIndex.load(str(tmp_path)).size == 21
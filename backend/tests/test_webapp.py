@@ -0,0 +1,49 @@
+import os
+import sys
+import time
+from job_store import JobStore
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "webapp"))
+
+from app import create_app
+
+
+def posting(i, **fields):
+    job = {"title": f"Data Engineer {i}", "company": "Acme", "location": "Austin, TX", "source": "Indeed",
+           "salary": "$100,000", "description": "Build pipelines", "application_link": f"https://example.com/jobs/{i}"}
+    job.update(fields)
+    return job
+
+
+def test_catalog_serves_updated_postings(tmp_path):
+    path = str(tmp_path / "jobs.sqlite")
+    store = JobStore(path)
+    store.upsert_many([posting(1), posting(2)])
+    app = create_app(path, refresh_interval=0)
+    client = app.test_client()
+    catalog = app.config["CATALOG"]
+
+    first = client.get("/api/jobs").get_json()
+    assert first["total"] == 2
+    fingerprint = first["jobs"][0]["fingerprint"]
+    generation = catalog.generation
+
+    # Seen again with nothing new: the record's last_seen still moves
+    time.sleep(0.01)
+    store.upsert_many([posting(1)])
+    seen = client.get(f"/api/jobs/{fingerprint}").get_json()
+    assert seen["last_seen"] > first["jobs"][0]["last_seen"]
+    assert catalog.generation > generation
+
+    # A new salary and description are searchable and counted in the facets
+    time.sleep(0.01)
+    store.upsert_many([posting(1, salary="$180,000", description="Build streaming pipelines in Rust")])
+    result = client.get("/api/jobs?keywords=rust&min_salary=150000").get_json()
+    assert [job["fingerprint"] for job in result["jobs"]] == [fingerprint]
+    assert result["jobs"][0]["salary"] == "$180,000"
+    everything = client.get("/api/jobs").get_json()
+    assert everything["total"] == 2
+    assert everything["facets"]["salary"] == {"100k-150k": 1, "150k-200k": 1}
+    assert client.get("/api/facets").get_json()["total"] == 2
+    assert client.get("/api/jobs?keywords=build%20pipelines").get_json()["total"] == 1
+    store.close()
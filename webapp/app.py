@@ -0,0 +1,267 @@
+"""JSON API over the scraped jobs
+
+Serves the job store written by backend/Claudescraper.py:
+    GET /api/jobs        filtered, keyset-paginated results with facet counts
+    GET /api/jobs/<id>   one posting by fingerprint
+    GET /api/facets      facet counts over every stored job
+    GET /api/health
+
+Run with `python webapp/app.py --db backend/jobs.sqlite`.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from flask import Flask, Response, abort, request
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from job_store import JobStore
+from job_index import JobIndex, is_remote, parse_salary
+
+# Upper edges of the salary facet buckets; jobs without a salary go to "unknown"
+SALARY_BUCKETS = [50000, 100000, 150000, 200000]
+SALARY_LABELS = ["<50k", "50k-100k", "100k-150k", "150k-200k", "200k+", "unknown"]
+
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+TOP_COMPANIES = 20
+
+
+class JobCatalog:
+    def __init__(self, store, refresh_interval=2.0):
+        """In-memory view of the job store for serving queries
+
+        Jobs are indexed once with JobIndex and per-job facet codes are kept in NumPy
+        arrays, so facets for any result set are a bincount. At most every
+        refresh_interval seconds the store is checked for jobs whose last_seen moved:
+        new ones are added and known ones brought up to date (re-indexed under a new
+        id if a searchable field changed). Any change bumps the generation, which
+        invalidates cached responses.
+        """
+        self.store = store
+        self.refresh_interval = refresh_interval
+        self.index = JobIndex()
+        self.generation = 0
+        # Guards the index while it grows; held for rendering cache misses too
+        self.lock = threading.RLock()
+        self._checked = 0.0
+        self._last_updated = 0.0
+        self._ids = {}
+        self._sources, self._source_codes = [], {}
+        self._companies, self._company_codes = [], {}
+        self._codes = {name: np.zeros(1024, dtype=np.int64) for name in ("source", "company", "salary")}
+        self._remote = np.zeros(1024, dtype=bool)
+        self._facets = None
+        self.refresh(force=True)
+
+    def _code(self, value, values, codes):
+        value = value or "Not specified"
+        if value not in codes:
+            codes[value] = len(values)
+            values.append(value)
+        return codes[value]
+
+    def _index(self, job):
+        """Add a job, or update the indexed copy of a known one"""
+        fingerprint = job["fingerprint"]
+        doc_id = self._ids.get(fingerprint)
+        if doc_id is None:
+            doc_id = self.index.add(job, key=fingerprint)
+        elif self.index.jobs[doc_id] == job:
+            return False
+        else:
+            doc_id = self.index.update(doc_id, job, key=fingerprint)
+        self._ids[fingerprint] = doc_id
+        if doc_id >= len(self._remote):
+            for name, column in self._codes.items():
+                self._codes[name] = np.concatenate([column, np.zeros(len(column), dtype=np.int64)])
+            self._remote = np.concatenate([self._remote, np.zeros(len(self._remote), dtype=bool)])
+        self._codes["source"][doc_id] = self._code(job.get("source"), self._sources, self._source_codes)
+        self._codes["company"][doc_id] = self._code(job.get("company"), self._companies, self._company_codes)
+        low = parse_salary(job.get("salary"))[0]
+        self._codes["salary"][doc_id] = np.searchsorted(SALARY_BUCKETS, low, side="right") if low else len(SALARY_BUCKETS) + 1
+        self._remote[doc_id] = is_remote(job)
+        return True
+
+    def refresh(self, force=False):
+        """Index jobs added or updated since the last check; returns the current generation"""
+        now = time.time()
+        if not force and now - self._checked < self.refresh_interval:
+            return self.generation
+        with self.lock:
+            if not force and now - self._checked < self.refresh_interval:
+                return self.generation
+            self._checked = now
+            last_updated = self.store.last_updated()
+            if last_updated == self._last_updated:
+                return self.generation
+            changed = 0
+            for job in self.store.iter_jobs(since=self._last_updated or None):
+                changed += self._index(job)
+            self._last_updated = last_updated
+            if changed:
+                self.generation += 1
+                self._facets = None
+            return self.generation
+
+    def get(self, fingerprint):
+        doc_id = self._ids.get(fingerprint)
+        return None if doc_id is None else self.index.jobs[doc_id]
+
+    def search(self, **criteria):
+        return self.index.search(**criteria)
+
+    def facets(self, ids=None):
+        """Facet counts for a result set (every job when ids is None)"""
+        if ids is None:
+            if self._facets is None:
+                self._facets = self.facets(self.index.search())
+            return self._facets
+
+        sources = np.bincount(self._codes["source"][ids], minlength=len(self._sources))
+        companies = np.bincount(self._codes["company"][ids], minlength=len(self._companies))
+        salaries = np.bincount(self._codes["salary"][ids], minlength=len(SALARY_LABELS))
+        top = np.argsort(-companies, kind="stable")[:TOP_COMPANIES]
+        remote = int(self._remote[ids].sum())
+        return {
+            "source": {self._sources[i]: int(n) for i, n in enumerate(sources) if n},
+            "company": {self._companies[i]: int(companies[i]) for i in top if companies[i]},
+            "remote": {"remote": remote, "onsite": int(len(ids) - remote)},
+            "salary": {SALARY_LABELS[i]: int(n) for i, n in enumerate(salaries) if n},
+        }
+
+
+class ResponseCache:
+    def __init__(self, max_entries=2048):
+        """LRU of rendered responses keyed by request; cleared when the generation changes"""
+        self.max_entries = max_entries
+        self.generation = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, generation, key):
+        with self._lock:
+            if generation != self.generation:
+                self._entries.clear()
+                self.generation = generation
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, generation, key, body):
+        etag = hashlib.sha1(body).hexdigest()[:20]
+        with self._lock:
+            if generation == self.generation:
+                self._entries[key] = (etag, body)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return etag, body
+
+
+def _list_arg(name):
+    """Read a filter given as repeated parameters or one comma-separated value"""
+    values = []
+    for value in request.args.getlist(name):
+        values.extend(part.strip() for part in value.split(","))
+    return [value for value in values if value] or None
+
+
+def _int_arg(name, default=None):
+    value = request.args.get(name)
+    if value in (None, ""):
+        return default
+    try:
+        return int(float(value))
+    except ValueError:
+        abort(400, description=f"{name} must be a number")
+
+
+def create_app(db_path="jobs.sqlite", refresh_interval=2.0):
+    app = Flask(__name__)
+    catalog = JobCatalog(JobStore(db_path), refresh_interval=refresh_interval)
+    cache = ResponseCache()
+    app.config["CATALOG"] = catalog
+    app.config["RESPONSE_CACHE"] = cache
+
+    def cached_json(render):
+        """Serve a JSON response from the cache, with ETag and 304 support"""
+        generation = catalog.refresh()
+        key = (request.path, tuple(sorted(request.args.items(multi=True))))
+        entry = cache.get(generation, key)
+        if entry is None:
+            with catalog.lock:
+                data = render()
+            body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            entry = cache.set(generation, key, body)
+        etag, body = entry
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = Response(body, mimetype="application/json")
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+
+    @app.get("/api/jobs")
+    def list_jobs():
+        def render():
+            ids = catalog.search(
+                keywords=_list_arg("keywords"),
+                locations=_list_arg("locations"),
+                remote=request.args.get("remote", "").lower() in ("1", "true", "yes"),
+                min_salary=_int_arg("min_salary"),
+            )
+            limit = max(1, min(_int_arg("limit", DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE))
+            cursor = _int_arg("cursor")
+            # Keyset pagination: ids are in ingest order and never reused, so the
+            # cursor is simply the last id of the previous page
+            start = 0 if cursor is None else int(np.searchsorted(ids, cursor, side="right"))
+            page = ids[start:start + limit]
+            next_cursor = str(int(page[-1])) if start + limit < len(ids) else None
+            return {
+                "total": int(len(ids)),
+                "jobs": [catalog.index.jobs[i] for i in page],
+                "next_cursor": next_cursor,
+                "facets": catalog.facets(ids),
+            }
+        return cached_json(render)
+
+    @app.get("/api/jobs/<fingerprint>")
+    def get_job(fingerprint):
+        catalog.refresh()
+        job = catalog.get(fingerprint)
+        if job is None:
+            abort(404, description="No job with that id")
+        return cached_json(lambda: job)
+
+    @app.get("/api/facets")
+    def facets():
+        return cached_json(lambda: {"total": catalog.index.count, "facets": catalog.facets()})
+
+    @app.get("/api/health")
+    def health():
+        return {"jobs": catalog.index.count, "generation": catalog.generation,
+                "cache": {"hits": cache.hits, "misses": cache.misses}}
+
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default=os.environ.get("JOBBOT_DB", "jobs.sqlite"), help="job store written by the scraper")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    args = parser.parse_args()
+    create_app(args.db).run(host=args.host, port=args.port, threaded=True)
@@ -0,0 +1,145 @@
+"""Load test for the jobs API
+
+Starts the API on a job store (or targets a running server with --url) and hammers
+it with a mix of search, paging and facet requests from several keep-alive clients.
+
+    python webapp/load_test.py --db backend/jobs.sqlite --duration 10 --clients 16
+    python webapp/load_test.py --synthetic 20000
+
+Half of the clients revalidate with If-None-Match, like a browser would.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import httpx
+
+WEBAPP_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, WEBAPP_DIR)
+
+QUERIES = [
+    "/api/jobs",
+    "/api/jobs?remote=true",
+    "/api/jobs?keywords=python",
+    "/api/jobs?keywords=machine%20learning&limit=50",
+    "/api/jobs?locations=new%20york&min_salary=120000",
+    "/api/jobs?keywords=sql,spark&remote=1",
+    "/api/facets",
+]
+
+
+def synthetic_store(path, count, seed=0):
+    """Fill a job store with generated postings for load testing"""
+    from job_store import JobStore
+
+    rng = random.Random(seed)
+    titles = ["Data Scientist", "Machine Learning Engineer", "Data Analyst", "Python Developer", "Analytics Engineer"]
+    skills = ["Python", "SQL", "Spark", "AWS", "PyTorch", "Tableau", "Airflow"]
+    locations = ["New York, NY", "Remote", "Austin, TX", "San Francisco, CA", "Brooklyn, NY"]
+    store = JobStore(path)
+    batch = []
+    for i in range(count):
+        batch.append({
+            "title": f"{rng.choice(titles)} {i}",
+            "company": f"Company {rng.randrange(count // 20 + 1)}",
+            "location": rng.choice(locations),
+            "salary": f"${rng.randrange(40, 220)},000 a year" if rng.random() < 0.7 else "Not specified",
+            "description": "Build " + " and ".join(rng.sample(skills, 3)) + " pipelines for machine learning products.",
+            "skills": rng.sample(skills, 3),
+            "application_link": f"https://example.com/jobs/{i}",
+            "source": rng.choice(["Indeed", "LinkedIn", "Glassdoor"]),
+        })
+        if len(batch) == 1000:
+            store.upsert_many(batch)
+            batch = []
+    store.upsert_many(batch)
+    store.close()
+
+
+def start_server(db_path):
+    """Serve the app from a background thread and return its base URL"""
+    from werkzeug.serving import WSGIRequestHandler, make_server
+    from app import create_app
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    server = make_server("127.0.0.1", 0, create_app(db_path), threaded=True, request_handler=QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def client_loop(base_url, deadline, revalidate, latencies, statuses, lock, seed):
+    rng = random.Random(seed)
+    etags = {}
+    with httpx.Client(base_url=base_url, timeout=10) as client:
+        while time.perf_counter() < deadline:
+            path = rng.choice(QUERIES)
+            headers = {"If-None-Match": etags[path]} if revalidate and path in etags else {}
+            start = time.perf_counter()
+            response = client.get(path, headers=headers)
+            elapsed = time.perf_counter() - start
+            if response.status_code == 200:
+                etags[path] = response.headers.get("ETag")
+                cursor = response.json().get("next_cursor") if path.startswith("/api/jobs") else None
+                if cursor and rng.random() < 0.3:
+                    # Follow a page, like a user scrolling the results
+                    sep = "&" if "?" in path else "?"
+                    client.get(f"{path}{sep}cursor={cursor}")
+            with lock:
+                latencies.append(elapsed)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+
+def run(base_url, duration, clients):
+    latencies, statuses, lock = [], {}, threading.Lock()
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=client_loop, args=(base_url, deadline, i % 2 == 0, latencies, statuses, lock, i))
+        for i in range(clients)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+    print(f"Requests: {len(latencies)} in {wall:.1f}s -> {len(latencies) / wall:.0f} req/s with {clients} clients")
+    print(f"Latency ms: mean {statistics.mean(latencies) * 1000:.1f}  p50 {pct(0.5):.1f}  "
+          f"p95 {pct(0.95):.1f}  p99 {pct(0.99):.1f}")
+    print("Statuses: " + ", ".join(f"{status}: {count}" for status, count in sorted(statuses.items())))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="base URL of a running server; otherwise one is started here")
+    parser.add_argument("--db", default=os.environ.get("JOBBOT_DB", "jobs.sqlite"), help="job store to serve")
+    parser.add_argument("--synthetic", type=int, metavar="N", help="serve N generated jobs instead of --db")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--clients", type=int, default=16)
+    args = parser.parse_args()
+
+    base_url = args.url
+    if base_url is None:
+        sys.path.insert(0, os.path.join(WEBAPP_DIR, "..", "backend"))
+        db_path = args.db
+        if args.synthetic:
+            db_path = os.path.join(tempfile.mkdtemp(prefix="jobbot-load-"), "jobs.sqlite")
+            synthetic_store(db_path, args.synthetic)
+            print(f"Generated {args.synthetic} jobs in {db_path}")
+        server, base_url = start_server(db_path)
+    run(base_url, args.duration, args.clients)
+
+
+if __name__ == "__main__":
+    main()